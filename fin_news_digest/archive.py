@@ -0,0 +1,382 @@
+import heapq
+import json
+import logging
+import math
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from fin_news_digest.models import NewsItem
+from fin_news_digest.textnorm import search_terms
+
+if TYPE_CHECKING:
+    from fin_news_digest.market_data import MarketSection
+
+logger = logging.getLogger(__name__)
+
+_EDITIONS_FILE = "editions.jsonl"
+_DOCS_FILE = "docs.jsonl"
+# Byte offset of each line in docs.jsonl, and each doc's weighted term count
+# (the BM25 length), as little-endian arrays indexed by doc id.
+_OFFSETS_FILE = "docs.offsets"
+_LENGTHS_FILE = "docs.lengths"
+_SEGMENT_DIR = "index"
+
+_SEGMENT_MAGIC = b"FNDIDX1\n"
+# first doc, end doc (exclusive), term count, term blob bytes
+_SEGMENT_HEADER = struct.Struct("<4I")
+
+# Title terms count this many times towards term frequency.
+_TITLE_WEIGHT = 3
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+_TITLE_FIELDS = ("title", "title_en", "title_zh")
+_SUMMARY_FIELDS = ("summary", "summary_en", "summary_zh")
+
+
+def _read_array(path: Path, typecode: str) -> array:
+    values = array(typecode)
+    if path.exists():
+        values.frombytes(path.read_bytes())
+        if sys.byteorder != "little":
+            values.byteswap()
+    return values
+
+
+def _array_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_postings(postings: list[tuple[int, int]]) -> bytes:
+    # (doc id delta, term frequency) pairs as varints.
+    out = bytearray()
+    previous = 0
+    for doc, tf in postings:
+        for value in (doc - previous, tf):
+            while value >= 0x80:
+                out.append(value & 0x7F | 0x80)
+                value >>= 7
+            out.append(value)
+        previous = doc
+    return bytes(out)
+
+
+def _decode_postings(data: bytes) -> list[tuple[int, int]]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    postings = []
+    doc = 0
+    for idx in range(0, len(values), 2):
+        doc += values[idx]
+        postings.append((doc, values[idx + 1]))
+    return postings
+
+
+class _Segment:
+    # Immutable index over docs [first, end): a sorted term list for binary
+    # search and one varint postings run per term. Only the runs of the
+    # queried terms are ever decoded.
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        data = path.read_bytes()
+        if not data.startswith(_SEGMENT_MAGIC):
+            raise ValueError(f"{path} is not an archive index segment")
+        pos = len(_SEGMENT_MAGIC)
+        self.first, self.end, count, terms_size = _SEGMENT_HEADER.unpack_from(data, pos)
+        pos += _SEGMENT_HEADER.size
+        self.terms = data[pos : pos + terms_size].decode("utf-8").split("\n") if count else []
+        pos += terms_size
+        self.offsets = array("I")
+        self.offsets.frombytes(data[pos : pos + 4 * (count + 1)])
+        if sys.byteorder != "little":
+            self.offsets.byteswap()
+        self._postings = data[pos + 4 * (count + 1) :]
+
+    @property
+    def docs(self) -> int:
+        return self.end - self.first
+
+    def postings(self, term: str) -> list[tuple[int, int]]:
+        idx = bisect_left(self.terms, term)
+        if idx == len(self.terms) or self.terms[idx] != term:
+            return []
+        return _decode_postings(self._postings[self.offsets[idx] : self.offsets[idx + 1]])
+
+    def all_postings(self) -> dict[str, list[tuple[int, int]]]:
+        return {term: self.postings(term) for term in self.terms}
+
+    @staticmethod
+    def write(
+        directory: Path, first: int, end: int, index: dict[str, list[tuple[int, int]]]
+    ) -> Path:
+        terms = sorted(index)
+        runs = [_encode_postings(index[term]) for term in terms]
+        offsets = array("I", [0])
+        for run in runs:
+            offsets.append(offsets[-1] + len(run))
+        terms_blob = "\n".join(terms).encode("utf-8")
+        path = directory / f"seg-{first:010d}-{end:010d}.idx"
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(_SEGMENT_MAGIC)
+            fh.write(_SEGMENT_HEADER.pack(first, end, len(terms), len(terms_blob)))
+            fh.write(terms_blob)
+            fh.write(_array_bytes(offsets))
+            fh.write(b"".join(runs))
+        os.replace(tmp, path)
+        return path
+
+
+def _terms(text: str) -> list[str]:
+    # search_terms with plural folding, so "rate" finds "rates" and the other
+    # way round; applied to both documents and queries.
+    return [
+        term[:-1] if len(term) > 3 and term[-1] == "s" and term[-2] != "s" else term
+        for term in search_terms(text)
+    ]
+
+
+def _doc_terms(record: dict[str, Any]) -> Counter[str]:
+    terms: Counter[str] = Counter()
+    for name in _TITLE_FIELDS:
+        for term in _terms(record.get(name) or ""):
+            terms[term] += _TITLE_WEIGHT
+    for name in _SUMMARY_FIELDS:
+        terms.update(_terms(record.get(name) or ""))
+    return terms
+
+
+def _doc_record(item: NewsItem, key: str, edition_label: str) -> dict[str, Any]:
+    record = {
+        "edition": key,
+        "edition_label": edition_label,
+        "title": item.title,
+        "link": item.link,
+        "published_ts": item.published_ts,
+        "source": item.source,
+        "language": item.language,
+        "priority": item.priority,
+        "summary": item.summary,
+    }
+    for name in ("title_en", "title_zh", "summary_en", "summary_zh"):
+        value = getattr(item, name)
+        # Translations that only repeat the original add nothing to search.
+        if value and value != record[name.rsplit("_", 1)[0]]:
+            record[name] = value
+    if item.story is not None and item.story.coverage > 1:
+        record["sources"] = sorted(item.story.sources)
+    return record
+
+
+@dataclass
+class SearchHit:
+    doc: int
+    score: float
+    record: dict[str, Any]
+
+
+class Archive:
+    # Append-only archive of sent editions. Items are stored one JSON line
+    # per doc (doc id = line number), edition-level data (summary, market
+    # snapshot, doc range) one line per edition; that line is written last
+    # and commits the edition. Each edition adds an index segment and
+    # trailing segments are merged while the older one is no larger, so a
+    # long history stays at a logarithmic number of segments.
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+        self.segment_dir = self.root / _SEGMENT_DIR
+
+    def _segments(self) -> list[_Segment]:
+        if not self.segment_dir.exists():
+            return []
+        segments = []
+        for path in sorted(self.segment_dir.glob("seg-*.idx")):
+            try:
+                segments.append(_Segment(path))
+            except (OSError, ValueError, struct.error) as exc:
+                logger.warning("Ignoring unreadable archive segment %s: %s", path, exc)
+        # A merge writes its output before deleting the inputs; segments it
+        # covers (left over from an interrupted merge) are skipped.
+        segments.sort(key=lambda seg: (seg.first, -seg.end))
+        live: list[_Segment] = []
+        for segment in segments:
+            if live and segment.end <= live[-1].end:
+                continue
+            live.append(segment)
+        return live
+
+    def editions(self) -> list[dict[str, Any]]:
+        path = self.root / _EDITIONS_FILE
+        if not path.exists():
+            return []
+        editions = []
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    editions.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn final line of an interrupted append.
+                    break
+        return editions
+
+    def _recover(self, committed: int) -> None:
+        # Drops docs and segments written by an append that never committed.
+        offsets = _read_array(self.root / _OFFSETS_FILE, "Q")
+        if len(offsets) <= committed:
+            return
+        logger.warning("Archive: discarding %s uncommitted docs", len(offsets) - committed)
+        with open(self.root / _DOCS_FILE, "r+b") as fh:
+            fh.truncate(offsets[committed])
+        (self.root / _OFFSETS_FILE).write_bytes(_array_bytes(offsets[:committed]))
+        lengths = _read_array(self.root / _LENGTHS_FILE, "H")
+        (self.root / _LENGTHS_FILE).write_bytes(_array_bytes(lengths[:committed]))
+        for path in self.segment_dir.glob("seg-*.idx"):
+            if int(path.stem.rsplit("-", 1)[1]) > committed:
+                path.unlink()
+
+    def append(
+        self,
+        key: str,
+        edition_label: str,
+        subject: str,
+        items: Iterable[NewsItem],
+        summary_cn: str = "",
+        market: Iterable["MarketSection"] = (),
+    ) -> bool:
+        editions = self.editions()
+        if any(edition["key"] == key for edition in editions):
+            logger.info("Archive already has edition %s", key)
+            return False
+        first = editions[-1]["docs"][1] if editions else 0
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self._recover(first)
+
+        docs_path = self.root / _DOCS_FILE
+        offset = docs_path.stat().st_size if docs_path.exists() else 0
+        offsets = array("Q")
+        lengths = array("H")
+        index: dict[str, list[tuple[int, int]]] = {}
+        doc = first
+        with open(docs_path, "ab") as fh:
+            for item in items:
+                record = _doc_record(item, key, edition_label)
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                fh.write(line)
+                offsets.append(offset)
+                offset += len(line)
+                terms = _doc_terms(record)
+                lengths.append(min(sum(terms.values()), 0xFFFF))
+                for term, tf in terms.items():
+                    index.setdefault(term, []).append((doc, tf))
+                doc += 1
+            fh.flush()
+            os.fsync(fh.fileno())
+        with open(self.root / _OFFSETS_FILE, "ab") as fh:
+            fh.write(_array_bytes(offsets))
+        with open(self.root / _LENGTHS_FILE, "ab") as fh:
+            fh.write(_array_bytes(lengths))
+        if doc > first:
+            _Segment.write(self.segment_dir, first, doc, index)
+
+        edition = {
+            "key": key,
+            "edition_label": edition_label,
+            "subject": subject,
+            "archived_at": datetime.now(timezone.utc).isoformat(),
+            "docs": [first, doc],
+            "summary_cn": summary_cn,
+            "market": [asdict(section) for section in market],
+        }
+        with open(self.root / _EDITIONS_FILE, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(edition, ensure_ascii=False) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._merge_tail()
+        logger.info("Archived edition %s (%s items)", key, doc - first)
+        return True
+
+    def _merge_tail(self) -> None:
+        segments = self._segments()
+        tail = 1
+        while tail < len(segments) and segments[-tail - 1].docs <= sum(
+            seg.docs for seg in segments[-tail:]
+        ):
+            tail += 1
+        if tail < 2:
+            return
+        merging = segments[-tail:]
+        index: dict[str, list[tuple[int, int]]] = {}
+        for segment in merging:
+            for term, postings in segment.all_postings().items():
+                index.setdefault(term, []).extend(postings)
+        _Segment.write(self.segment_dir, merging[0].first, merging[-1].end, index)
+        for segment in merging:
+            segment.path.unlink()
+
+    def search(self, query: str, limit: int = 10, match_all: bool = True) -> list[SearchHit]:
+        terms = list(dict.fromkeys(_terms(query)))
+        if not terms:
+            return []
+        segments = self._segments()
+        lengths = _read_array(self.root / _LENGTHS_FILE, "H")
+        total_docs = len(lengths)
+        if not segments or not total_docs:
+            return []
+        average_length = sum(lengths) / total_docs or 1.0
+
+        postings: list[dict[int, int]] = []
+        for term in terms:
+            merged: dict[int, int] = {}
+            for segment in segments:
+                merged.update(segment.postings(term))
+            postings.append(merged)
+        if match_all:
+            candidates = set(min(postings, key=len))
+            for term_postings in postings:
+                candidates.intersection_update(term_postings)
+        else:
+            candidates = set().union(*postings)
+
+        scores: dict[int, float] = dict.fromkeys(candidates, 0.0)
+        for term_postings in postings:
+            df = len(term_postings)
+            if not df:
+                continue
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for doc in candidates:
+                tf = term_postings.get(doc)
+                if not tf:
+                    continue
+                norm = 1 - _BM25_B + _BM25_B * lengths[doc] / average_length
+                scores[doc] += idf * tf * (_BM25_K1 + 1) / (tf + _BM25_K1 * norm)
+        # Ties go to the newer doc (higher id).
+        best = heapq.nlargest(limit, scores.items(), key=lambda kv: (kv[1], kv[0]))
+        records = self.records(doc for doc, _ in best)
+        return [SearchHit(doc, score, record) for (doc, score), record in zip(best, records)]
+
+    def records(self, docs: Iterable[int]) -> list[dict[str, Any]]:
+        offsets = _read_array(self.root / _OFFSETS_FILE, "Q")
+        records = []
+        with open(self.root / _DOCS_FILE, "rb") as fh:
+            for doc in docs:
+                fh.seek(offsets[doc])
+                records.append(json.loads(fh.readline()))
+        return records
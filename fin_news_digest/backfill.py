@@ -0,0 +1,299 @@
+import argparse
+import json
+import logging
+import os
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from dotenv import load_dotenv
+
+from fin_news_digest.config import Config, load_config
+from fin_news_digest.dedupe import dedupe_items, filter_recent, rank_items
+from fin_news_digest.feed_archive import FeedArchive, read_payload
+from fin_news_digest.feed_stream import FeedStreamError, StreamingFeedParser
+from fin_news_digest.fetcher import parse_feed_rows
+from fin_news_digest.models import NewsItem
+from fin_news_digest.source_loader import Source, load_sources
+from fin_news_digest.utils import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Local send time of each edition, as scheduled by scheduler.py.
+_EDITION_ZONES = {
+    "NY 08:00": "America/New_York",
+    "BJ 08:00": "Asia/Shanghai",
+}
+
+
+@dataclass(frozen=True)
+class BackfillParams:
+    lookback_hours: int
+    similarity: float
+    max_items: int
+    rerank: bool
+
+
+def edition_times(
+    labels: list[str], start: date, end: date
+) -> list[tuple[str, datetime]]:
+    times = []
+    day = start
+    while day <= end:
+        for label in labels:
+            zone = ZoneInfo(_EDITION_ZONES[label])
+            hour, minute = (int(part) for part in label.split()[-1].split(":"))
+            local = datetime.combine(day, dt_time(hour, minute), tzinfo=zone)
+            times.append((label, local.astimezone(timezone.utc)))
+        day += timedelta(days=1)
+    return sorted(times, key=lambda entry: entry[1])
+
+
+def _parse_payload(task: tuple[str, float, str]) -> tuple[str, float, list]:
+    # Same order as a streaming fetch: the incremental parser, then
+    # feedparser for feeds it cannot handle.
+    source_id, captured_ts, path = task
+    body = read_payload(Path(path))
+    parser = StreamingFeedParser()
+    try:
+        parser.feed(body)
+        parser.close()
+        rows = parser.rows
+    except FeedStreamError:
+        rows, _ = parse_feed_rows(body, {})
+    return source_id, captured_ts, rows
+
+
+def load_archived_items(
+    archive: FeedArchive, sources: list[Source], pool: ProcessPoolExecutor
+) -> tuple[list[NewsItem], list[int]]:
+    # Every item once, with the earliest capture that contained it: an
+    # edition at time T only sees items first captured at or before T.
+    by_id = {source.source_id: source for source in sources}
+    tasks = [(sid, captured.timestamp(), str(path)) for sid, captured, path in archive.payloads()]
+    first_seen: dict[str, tuple[int, NewsItem]] = {}
+    chunksize = max(1, len(tasks) // 64)
+    for source_id, captured_ts, rows in pool.map(_parse_payload, tasks, chunksize=chunksize):
+        source = by_id.get(source_id) or Source(source_id, source_id, "", "en", 1)
+        for title, link, published, summary in rows:
+            seen = first_seen.get(link)
+            if seen is not None and seen[0] <= captured_ts:
+                continue
+            item = NewsItem(
+                title=title,
+                link=link,
+                # Entries without a date count as published when captured.
+                published=published if published is not None else captured_ts,
+                summary=summary,
+                source=source.name,
+                language=source.language,
+                priority=source.priority,
+            )
+            first_seen[link] = (int(captured_ts), item)
+    ordered = sorted(first_seen.values(), key=lambda entry: entry[0])
+    logger.info("Loaded %s archived items from %s payloads", len(ordered), len(tasks))
+    return [item for _, item in ordered], [seen for seen, _ in ordered]
+
+
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(
+    items: list[NewsItem], seen: list[int], params: BackfillParams, cfg: Config
+) -> None:
+    # Items go to each worker once; editions are then cheap tasks.
+    _WORKER.update(items=items, seen=seen, params=params, cfg=cfg)
+    logging.getLogger("fin_news_digest").setLevel(logging.WARNING)
+
+
+def _rerank(ranked: list[NewsItem], edition_label: str, cfg: Config) -> list[NewsItem]:
+    from fin_news_digest.llm_ranker import OpenAIRerankConfig, rerank_items
+
+    reranked = rerank_items(
+        ranked,
+        edition_label,
+        OpenAIRerankConfig(
+            api_key=cfg.openai_api_key,
+            model=cfg.openai_model,
+            base_url=cfg.openai_base_url,
+            candidates=cfg.openai_candidates,
+        ),
+    )
+    return reranked or ranked
+
+
+def _run_edition(task: tuple[str, float]) -> dict[str, Any]:
+    edition_label, at_ts = task
+    items, seen, params = _WORKER["items"], _WORKER["seen"], _WORKER["params"]
+    now = datetime.fromtimestamp(at_ts, tz=timezone.utc)
+    seconds: dict[str, float] = {}
+
+    started = time.perf_counter()
+    # `seen` is sorted, so the visible items are a prefix.
+    visible = items[: bisect_right(seen, int(at_ts))]
+    recent = filter_recent(visible, params.lookback_hours, now=now)
+    seconds["filter_recent"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    deduped = dedupe_items(recent, params.similarity)
+    seconds["dedupe"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ranked = rank_items(list(deduped), params.max_items, edition_label)
+    seconds["rank"] = time.perf_counter() - started
+
+    if params.rerank:
+        started = time.perf_counter()
+        ranked = _rerank(ranked, edition_label, _WORKER["cfg"])
+        seconds["rerank"] = time.perf_counter() - started
+
+    return {
+        "edition_label": edition_label,
+        "at": now.isoformat(),
+        "visible": len(visible),
+        "recent": len(recent),
+        "deduped": len(deduped),
+        "ranked": [
+            {
+                "link": item.link,
+                "title": item.title,
+                "source": item.source,
+                "priority": item.priority,
+                "published_ts": item.published_ts,
+            }
+            for item in ranked
+        ],
+        "seconds": {stage: round(value, 6) for stage, value in seconds.items()},
+    }
+
+
+def _compare(results: list[dict[str, Any]], baseline_dir: str, top: int) -> dict[str, float]:
+    # Agreement with an earlier backfill, per edition: overlap of the ranked
+    # sets and of the top `top` links.
+    baseline = {}
+    with open(Path(baseline_dir) / "editions.jsonl", encoding="utf-8") as fh:
+        for line in fh:
+            record = json.loads(line)
+            baseline[(record["edition_label"], record["at"])] = record
+    overlaps, top_overlaps = [], []
+    for record in results:
+        other = baseline.get((record["edition_label"], record["at"]))
+        if other is None:
+            continue
+        ours = [entry["link"] for entry in record["ranked"]]
+        theirs = [entry["link"] for entry in other["ranked"]]
+        union = set(ours) | set(theirs)
+        overlaps.append(len(set(ours) & set(theirs)) / len(union) if union else 1.0)
+        top_ours, top_theirs = set(ours[:top]), set(theirs[:top])
+        top_overlaps.append(len(top_ours & top_theirs) / max(len(top_ours | top_theirs), 1))
+    if not overlaps:
+        return {"matched_editions": 0}
+    return {
+        "matched_editions": len(overlaps),
+        "mean_ranked_jaccard": round(sum(overlaps) / len(overlaps), 4),
+        f"mean_top{top}_jaccard": round(sum(top_overlaps) / len(top_overlaps), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Re-run the fetch-free pipeline for past editions over archived feed payloads."
+    )
+    parser.add_argument("--feeds", help="Feed archive directory (defaults to FEED_ARCHIVE_DIR)")
+    parser.add_argument("--start", help="First day, YYYY-MM-DD (defaults to the first capture)")
+    parser.add_argument("--end", help="Last day, YYYY-MM-DD (defaults to the last capture)")
+    parser.add_argument(
+        "--editions", default=",".join(_EDITION_ZONES), help="Comma-separated edition labels"
+    )
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--lookback-hours", type=int, help="Defaults to LOOKBACK_HOURS")
+    parser.add_argument("--similarity", type=float, default=0.86, help="Dedupe threshold")
+    parser.add_argument("--max-items", type=int, help="Defaults to MAX_ITEMS")
+    parser.add_argument(
+        "--rerank", action="store_true", help="Also run the LLM rerank (network calls)"
+    )
+    parser.add_argument("--baseline", help="Earlier --output directory to compare rankings with")
+    parser.add_argument("--top", type=int, default=10, help="Top-k size for --baseline")
+    parser.add_argument("--output", required=True, help="Directory for editions.jsonl/summary.json")
+    args = parser.parse_args()
+
+    load_dotenv()
+    cfg = load_config()
+    configure_logging(cfg.log_level)
+    labels = [label.strip() for label in args.editions.split(",") if label.strip()]
+    unknown = [label for label in labels if label not in _EDITION_ZONES]
+    if unknown:
+        raise SystemExit(f"Unknown editions: {', '.join(unknown)}")
+    feeds_dir = args.feeds or cfg.feed_archive_dir
+    if not feeds_dir:
+        raise SystemExit("Pass --feeds or set FEED_ARCHIVE_DIR")
+    params = BackfillParams(
+        lookback_hours=args.lookback_hours or cfg.lookback_hours,
+        similarity=args.similarity,
+        max_items=args.max_items or cfg.max_items,
+        rerank=args.rerank and bool(cfg.openai_api_key),
+    )
+
+    wall_started = time.perf_counter()
+    sources = load_sources(cfg.sources_file) if Path(cfg.sources_file).exists() else []
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        items, seen = load_archived_items(FeedArchive(feeds_dir), sources, pool)
+    load_seconds = time.perf_counter() - wall_started
+    if not items:
+        raise SystemExit(f"No archived feed payloads in {feeds_dir}")
+
+    first_day = datetime.fromtimestamp(seen[0], tz=timezone.utc).date()
+    last_day = datetime.fromtimestamp(seen[-1], tz=timezone.utc).date()
+    start = date.fromisoformat(args.start) if args.start else first_day
+    end = date.fromisoformat(args.end) if args.end else last_day
+    tasks = [(label, at.timestamp()) for label, at in edition_times(labels, start, end)]
+
+    run_started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.processes,
+        initializer=_init_worker,
+        initargs=(items, seen, params, cfg),
+    ) as pool:
+        chunksize = max(1, len(tasks) // (args.processes * 4))
+        results = list(pool.map(_run_edition, tasks, chunksize=chunksize))
+    run_seconds = time.perf_counter() - run_started
+
+    out = Path(args.output)
+    out.mkdir(parents=True, exist_ok=True)
+    with open(out / "editions.jsonl", "w", encoding="utf-8") as fh:
+        for record in results:
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+    stage_seconds: dict[str, float] = {}
+    for record in results:
+        for stage, value in record["seconds"].items():
+            stage_seconds[stage] = stage_seconds.get(stage, 0.0) + value
+    summary: dict[str, Any] = {
+        "params": {**params.__dict__, "start": start.isoformat(), "end": end.isoformat()},
+        "items": len(items),
+        "editions": len(results),
+        "processes": args.processes,
+        "load_seconds": round(load_seconds, 3),
+        "run_seconds": round(run_seconds, 3),
+        "editions_per_s": round(len(results) / run_seconds, 1) if run_seconds else None,
+        "stage_cpu_seconds": {stage: round(value, 3) for stage, value in stage_seconds.items()},
+    }
+    if args.baseline:
+        summary["baseline"] = _compare(results, args.baseline, args.top)
+    (out / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    print(
+        f"{len(results)} editions ({start} to {end}) over {len(items)} items in "
+        f"{run_seconds:.2f}s with {args.processes} processes (+{load_seconds:.2f}s loading)"
+    )
+    if "baseline" in summary:
+        print(f"vs {args.baseline}: {summary['baseline']}")
+    print(f"Results in {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import json
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fin_news_digest.fetcher import parse_feed_rows
+from fin_news_digest.replay import FixtureBundle
+
+_FEED_TYPES = ("xml", "rss", "atom")
+
+
+def _recorded_feeds(bundle_dir: str) -> list[tuple[bytes, dict[str, str]]]:
+    bundle = FixtureBundle.load(bundle_dir)
+    feeds = []
+    for responses in bundle.entries.values():
+        for entry in responses:
+            headers = {k.lower(): v for k, v in entry["headers"].items()}
+            content_type = headers.get("content-type", "")
+            if entry["status"] == 200 and any(t in content_type for t in _FEED_TYPES):
+                feeds.append((bundle.body(entry["body"]), headers))
+    return feeds
+
+
+def _parse_one(payload: tuple[bytes, dict[str, str]]) -> tuple[int, int]:
+    rows, _ = parse_feed_rows(*payload)
+    return len(rows), len(pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _report(label: str, seconds: float, feeds: int, entries: int, body_bytes: int) -> dict:
+    result = {
+        "seconds": round(seconds, 4),
+        "feeds_per_s": round(feeds / seconds, 1),
+        "entries_per_s": round(entries / seconds, 1),
+        "mib_per_s": round(body_bytes / seconds / (1024 * 1024), 2),
+    }
+    print(
+        f"{label:<14} {result['seconds']:>9.3f} {result['feeds_per_s']:>10.1f} "
+        f"{result['entries_per_s']:>12.0f} {result['mib_per_s']:>8.2f}"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare in-process and process-pool feed parsing on recorded feed bodies."
+    )
+    parser.add_argument(
+        "--bundle", required=True, help="Bundle from python -m fin_news_digest.replay record"
+    )
+    parser.add_argument("--processes", default="1,2,4", help="Comma-separated pool sizes")
+    parser.add_argument(
+        "--copies",
+        type=int,
+        default=20,
+        help="Parse each recorded feed this many times to get a stable measurement",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    feeds = _recorded_feeds(args.bundle)
+    if not feeds:
+        raise SystemExit(f"No feed responses recorded in {args.bundle}")
+    workload = feeds * args.copies
+    body_bytes = sum(len(body) for body, _ in workload)
+
+    print(
+        f"{len(feeds)} recorded feeds x {args.copies} = {len(workload)} parses, "
+        f"{body_bytes / 1024:.0f} KiB"
+    )
+    print(f"{'mode':<14} {'seconds':>9} {'feeds/s':>10} {'entries/s':>12} {'MiB/s':>8}")
+
+    started = time.perf_counter()
+    counts = [_parse_one(payload) for payload in workload]
+    elapsed = time.perf_counter() - started
+    entries = sum(n for n, _ in counts)
+    results = {
+        "single_thread": _report("single-thread", elapsed, len(workload), entries, body_bytes)
+    }
+    results["pickled_row_bytes_per_feed"] = round(sum(b for _, b in counts) / len(counts), 1)
+
+    for processes in (int(p) for p in args.processes.split(",") if p.strip()):
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            # Start the workers (and their imports) before timing.
+            list(pool.map(_parse_one, feeds[:1] * processes))
+            started = time.perf_counter()
+            chunksize = max(1, len(workload) // (processes * 8))
+            counts = list(pool.map(_parse_one, workload, chunksize=chunksize))
+            elapsed = time.perf_counter() - started
+        results[f"processes_{processes}"] = _report(
+            f"{processes} processes", elapsed, len(workload), sum(n for n, _ in counts), body_bytes
+        )
+
+    print(f"pickled rows per feed: {results['pickled_row_bytes_per_feed']:.0f} bytes")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
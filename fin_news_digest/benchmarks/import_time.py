@@ -0,0 +1,87 @@
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+_DEFAULT_MODULES = (
+    "fin_news_digest.run_actions",
+    "fin_news_digest.resume",
+    "fin_news_digest.digest",
+    "fin_news_digest.scheduler",
+)
+
+# "import time: self [us] | cumulative | imported package", nesting shown by
+# indentation of the package name (one space at the top level, +2 per level).
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _import_once(module: str) -> tuple[float, int, dict[str, int]]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - started
+    total = 0
+    children: dict[str, int] = {}
+    direct: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        depth, name, cumulative = len(match.group(3)), match.group(4), int(match.group(2))
+        # Children are printed before their parent: depth 3 lines belong to
+        # the next depth 1 (top-level) line.
+        if depth == 3:
+            children[name] = cumulative
+        elif depth == 1:
+            total += cumulative
+            if name == module:
+                direct = children
+            children = {}
+    return wall, total, direct
+
+
+def _measure(module: str, repeat: int, top: int) -> dict:
+    runs = [_import_once(module) for _ in range(repeat)]
+    _, total, direct = min(runs, key=lambda run: run[1])
+    heaviest = sorted(direct.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "import_ms": round(total / 1000, 1),
+        "process_ms": round(min(run[0] for run in runs) * 1000, 1),
+        "heaviest": {name: round(us / 1000, 1) for name, us in heaviest},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cold import time of the entry points, from python -X importtime."
+    )
+    parser.add_argument(
+        "--modules", default=",".join(_DEFAULT_MODULES), help="Comma-separated modules"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per module (best is kept)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest direct imports to list")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    print(f"{'module':<30} {'import ms':>10} {'process ms':>11}  heaviest")
+    for module in args.modules.split(","):
+        result = _measure(module.strip(), args.repeat, args.top)
+        results[module] = result
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in result["heaviest"].items())
+        print(
+            f"{module:<30} {result['import_ms']:>10.1f} {result['process_ms']:>11.1f}  {heaviest}"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import gc
+import json
+import pickle
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from fin_news_digest.models import NewsItem
+from fin_news_digest.synthetic import CorpusSpec, iter_items
+
+
+@dataclass
+class _DictNewsItem:
+    # The previous NewsItem layout, kept here as the comparison baseline.
+    title: str
+    link: str
+    published: datetime
+    summary: str
+    source: str
+    language: str
+    priority: int
+
+    title_en: str | None = None
+    title_zh: str | None = None
+    summary_en: str | None = None
+    summary_zh: str | None = None
+
+
+def _as_dict_item(item: NewsItem) -> _DictNewsItem:
+    # Fresh string copies, as feedparser hands out new objects per entry.
+    return _DictNewsItem(
+        title=item.title,
+        link=item.link,
+        published=item.published,
+        summary=item.summary,
+        source="".join(item.source),
+        language="".join(item.language),
+        priority=item.priority,
+    )
+
+
+def _as_slotted_item(item: NewsItem) -> NewsItem:
+    return NewsItem(
+        title=item.title,
+        link=item.link,
+        published=item.published_ts,
+        summary=item.summary,
+        source="".join(item.source),
+        language="".join(item.language),
+        priority=item.priority,
+    )
+
+
+def _translate(items: list[Any]) -> None:
+    for item in items:
+        item.title_en = item.title
+        item.summary_en = item.summary
+        item.title_zh = item.title + "（译）"
+        item.summary_zh = item.summary + "（译）"
+
+
+def _measure(
+    corpus: list[NewsItem], build: Callable[[NewsItem], Any], bilingual: bool
+) -> dict[str, float]:
+    # Title/summary strings are shared with the corpus, so the traced size is
+    # the per-item container overhead plus whatever each layout copies.
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    items = [build(item) for item in corpus]
+    if bilingual:
+        _translate(items)
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "bytes_per_item": round(current / len(items), 1),
+        "total_mib": round(current / (1024 * 1024), 2),
+        "build_seconds": round(elapsed, 3),
+        "pickle_bytes_per_item": round(
+            len(pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)) / len(items), 1
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Memory per NewsItem for the slotted layout vs the previous dataclass."
+    )
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(count=args.items, seed=args.seed)
+    corpus = list(iter_items(spec, datetime.now(timezone.utc)))
+    results: dict[str, dict[str, float]] = {}
+    print(f"{args.items} items")
+    print(f"{'layout':<22} {'B/item':>9} {'MiB':>8} {'build s':>8} {'pickle B/item':>14}")
+    for label, build, bilingual in (
+        ("dataclass", _as_dict_item, False),
+        ("slotted", _as_slotted_item, False),
+        ("dataclass+bilingual", _as_dict_item, True),
+        ("slotted+bilingual", _as_slotted_item, True),
+    ):
+        result = _measure(corpus, build, bilingual)
+        results[label] = result
+        print(
+            f"{label:<22} {result['bytes_per_item']:>9.0f} {result['total_mib']:>8.1f} "
+            f"{result['build_seconds']:>8.2f} {result['pickle_bytes_per_item']:>14.0f}"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
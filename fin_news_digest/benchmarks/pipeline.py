@@ -0,0 +1,81 @@
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from fin_news_digest.replay import isolated_run_env, null_smtp, replaying
+from fin_news_digest.translator import clear_translation_cache
+
+
+def _run_once(edition: str, bundle: str, latency_ms: float, latency_scale: float) -> dict:
+    from fin_news_digest.digest import run_digest
+
+    with isolated_run_env() as workdir, null_smtp():
+        with replaying(bundle, latency_ms, latency_scale):
+            started = time.perf_counter()
+            run_digest(edition)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        reports = sorted((workdir / "reports").glob("*.json"))
+        report = json.loads(reports[-1].read_text(encoding="utf-8")) if reports else {}
+    report["wall_ms"] = elapsed_ms
+    return report
+
+
+def _summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time run_digest end to end and per stage against a recorded fixture bundle."
+    )
+    parser.add_argument("--bundle", required=True, help="Bundle from python -m fin_news_digest.replay record")
+    parser.add_argument("--edition", default="Manual")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-scale", type=float, default=0.0)
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Keep in-process caches between repetitions instead of starting cold",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeat):
+        if not args.warm:
+            clear_translation_cache()
+        runs.append(_run_once(args.edition, args.bundle, args.latency_ms, args.latency_scale))
+
+    stages: dict[str, list[float]] = {}
+    for run in runs:
+        for name, duration in run.get("stages", {}).items():
+            stages.setdefault(name, []).append(duration)
+    results = {
+        "bundle": args.bundle,
+        "edition": args.edition,
+        "repeat": args.repeat,
+        "latency_ms": args.latency_ms,
+        "latency_scale": args.latency_scale,
+        "end_to_end": _summarize([run["wall_ms"] for run in runs]),
+        "stages": {name: _summarize(samples) for name, samples in stages.items()},
+    }
+
+    print(f"{'stage':<12} {'mean ms':>10} {'min ms':>10} {'max ms':>10}")
+    for name, summary in [("total", results["end_to_end"]), *results["stages"].items()]:
+        print(
+            f"{name:<12} {summary['mean_ms']:>10.1f} "
+            f"{summary['min_ms']:>10.1f} {summary['max_ms']:>10.1f}"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
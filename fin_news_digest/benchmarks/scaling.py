@@ -0,0 +1,183 @@
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from fin_news_digest.dedupe import dedupe_items, filter_recent, rank_batch, rank_items
+from fin_news_digest.emailer import render_bodies
+from fin_news_digest.item_batch import ItemBatch
+from fin_news_digest.models import NewsItem
+from fin_news_digest.state import mark_sent, unsent_batch
+from fin_news_digest.synthetic import CorpusSpec, generate_items
+from fin_news_digest.utils import pin_utc_now, utc_now
+
+
+# Row-wise baselines for the columnar stages; the pipeline itself only runs
+# the batch forms (unsent_batch / LookbackWindow).
+def filter_sent(items: list[NewsItem], state: dict, ttl_hours: int) -> tuple[list, dict]:
+    now = utc_now()
+    cutoff = now - timedelta(hours=ttl_hours)
+    sent = {
+        link: ts
+        for link, ts in state.get("sent", {}).items()
+        if datetime.fromisoformat(ts) >= cutoff
+    }
+    remaining = []
+    for item in items:
+        if item.link in sent:
+            continue
+        remaining.append(item)
+        sent[item.link] = now.isoformat()
+    state["sent"] = sent
+    return remaining, state
+
+
+def filter_sent_batch(batch: ItemBatch, state: dict, ttl_hours: int) -> tuple[ItemBatch, dict]:
+    remaining = unsent_batch(batch, state, ttl_hours)
+    return remaining, mark_sent(state, (item.link for item in remaining.items))
+
+
+def filter_recent_batch(batch: ItemBatch, lookback_hours: int) -> ItemBatch:
+    cutoff_ts = (utc_now() - timedelta(hours=lookback_hours)).timestamp()
+    return batch.take(batch.published >= cutoff_ts)
+
+
+def _sent_state(items: list[NewsItem], now: datetime) -> dict:
+    # Roughly a third of the corpus was already delivered in earlier editions.
+    return {"sent": {item.link: now.isoformat() for item in items[::3]}}
+
+
+def _with_bilingual(items: list[NewsItem]) -> list[NewsItem]:
+    for item in items:
+        item.title_en = item.title_zh = item.title
+        item.summary_en = item.summary_zh = item.summary
+    return items
+
+
+def _stages(max_items: int, render_limit: int, now: datetime) -> dict[str, Callable[[list], Any]]:
+    return {
+        "filter_recent": lambda items: filter_recent(items, 36),
+        "dedupe_items": lambda items: dedupe_items(items),
+        "filter_sent": lambda items: filter_sent(items, _sent_state(items, now), 72),
+        "rank_items": lambda items: rank_items(items, max_items, "NY 08:00"),
+        "render": lambda items: render_bodies(
+            _with_bilingual(items[:render_limit] if render_limit else items), "NY 08:00"
+        ),
+        # Columnar variants; the batch_build row is the one-off conversion cost.
+        "batch_build": lambda items: _batch(items, rebuild=True),
+        "filter_recent[batch]": lambda items: filter_recent_batch(_batch(items), 36),
+        "filter_sent[batch]": lambda items: filter_sent_batch(
+            _batch(items), _sent_state(items, now), 72
+        ),
+        "rank_items[batch]": lambda items: rank_batch(_batch(items), max_items, "NY 08:00"),
+    }
+
+
+_BATCHES: dict[int, ItemBatch] = {}
+
+
+def _batch(items: list[NewsItem], rebuild: bool = False) -> ItemBatch:
+    # Batch stages are timed on the batch built by the batch_build stage, as in
+    # the pipeline where it is built once after fetching.
+    key = id(items[0]) if items else 0
+    if rebuild or key not in _BATCHES:
+        _BATCHES.clear()
+        _BATCHES[key] = ItemBatch.from_items(items)
+    return _BATCHES[key]
+
+
+def _measure(
+    fn: Callable[[list], Any], items: list[NewsItem], units: int, memory: bool
+) -> dict[str, float]:
+    started = time.perf_counter()
+    fn(list(items))
+    elapsed = time.perf_counter() - started
+    result = {"seconds": round(elapsed, 4), "items_per_s": round(units / elapsed, 1)}
+    if memory:
+        tracemalloc.start()
+        fn(list(items))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mib"] = round(peak / (1024 * 1024), 2)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time and memory of dedupe/rank/state/render stages on synthetic corpora."
+    )
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated item counts")
+    parser.add_argument("--stages", default="", help="Comma-separated subset of stages")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--zh-ratio", type=float, default=0.3)
+    parser.add_argument("--duplicate-rate", type=float, default=0.2)
+    parser.add_argument("--sources", type=int, default=40)
+    parser.add_argument("--max-items", type=int, default=40)
+    parser.add_argument(
+        "--render-limit",
+        type=int,
+        default=0,
+        help="Render at most this many items (0 renders the whole corpus)",
+    )
+    parser.add_argument(
+        "--stage-budget",
+        type=float,
+        default=120.0,
+        help="Skip a stage when extrapolating its last run predicts more seconds than this",
+    )
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak runs")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    pin_utc_now(now)
+    stages = _stages(args.max_items, args.render_limit, now)
+    if args.stages:
+        wanted = {name.strip() for name in args.stages.split(",")}
+        stages = {name: fn for name, fn in stages.items() if name in wanted}
+
+    # Warm up template compilation and regex caches so the first size is not penalized.
+    warmup = generate_items(CorpusSpec(count=50, seed=args.seed), now)
+    for fn in stages.values():
+        fn(list(warmup))
+
+    results: dict[str, dict[str, Any]] = {}
+    last: dict[str, tuple[int, float]] = {}
+    print(f"{'items':>9} {'stage':<20} {'seconds':>9} {'items/s':>12} {'peak MiB':>9}")
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        spec = CorpusSpec(
+            count=size,
+            seed=args.seed,
+            zh_ratio=args.zh_ratio,
+            duplicate_rate=args.duplicate_rate,
+            sources=args.sources,
+        )
+        items = generate_items(spec, now)
+        results[str(size)] = {}
+        for name, fn in stages.items():
+            if name in last:
+                prev_size, prev_seconds = last[name]
+                # Assume the worst case (quadratic) growth when extrapolating.
+                predicted = prev_seconds * (size / prev_size) ** 2
+                if predicted > args.stage_budget:
+                    results[str(size)][name] = {"skipped_predicted_seconds": round(predicted, 1)}
+                    print(f"{size:>9} {name:<20} skipped (predicted {predicted:.0f}s)")
+                    continue
+            units = min(size, args.render_limit or size) if name == "render" else size
+            measured = _measure(fn, items, units, not args.no_memory)
+            last[name] = (size, measured["seconds"])
+            results[str(size)][name] = measured
+            print(
+                f"{size:>9} {name:<20} {measured['seconds']:>9.3f} "
+                f"{measured['items_per_s']:>12.0f} {measured.get('peak_mib', float('nan')):>9.1f}"
+            )
+    pin_utc_now(None)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from fin_news_digest.emailer import prepare_message, render_bodies
+from fin_news_digest.models import NewsItem
+from fin_news_digest.smtp_pool import SMTPPool, SMTPSettings
+
+
+class _CountingSink:
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+        self.messages = 0
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        with self._lock:
+            self.messages += 1
+        return "250 OK"
+
+
+def _sample_items(count: int) -> list[NewsItem]:
+    now = datetime.now(timezone.utc)
+    items = []
+    for idx in range(count):
+        items.append(
+            NewsItem(
+                title=f"Benchmark headline {idx}",
+                link=f"https://example.com/news/{idx}",
+                published=now - timedelta(minutes=idx),
+                summary="Central bank holds rates steady as inflation cools. " * 4,
+                source="Benchmark",
+                language="en",
+                priority=3,
+                title_en=f"Benchmark headline {idx}",
+                title_zh=f"基准标题 {idx}",
+                summary_en="Central bank holds rates steady as inflation cools.",
+                summary_zh="央行维持利率不变，通胀降温。",
+            )
+        )
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure SMTP pool throughput against a local aiosmtpd sink."
+    )
+    parser.add_argument("--recipients", type=int, default=5000)
+    parser.add_argument(
+        "--connections", default="1,2,4,8", help="Comma-separated pool sizes"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="Messages per second (0 = unlimited)"
+    )
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument(
+        "--latency-ms", type=float, default=20.0, help="Simulated server time per message"
+    )
+    args = parser.parse_args()
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError as exc:
+        raise SystemExit(
+            "aiosmtpd is required: pip install -r fin_news_digest/requirements-bench.txt"
+        ) from exc
+
+    sink = _CountingSink(args.latency_ms / 1000)
+    controller = Controller(sink, hostname="127.0.0.1", port=args.port)
+    controller.start()
+    try:
+        bodies = render_bodies(_sample_items(args.items), "Benchmark")
+        prepared = prepare_message("Benchmark", "Digest <bench@example.com>", bodies)
+        recipients = [f"user{idx}@example.com" for idx in range(args.recipients)]
+        print(f"payload={len(prepared.payload)} bytes recipients={len(recipients)}")
+        for connections in (int(n) for n in args.connections.split(",") if n.strip()):
+            before = sink.messages
+            pool = SMTPPool(
+                SMTPSettings(
+                    host="127.0.0.1", port=args.port, use_tls=False, user="", password=""
+                ),
+                connections=connections,
+                rate_per_second=args.rate,
+            )
+            started = time.perf_counter()
+            results = pool.deliver(prepared, recipients)
+            elapsed = time.perf_counter() - started
+            delivered = sum(1 for result in results if result.ok)
+            print(
+                f"connections={connections:<3} delivered={delivered:<6} "
+                f"sink={sink.messages - before:<6} elapsed={elapsed:.2f}s "
+                f"rate={delivered / elapsed:.0f} msg/s"
+            )
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
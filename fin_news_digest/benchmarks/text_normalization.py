@@ -0,0 +1,172 @@
+import argparse
+import html
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from fin_news_digest.models import NewsItem
+from fin_news_digest.synthetic import CorpusSpec, generate_items
+from fin_news_digest.textnorm import TextFeatures, clean_text, title_tokens
+
+# The per-call implementations textnorm replaced, kept as the baseline.
+_LEGACY_STOPWORDS = {
+    "a", "an", "the", "and", "or", "for", "to", "in", "on", "of", "at", "with", "from", "by",
+}
+
+
+def _legacy_strip_html(text: str) -> str:
+    if not text:
+        return ""
+    text = html.unescape(text)
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def _legacy_normalize_title(title: str) -> list[str]:
+    if not title:
+        return []
+    cleaned = re.sub(r"[^a-zA-Z0-9\s]", " ", title.lower())
+    return [t for t in cleaned.split() if t and t not in _LEGACY_STOPWORDS]
+
+
+def _legacy_story_tokens(title: str) -> frozenset[str]:
+    tokens = set(_legacy_normalize_title(title))
+    for run in re.findall(r"[\u4e00-\u9fff]+", title):
+        if len(run) == 1:
+            tokens.add(run)
+        tokens.update(run[i : i + 2] for i in range(len(run) - 1))
+    return frozenset(tokens)
+
+
+def _legacy_text_lower(item: NewsItem) -> str:
+    return f"{item.title} {item.summary}".lower()
+
+
+def _legacy_pipeline(item: NewsItem) -> None:
+    # What one item went through per run: dedupe tokens, story tokens and an
+    # edition boost lowercase, each computed from scratch.
+    sorted(set(_legacy_normalize_title(item.title)))
+    _legacy_story_tokens(item.title)
+    _legacy_text_lower(item)
+
+
+def _cached_pipeline(item: NewsItem) -> None:
+    text = item.text
+    sorted(text.token_set)
+    text.shingles
+    text.text_lower
+
+
+def _raw_texts(items: list[NewsItem], rng: random.Random) -> list[str]:
+    # Feed titles and summaries as they arrive: mostly plain, some with
+    # entities and inline markup.
+    texts = []
+    for item in items:
+        for text in (item.title, item.summary):
+            roll = rng.random()
+            if roll < 0.2:
+                text = f"<p>{text.replace(' ', ' <b>', 1)}</b> &amp; more</p>\n"
+            elif roll < 0.3:
+                text = text.replace(" ", "&nbsp;", 2) + "  \t"
+            texts.append(text)
+    return texts
+
+
+def _check_equivalence(items: list[NewsItem], texts: list[str]) -> None:
+    for text in texts:
+        assert clean_text(text) == _legacy_strip_html(text), text
+    for item in items:
+        features = TextFeatures(item.title, item.summary)
+        assert list(features.tokens) == _legacy_normalize_title(item.title), item.title
+        assert features.shingles == _legacy_story_tokens(item.title), item.title
+        assert features.text_lower == _legacy_text_lower(item), item.title
+
+
+def _time(fn: Callable[[Any], Any], inputs: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for value in inputs:
+            fn(value)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _fresh(items: list[NewsItem]) -> list[NewsItem]:
+    for item in items:
+        item._text = None
+    return items
+
+
+def _report(name: str, legacy: float, current: float) -> dict[str, float]:
+    result = {
+        "legacy_ms": round(legacy * 1000, 2),
+        "textnorm_ms": round(current * 1000, 2),
+        "speedup": round(legacy / current, 2),
+    }
+    print(
+        f"{name:<18} {result['legacy_ms']:>10.1f} {result['textnorm_ms']:>12.1f} "
+        f"{result['speedup']:>7.2f}x"
+    )
+    return result
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-call text normalization against the single-pass cached textnorm."
+    )
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is kept)")
+    parser.add_argument(
+        "--passes",
+        type=int,
+        default=3,
+        help="Pipeline passes over the same items (prefetch, fallback lookback, send)",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    items = generate_items(
+        CorpusSpec(count=args.items, seed=args.seed), datetime.now(timezone.utc)
+    )
+    texts = _raw_texts(items, random.Random(args.seed))
+    _check_equivalence(items, texts)
+    titles = [item.title for item in items]
+
+    cases: dict[str, tuple[Callable, Callable, list]] = {
+        "strip_html": (_legacy_strip_html, clean_text, texts),
+        "normalize_title": (_legacy_normalize_title, lambda t: title_tokens(t.lower()), titles),
+        "story_tokens": (_legacy_story_tokens, lambda t: TextFeatures(t).shingles, titles),
+    }
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'case':<18} {'legacy ms':>10} {'textnorm ms':>12} {'speedup':>8}")
+    for name, (legacy, current, inputs) in cases.items():
+        results[name] = _report(
+            name, _time(legacy, inputs, args.repeat), _time(current, inputs, args.repeat)
+        )
+
+    # The hot-loop view: every derived form for every item, `passes` times.
+    workload = items * args.passes
+    legacy = _time(_legacy_pipeline, workload, args.repeat)
+    best = float("inf")
+    for _ in range(args.repeat):
+        _fresh(items)
+        started = time.perf_counter()
+        for item in workload:
+            _cached_pipeline(item)
+        best = min(best, time.perf_counter() - started)
+    results[f"pipeline_x{args.passes}"] = _report(f"pipeline x{args.passes}", legacy, best)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+OPTIONAL_STAGES = ("rerank", "summary", "market", "summary_translation")
+
+# Worst-case cost of one attempt at each optional stage: the LLM request
+# timeouts, a market snapshot round, and a batch of summary translations.
+_STAGE_ESTIMATES_SECONDS = {
+    "rerank": 60.0,
+    "summary": 60.0,
+    "market": 30.0,
+    "summary_translation": 60.0,
+}
+
+
+def parse_degrade_order(value: str) -> tuple[str, ...]:
+    order = [stage.strip() for stage in value.split(",") if stage.strip()]
+    unknown = [stage for stage in order if stage not in OPTIONAL_STAGES]
+    if unknown:
+        raise ValueError(
+            f"Unknown stages in RUN_BUDGET_DEGRADE_ORDER: {', '.join(unknown)} "
+            f"(expected {', '.join(OPTIONAL_STAGES)})"
+        )
+    # Stages left out are the most important ones, kept until last.
+    return tuple(order) + tuple(stage for stage in OPTIONAL_STAGES if stage not in order)
+
+
+@dataclass
+class RunBudget:
+    # Wall-clock budget for one run_digest call. `reserve_seconds` is held
+    # back for render and delivery; optional stages run only while the rest
+    # of the budget also covers every more important optional stage still
+    # ahead, so they are given up in `degrade_order` (first = first to go).
+    # `stages` lists the optional stages this run has configured at all.
+    # None disables the budget; a budget of 0 (or less) is already spent.
+    total_seconds: float | None
+    reserve_seconds: float = 60.0
+    degrade_order: tuple[str, ...] = OPTIONAL_STAGES
+    stages: frozenset[str] = frozenset(OPTIONAL_STAGES)
+    started: float = field(default_factory=time.monotonic)
+    degraded: list[str] = field(default_factory=list)
+    _done: set[str] = field(default_factory=set)
+
+    @property
+    def enabled(self) -> bool:
+        return self.total_seconds is not None
+
+    def remaining(self) -> float:
+        if not self.enabled:
+            return math.inf
+        return self.total_seconds - (time.monotonic() - self.started)
+
+    def deadline(self) -> float | None:
+        # Monotonic time by which the non-reserved part of the budget is gone.
+        if not self.enabled:
+            return None
+        return self.started + self.total_seconds - self.reserve_seconds
+
+    def allow(self, stage: str) -> bool:
+        self._done.add(stage)
+        if not self.enabled:
+            return True
+        position = self.degrade_order.index(stage)
+        needed = _STAGE_ESTIMATES_SECONDS[stage] + sum(
+            _STAGE_ESTIMATES_SECONDS[later]
+            for later in self.degrade_order[position + 1 :]
+            if later in self.stages and later not in self._done
+        )
+        available = self.remaining() - self.reserve_seconds
+        if available >= needed:
+            return True
+        self.degraded.append(stage)
+        logger.warning(
+            "Run budget: %.0fs left (%.0fs reserved), skipping %s (needs %.0fs with later stages)",
+            self.remaining(),
+            self.reserve_seconds,
+            stage,
+            needed,
+        )
+        return False
+
+    def timeout(self, default: float) -> float:
+        # Caps a request timeout so a single call cannot run past the deadline.
+        if not self.enabled:
+            return default
+        return max(1.0, min(default, self.remaining() - self.reserve_seconds))
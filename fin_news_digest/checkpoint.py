@@ -0,0 +1,106 @@
+import logging
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from fin_news_digest.tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the shape of a stage's output changes so stale pickles are
+# recomputed instead of being fed into newer code.
+CHECKPOINT_VERSION = 6
+
+STAGES = ("fetch", "select", "rank", "translate", "summary", "market")
+
+_COMPLETE_MARKER = "COMPLETE"
+
+
+class CheckpointStore:
+    def __init__(self, root: str, run_id: str, enabled: bool = True) -> None:
+        self.root = Path(root) / run_id
+        self.run_id = run_id
+        self.enabled = enabled
+
+    def _path(self, stage: str) -> Path:
+        return self.root / f"{stage}.pkl"
+
+    def load(self, stage: str) -> tuple[bool, Any]:
+        path = self._path(stage)
+        if not self.enabled or not path.exists():
+            return False, None
+        try:
+            with open(path, "rb") as fh:
+                record = pickle.load(fh)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Ignoring unreadable checkpoint %s: %s", path, exc)
+            return False, None
+        if record.get("version") != CHECKPOINT_VERSION:
+            logger.info("Ignoring checkpoint %s from version %s", path, record.get("version"))
+            return False, None
+        return True, record["data"]
+
+    def save(self, stage: str, data: Any) -> None:
+        if not self.enabled:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        record = {
+            "version": CHECKPOINT_VERSION,
+            "run_id": self.run_id,
+            "stage": stage,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "data": data,
+        }
+        path = self._path(stage)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump(record, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def run(self, stage: str, compute: Callable[[], Any]) -> Any:
+        found, data = self.load(stage)
+        if found:
+            logger.info("Stage %s restored from checkpoint %s", stage, self.run_id)
+            current_span().set("checkpoint", "restored")
+            return data
+        data = compute()
+        self.save(stage, data)
+        return data
+
+    def invalidate_from(self, stage: str) -> None:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}'; expected one of {', '.join(STAGES)}")
+        for name in STAGES[STAGES.index(stage):]:
+            self._path(name).unlink(missing_ok=True)
+        (self.root / _COMPLETE_MARKER).unlink(missing_ok=True)
+
+    def age_seconds(self) -> float:
+        # Time since the oldest stored stage was written; 0 with none stored.
+        written = [
+            path.stat().st_mtime for name in STAGES if (path := self._path(name)).exists()
+        ]
+        return time.time() - min(written) if written else 0.0
+
+    def is_complete(self) -> bool:
+        return self.enabled and (self.root / _COMPLETE_MARKER).exists()
+
+    def mark_complete(self) -> None:
+        if not self.enabled or not self.root.exists():
+            return
+        (self.root / _COMPLETE_MARKER).write_text(
+            datetime.now(timezone.utc).isoformat(), encoding="utf-8"
+        )
+
+
+def prune_checkpoints(root: str, max_age_hours: int) -> None:
+    base = Path(root)
+    if not base.exists():
+        return
+    cutoff = time.time() - max_age_hours * 3600
+    for path in base.iterdir():
+        if path.is_dir() and path.stat().st_mtime < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
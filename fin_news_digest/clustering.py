@@ -0,0 +1,125 @@
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from fin_news_digest.models import NewsItem
+
+logger = logging.getLogger(__name__)
+
+# Tokens shared by more stories than this ("stocks", "fed", ...) say nothing
+# about which story an item belongs to and are skipped for candidate lookup,
+# which keeps clustering close to linear on large windows.
+_MAX_POSTINGS = 64
+# Matching members must be published within this many seconds of the item, so
+# a recurring headline template (daily closes, rate decisions) does not chain
+# separate days into one story.
+_MAX_MEMBER_GAP = 12 * 3600
+
+
+@dataclass(eq=False)
+class StoryCluster:
+    representative: NewsItem
+    items: list[NewsItem] = field(default_factory=list)
+    sources: set[str] = field(default_factory=set)
+    earliest_ts: int = 0
+    latest_ts: int = 0
+
+    def add(self, item: NewsItem) -> None:
+        if not self.items:
+            self.earliest_ts = self.latest_ts = item.published_ts
+        self.items.append(item)
+        self.sources.add(item.source)
+        self.earliest_ts = min(self.earliest_ts, item.published_ts)
+        self.latest_ts = max(self.latest_ts, item.published_ts)
+        # Same preference as dedupe: higher priority source, then more recent.
+        current = self.representative
+        if (item.priority, item.published_ts) > (current.priority, current.published_ts):
+            self.representative = item
+
+    @property
+    def coverage(self) -> int:
+        return len(self.items)
+
+    @property
+    def other_sources(self) -> list[str]:
+        return sorted(self.sources - {self.representative.source})
+
+
+class StoryClusterer:
+    # Incremental single-link clustering: an item joins the story holding its
+    # most similar member (Jaccard >= threshold over title shingles: latin
+    # tokens plus character bigrams, so Chinese headlines cluster too), found
+    # via an inverted token index rather than a scan of every story.
+    def __init__(self, similarity_threshold: float = 0.5) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.clusters: list[StoryCluster] = []
+        self._members: list[tuple[int, int, frozenset[str]]] = []
+        self._postings: dict[str, list[int]] = {}
+
+    def add(self, item: NewsItem, duplicates: Iterable[NewsItem] = ()) -> StoryCluster:
+        tokens = item.text.shingles
+        cluster_idx = self._match(tokens, item.published_ts)
+        if cluster_idx is None:
+            cluster_idx = len(self.clusters)
+            self.clusters.append(StoryCluster(representative=item))
+        cluster = self.clusters[cluster_idx]
+        cluster.add(item)
+        # Near-identical copies dedupe already folded into this item count
+        # towards coverage without being matched again.
+        for duplicate in duplicates:
+            cluster.add(duplicate)
+
+        member = len(self._members)
+        self._members.append((cluster_idx, item.published_ts, tokens))
+        for token in tokens:
+            self._postings.setdefault(token, []).append(member)
+        return cluster
+
+    def _match(self, tokens: frozenset[str], published_ts: int) -> int | None:
+        candidates: set[int] = set()
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings and len(postings) <= _MAX_POSTINGS:
+                candidates.update(postings)
+        best: tuple[float, int] | None = None
+        for member in candidates:
+            cluster_idx, member_ts, member_tokens = self._members[member]
+            if abs(member_ts - published_ts) > _MAX_MEMBER_GAP:
+                continue
+            similarity = len(tokens & member_tokens) / len(tokens | member_tokens)
+            if similarity < self.similarity_threshold:
+                continue
+            # Highest similarity wins; ties go to the older story.
+            if best is None or (similarity, -cluster_idx) > (best[0], -best[1]):
+                best = (similarity, cluster_idx)
+        return best[1] if best is not None else None
+
+
+def cluster_items(
+    items: list[NewsItem],
+    similarity_threshold: float = 0.5,
+    duplicates: dict[int, list[NewsItem]] | None = None,
+) -> list[StoryCluster]:
+    clusterer = StoryClusterer(similarity_threshold)
+    for item in items:
+        item.story = None
+        clusterer.add(item, duplicates.get(id(item), ()) if duplicates else ())
+    for cluster in clusterer.clusters:
+        cluster.representative.story = cluster
+    logger.info("Clustered %s items into %s stories", len(items), len(clusterer.clusters))
+    return clusterer.clusters
+
+
+def story_boost(item: NewsItem) -> float:
+    # Independent outlets covering a story; log-scaled so a wire story
+    # syndicated everywhere does not drown out source priority.
+    story = item.story
+    return math.log2(len(story.sources)) if story is not None else 0.0
+
+
+def coverage_note(item: NewsItem) -> str:
+    story = item.story
+    if story is None or story.coverage < 2:
+        return ""
+    return f" | covered by {len(story.sources)} sources ({story.coverage} items)"
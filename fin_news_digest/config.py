@@ -35,6 +35,11 @@ class Config:
     smtp_pass: str
     smtp_from: str
     smtp_use_tls: bool
+    smtp_connections: int
+    smtp_rate_per_second: float
+    delivery_max_rounds: int
+    delivery_backoff_base_seconds: float
+    delivery_backoff_max_seconds: float
 
     translate_provider: str
     translate_endpoint: str
@@ -55,14 +60,48 @@ class Config:
     alpha_vantage_api_key: str
     alpha_vantage_sleep_seconds: float
     market_snapshot: bool
+    market_snapshot_max_age_seconds: float
     min_items: int
     fallback_lookback_hours: int
 
     lookback_hours: int
+    story_clustering: bool
+    story_similarity: float
+    story_coverage_weight: float
     state_ttl_hours: int
     max_items: int
     sources_file: str
     state_file: str
+    outbox_dir: str
+    archive_dir: str
+    checkpoints: bool
+    checkpoint_dir: str
+    checkpoint_max_age_minutes: int
+    run_report_dir: str
+    item_store_file: str
+    adaptive_polling: bool
+    source_stats_file: str
+    adaptive_max_defer_hours: float
+    fetch_workers: int
+    feed_parse_processes: int
+    feed_streaming: bool
+    feed_max_bytes: int
+    feed_archive_dir: str
+    circuit_breaker: bool
+    source_health_file: str
+    circuit_failure_threshold: int
+    circuit_base_open_minutes: float
+    circuit_max_open_hours: float
+    item_store_retention_hours: int
+    ingest_interval_minutes: float
+    prefetch_interval_minutes: int
+    prefetch_lead_minutes: int
+    run_budget_seconds: float
+    run_budget_reserve_seconds: float
+    run_budget_degrade_order: str
+    profile_dir: str
+    metrics_file: str
+    metrics_port: int
     log_level: str
 
 
@@ -105,6 +144,31 @@ def load_config() -> Config:
         smtp_pass=_env("SMTP_PASS", "FIN_SMTP_PASS", mail_fin),
         smtp_from=_env("SMTP_FROM", "FIN_SMTP_FROM", mail_fin),
         smtp_use_tls=_get_bool(_env("SMTP_USE_TLS", "FIN_SMTP_USE_TLS", mail_fin), True),
+        smtp_connections=_get_int(
+            _env("SMTP_CONNECTIONS", "FIN_SMTP_CONNECTIONS", mail_fin), 4
+        ),
+        smtp_rate_per_second=_get_float(
+            _env("SMTP_RATE_PER_SECOND", "FIN_SMTP_RATE_PER_SECOND", mail_fin), 0.0
+        ),
+        delivery_max_rounds=_get_int(
+            _env("DELIVERY_MAX_ROUNDS", "FIN_DELIVERY_MAX_ROUNDS", mail_fin), 3
+        ),
+        delivery_backoff_base_seconds=_get_float(
+            _env(
+                "DELIVERY_BACKOFF_BASE_SECONDS",
+                "FIN_DELIVERY_BACKOFF_BASE_SECONDS",
+                mail_fin,
+            ),
+            5.0,
+        ),
+        delivery_backoff_max_seconds=_get_float(
+            _env(
+                "DELIVERY_BACKOFF_MAX_SECONDS",
+                "FIN_DELIVERY_BACKOFF_MAX_SECONDS",
+                mail_fin,
+            ),
+            60.0,
+        ),
         translate_provider=_env("TRANSLATE_PROVIDER", "FIN_TRANSLATE_PROVIDER", mail_fin)
         or "mymemory",
         translate_endpoint=_env("TRANSLATE_ENDPOINT", "FIN_TRANSLATE_ENDPOINT", mail_fin),
@@ -156,6 +220,14 @@ def load_config() -> Config:
         market_snapshot=_get_bool(
             _env("MARKET_SNAPSHOT", "FIN_MARKET_SNAPSHOT", mail_fin), True
         ),
+        market_snapshot_max_age_seconds=_get_float(
+            _env(
+                "MARKET_SNAPSHOT_MAX_AGE_SECONDS",
+                "FIN_MARKET_SNAPSHOT_MAX_AGE_SECONDS",
+                mail_fin,
+            ),
+            900.0,
+        ),
         min_items=_get_int(
             _env("MIN_ITEMS", "FIN_MIN_ITEMS", mail_fin), 6
         ),
@@ -163,9 +235,48 @@ def load_config() -> Config:
             _env("FALLBACK_LOOKBACK_HOURS", "FIN_FALLBACK_LOOKBACK_HOURS", mail_fin), 72
         ),
         lookback_hours=_get_int(os.getenv("LOOKBACK_HOURS"), 36),
+        story_clustering=_get_bool(os.getenv("STORY_CLUSTERING"), False),
+        story_similarity=_get_float(os.getenv("STORY_SIMILARITY"), 0.5),
+        story_coverage_weight=_get_float(os.getenv("STORY_COVERAGE_WEIGHT"), 1.0),
         state_ttl_hours=_get_int(os.getenv("STATE_TTL_HOURS"), 72),
         max_items=_get_int(os.getenv("MAX_ITEMS"), 40),
         sources_file=os.getenv("SOURCES_FILE", "fin_news_digest/sources.json"),
         state_file=os.getenv("STATE_FILE", "fin_news_digest/state.json"),
+        outbox_dir=os.getenv("OUTBOX_DIR", "fin_news_digest/outbox"),
+        archive_dir=os.getenv("ARCHIVE_DIR", "fin_news_digest/archive"),
+        checkpoints=_get_bool(os.getenv("CHECKPOINTS"), True),
+        checkpoint_dir=os.getenv("CHECKPOINT_DIR", "fin_news_digest/checkpoints"),
+        checkpoint_max_age_minutes=_get_int(os.getenv("CHECKPOINT_MAX_AGE_MINUTES"), 60),
+        run_report_dir=os.getenv("RUN_REPORT_DIR", "fin_news_digest/reports"),
+        item_store_file=os.getenv("ITEM_STORE_FILE", ""),
+        adaptive_polling=_get_bool(os.getenv("ADAPTIVE_POLLING"), False),
+        source_stats_file=os.getenv(
+            "SOURCE_STATS_FILE", "fin_news_digest/source_stats.json"
+        ),
+        adaptive_max_defer_hours=_get_float(os.getenv("ADAPTIVE_MAX_DEFER_HOURS"), 6.0),
+        fetch_workers=_get_int(os.getenv("FETCH_WORKERS"), 8),
+        feed_parse_processes=_get_int(os.getenv("FEED_PARSE_PROCESSES"), 0),
+        feed_streaming=_get_bool(os.getenv("FEED_STREAMING"), True),
+        feed_max_bytes=_get_int(os.getenv("FEED_MAX_BYTES"), 2 * 1024 * 1024),
+        feed_archive_dir=os.getenv("FEED_ARCHIVE_DIR", ""),
+        circuit_breaker=_get_bool(os.getenv("CIRCUIT_BREAKER"), True),
+        source_health_file=os.getenv(
+            "SOURCE_HEALTH_FILE", "fin_news_digest/source_health.json"
+        ),
+        circuit_failure_threshold=_get_int(os.getenv("CIRCUIT_FAILURE_THRESHOLD"), 3),
+        circuit_base_open_minutes=_get_float(os.getenv("CIRCUIT_BASE_OPEN_MINUTES"), 30.0),
+        circuit_max_open_hours=_get_float(os.getenv("CIRCUIT_MAX_OPEN_HOURS"), 24.0),
+        item_store_retention_hours=_get_int(os.getenv("ITEM_STORE_RETENTION_HOURS"), 168),
+        ingest_interval_minutes=_get_float(os.getenv("INGEST_INTERVAL_MINUTES"), 5.0),
+        prefetch_interval_minutes=_get_int(os.getenv("PREFETCH_INTERVAL_MINUTES"), 10),
+        prefetch_lead_minutes=_get_int(os.getenv("PREFETCH_LEAD_MINUTES"), 15),
+        run_budget_seconds=_get_float(os.getenv("RUN_BUDGET_SECONDS"), 0.0),
+        run_budget_reserve_seconds=_get_float(os.getenv("RUN_BUDGET_RESERVE_SECONDS"), 60.0),
+        run_budget_degrade_order=os.getenv(
+            "RUN_BUDGET_DEGRADE_ORDER", "rerank,summary,market,summary_translation"
+        ),
+        profile_dir=os.getenv("PROFILE_DIR", ""),
+        metrics_file=os.getenv("METRICS_FILE", ""),
+        metrics_port=_get_int(os.getenv("METRICS_PORT"), 0),
         log_level=os.getenv("LOG_LEVEL", "INFO"),
     )
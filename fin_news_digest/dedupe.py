@@ -1,46 +1,127 @@
 import logging
-from datetime import datetime, timedelta, timezone
+import math
+from datetime import datetime, timedelta
+from typing import Iterable
 
+import numpy as np
+
+from fin_news_digest.clustering import story_boost
+from fin_news_digest.item_batch import ItemBatch
 from fin_news_digest.models import NewsItem
-from fin_news_digest.utils import jaccard_similarity, normalize_title
+from fin_news_digest.utils import utc_now
 
 logger = logging.getLogger(__name__)
 
 
-def _within_lookback(item: NewsItem, lookback_hours: int) -> bool:
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
-    return item.published >= cutoff
-
-
-def filter_recent(items: list[NewsItem], lookback_hours: int) -> list[NewsItem]:
-    return [item for item in items if _within_lookback(item, lookback_hours)]
+def filter_recent(
+    items: list[NewsItem], lookback_hours: int, now: datetime | None = None
+) -> list[NewsItem]:
+    cutoff_ts = ((now or utc_now()) - timedelta(hours=lookback_hours)).timestamp()
+    return [item for item in items if item.published_ts >= cutoff_ts]
+
+
+class DedupeIndex:
+    # Incremental form of the greedy near-duplicate pass: each item is matched
+    # against the earliest kept title with Jaccard >= threshold. Candidates come
+    # from a prefix-filtered inverted index over sorted title tokens (two sets
+    # at or above the threshold always share a token within both prefixes), so
+    # adding a band of items only touches titles that can actually match.
+    def __init__(self, similarity_threshold: float = 0.86) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.items: list[NewsItem] = []
+        self._tokens: list[frozenset[str]] = []
+        # Items folded into each kept title, so clustering can still count
+        # them as coverage.
+        self.duplicates: list[list[NewsItem]] = []
+        self._postings: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _prefix(self, tokens: list[str]) -> list[str]:
+        size = len(tokens)
+        return tokens[: size - math.ceil(self.similarity_threshold * size - 1e-9) + 1]
+
+    def _index(self, idx: int, tokens: list[str]) -> None:
+        for token in self._prefix(tokens):
+            self._postings.setdefault(token, []).append(idx)
+
+    def add(self, items: Iterable[NewsItem]) -> None:
+        for item in items:
+            tokens = sorted(item.text.token_set)
+            match = self._match(tokens) if tokens else None
+            if match is None:
+                self.items.append(item)
+                self._tokens.append(frozenset(tokens))
+                self.duplicates.append([])
+                if tokens:
+                    self._index(len(self.items) - 1, tokens)
+                continue
+            # Prefer higher priority source or more recent timestamp
+            current = self.items[match]
+            if (item.priority, item.published_ts) > (current.priority, current.published_ts):
+                self.duplicates[match].append(current)
+                self.items[match] = item
+                self._tokens[match] = frozenset(tokens)
+                # Postings of the replaced title stay behind; they only add
+                # candidates that fail the exact check below.
+                self._index(match, tokens)
+            else:
+                self.duplicates[match].append(item)
+
+    def _match(self, tokens: list[str]) -> int | None:
+        candidates: set[int] = set()
+        for token in self._prefix(tokens):
+            candidates.update(self._postings.get(token, ()))
+        token_set = set(tokens)
+        for idx in sorted(candidates):
+            existing = self._tokens[idx]
+            union = len(token_set | existing)
+            if union and len(token_set & existing) / union >= self.similarity_threshold:
+                return idx
+        return None
+
+    def survivors(self) -> list[NewsItem]:
+        return list(self.items)
+
+    def duplicate_map(self) -> dict[int, list[NewsItem]]:
+        return {id(item): dups for item, dups in zip(self.items, self.duplicates) if dups}
 
 
 def dedupe_items(items: list[NewsItem], similarity_threshold: float = 0.86) -> list[NewsItem]:
-    deduped: list[NewsItem] = []
-    normalized = []
-
-    for item in items:
-        tokens = normalize_title(item.title)
-        is_dup = False
-        for idx, existing in enumerate(normalized):
-            similarity = jaccard_similarity(tokens, existing)
-            if similarity >= similarity_threshold:
-                is_dup = True
-                # Prefer higher priority source or more recent timestamp
-                current = deduped[idx]
-                if (item.priority, item.published) > (current.priority, current.published):
-                    deduped[idx] = item
-                    normalized[idx] = tokens
-                break
-        if not is_dup:
-            deduped.append(item)
-            normalized.append(tokens)
-
+    index = DedupeIndex(similarity_threshold)
+    index.add(items)
+    deduped = index.survivors()
     logger.info("Deduped %s -> %s", len(items), len(deduped))
     return deduped
 
 
+class LookbackWindow:
+    # Dedupe over a lookback that may be widened (the min_items fallback):
+    # extend() only feeds the newly covered time band into the index instead
+    # of re-filtering and re-deduping the whole wider window.
+    def __init__(self, batch: ItemBatch, similarity_threshold: float = 0.86) -> None:
+        self.batch = batch
+        self.index = DedupeIndex(similarity_threshold)
+        self.lookback_hours = 0
+        self.recent = 0
+        self._now_ts = utc_now().timestamp()
+        self._cutoff_ts: float | None = None
+
+    def extend(self, lookback_hours: int) -> ItemBatch:
+        if lookback_hours > self.lookback_hours:
+            cutoff_ts = self._now_ts - lookback_hours * 3600
+            band = self.batch.published >= cutoff_ts
+            if self._cutoff_ts is not None:
+                band &= self.batch.published < self._cutoff_ts
+            band_items = self.batch.take(band).to_list()
+            self.index.add(band_items)
+            self.recent += len(band_items)
+            self._cutoff_ts = cutoff_ts
+            self.lookback_hours = lookback_hours
+        return self.batch.select(self.index.survivors())
+
+
 _BJ_KEYWORDS = {
     "china",
     "chinese",
@@ -99,8 +180,7 @@ def _keyword_boost(text: str, keywords: set[str]) -> float:
 def _edition_boost(item: NewsItem, edition_label: str) -> float:
     if not edition_label:
         return 0.0
-    text = f"{item.title} {item.summary}"
-    text_lower = text.lower()
+    text_lower = item.text.text_lower
     if edition_label.startswith("BJ"):
         return _keyword_boost(text_lower, _BJ_KEYWORDS)
     if edition_label.startswith("NY"):
@@ -112,9 +192,28 @@ def rank_items(
     items: list[NewsItem],
     max_items: int,
     edition_label: str = "",
+    story_weight: float = 0.0,
 ) -> list[NewsItem]:
     items.sort(
-        key=lambda x: (x.priority + _edition_boost(x, edition_label), x.published),
+        key=lambda x: (
+            x.priority + _edition_boost(x, edition_label) + story_weight * story_boost(x),
+            x.published_ts,
+        ),
         reverse=True,
     )
     return items[:max_items]
+
+
+def rank_batch(
+    batch: ItemBatch, max_items: int, edition_label: str = "", story_weight: float = 0.0
+) -> list[NewsItem]:
+    # Same order as rank_items: score, then recency, ties keep input order.
+    if not len(batch):
+        return []
+    score = batch.priority
+    if edition_label:
+        score = score + batch.boost(edition_label, _edition_boost)
+    if story_weight:
+        score = score + story_weight * batch.boost("story", lambda item, _: story_boost(item))
+    order = np.lexsort((np.arange(len(batch)), -batch.published, -score))
+    return batch.items[order[:max_items]].tolist()
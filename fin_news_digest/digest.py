@@ -1,92 +1,230 @@
 import logging
-from datetime import datetime
-from pathlib import Path
+import pickle
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Iterator
 
 from dotenv import load_dotenv
 
-from fin_news_digest.config import load_config
-from fin_news_digest.dedupe import dedupe_items, filter_recent, rank_items
-from fin_news_digest.emailer import build_message, send_email, send_email_to_each
+from fin_news_digest import metrics
+from fin_news_digest.archive import Archive
+from fin_news_digest.budget import RunBudget, parse_degrade_order
+from fin_news_digest.checkpoint import STAGES, CheckpointStore, prune_checkpoints
+from fin_news_digest.config import Config, load_config
+from fin_news_digest.clustering import cluster_items
+from fin_news_digest.dedupe import LookbackWindow, rank_batch
+from fin_news_digest.emailer import prepare_message, render_bodies
 from fin_news_digest.enrich import add_bilingual_fields
-from fin_news_digest.fetcher import fetch_sources
+from fin_news_digest.fetcher import fetch_configured
+from fin_news_digest.item_store import ItemStore
 from fin_news_digest.source_loader import load_sources
-from fin_news_digest.state import filter_sent, load_state, save_state
+from fin_news_digest.source_stats import SourceStatsLedger
+from fin_news_digest.state import load_state, record_sent, unsent_batch
 from fin_news_digest.translator import (
+    NullTranslator,
     TranslatorConfig,
     build_translator,
     get_translation_stats,
     reset_translation_stats,
 )
-from fin_news_digest.utils import configure_logging
+from fin_news_digest.utils import configure_logging, utc_now
 from fin_news_digest.llm_ranker import OpenAIRerankConfig, rerank_items
-from fin_news_digest.market_data import build_market_snapshot
+from fin_news_digest.market_data import MarketSection, build_market_snapshot
+from fin_news_digest.item_batch import ItemBatch
+from fin_news_digest.models import NewsItem
 from fin_news_digest.news_summary import OpenAISummaryConfig, summarize_cn
+from fin_news_digest.profiling import finish_profiling, profile_stage, start_profiling
+from fin_news_digest.outbox import Outbox, OutboxEntry, deliver_from_config, edition_key
+from fin_news_digest.tracing import Span, current_span, finish_run, span, start_run
 
 logger = logging.getLogger(__name__)
 
+# Content of a rendered edition, kept in its outbox entry until it is archived.
+_PENDING_ARCHIVE = "archive.pkl"
+
 
 def _subject_for(edition_label: str) -> str:
     date_str = datetime.utcnow().strftime("%Y-%m-%d")
     return f"Global Finance Digest [{edition_label}] {date_str}"
 
 
-def run_digest(edition_label: str) -> None:
-    load_dotenv()
-    cfg = load_config()
-    configure_logging(cfg.log_level)
+@contextmanager
+def _stage(name: str, **attrs: Any) -> Iterator[Span]:
+    started = time.perf_counter()
+    try:
+        with span(name, **attrs) as stage_span, profile_stage(name):
+            yield stage_span
+    finally:
+        metrics.STAGE_SECONDS.observe(time.perf_counter() - started, stage=name)
 
-    if not cfg.recipients:
-        raise RuntimeError("RECIPIENTS is empty")
-    if not cfg.smtp_host:
-        raise RuntimeError("SMTP_HOST is empty")
 
-    sources = load_sources(cfg.sources_file)
-    raw_items = fetch_sources(sources)
-    recent_items = filter_recent(raw_items, cfg.lookback_hours)
-    deduped = dedupe_items(recent_items)
+def _deliver(cfg: Config, entry: OutboxEntry) -> None:
+    with _stage("smtp", recipients=len(entry.undelivered())) as smtp_span:
+        remaining = deliver_from_config(cfg, entry)
+        smtp_span.set("undelivered", len(remaining))
+    if remaining:
+        raise RuntimeError(
+            f"Delivery incomplete for {entry.key}: {len(remaining)}/{len(entry.recipients)} "
+            "recipients pending; run python -m fin_news_digest.resume to retry"
+        )
+    archive_delivered(cfg, entry)
+
 
+def _queue_archive(
+    cfg: Config,
+    entry: OutboxEntry,
+    items: list[NewsItem],
+    summary_cn: str | None,
+    market_snapshot: list[MarketSection],
+) -> None:
+    # The edition is archived once every recipient has it, possibly by a later
+    # resume, so its content waits next to the outbox message until then.
+    if not cfg.archive_dir:
+        return
+    record = {"items": items, "summary_cn": summary_cn, "market": market_snapshot}
+    with open(entry.path / _PENDING_ARCHIVE, "wb") as fh:
+        pickle.dump(record, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def archive_delivered(cfg: Config, entry: OutboxEntry) -> None:
+    pending = entry.path / _PENDING_ARCHIVE
+    if not cfg.archive_dir or entry.undelivered() or not pending.exists():
+        return
+    # Keyed per send: a forced resend of the same date and edition is its own
+    # archived edition.
+    sent_at = datetime.fromisoformat(entry.created_at).strftime("%H%M%S")
+    with span("archive") as archive_span:
+        try:
+            with open(pending, "rb") as fh:
+                record = pickle.load(fh)
+            archive_span.set("items", len(record["items"]))
+            Archive(cfg.archive_dir).append(
+                f"{entry.key}-{sent_at}",
+                entry.edition_label,
+                entry.subject,
+                record["items"],
+                record["summary_cn"] or "",
+                record["market"],
+            )
+        except Exception as exc:  # noqa: BLE001
+            # Mail is already out; a broken archive must not fail the run.
+            logger.warning("Could not archive %s: %s", entry.key, exc)
+            archive_span.set("error", str(exc))
+            return
+    pending.unlink(missing_ok=True)
+
+
+def _dedupe_window(window: LookbackWindow, lookback_hours: int) -> ItemBatch:
+    with span("dedupe", lookback_hours=lookback_hours) as dedupe_span:
+        indexed = len(window.index)
+        deduped = window.extend(lookback_hours)
+        dedupe_span.set("recent", window.recent)
+        dedupe_span.set("deduped", len(deduped))
+        dedupe_span.set("new_survivors", len(window.index) - indexed)
+    if window.recent:
+        metrics.DEDUPE_RATIO.set(len(deduped) / window.recent)
+    return deduped
+
+
+def _filter_sent(cfg: Config, deduped: ItemBatch, state: dict) -> ItemBatch:
+    with span("state", candidates=len(deduped)) as state_span:
+        fresh = unsent_batch(deduped, state, cfg.state_ttl_hours)
+        state_span.set("fresh", len(fresh))
+    return fresh
+
+
+def _cluster(
+    cfg: Config, window: LookbackWindow, fresh: ItemBatch
+) -> tuple[ItemBatch, list[NewsItem]]:
+    # Returns one representative per story plus every item the stories cover.
+    if not cfg.story_clustering:
+        return fresh, fresh.to_list()
+    with span("cluster", items=len(fresh)) as cluster_span:
+        stories = cluster_items(
+            fresh.to_list(), cfg.story_similarity, window.index.duplicate_map()
+        )
+        cluster_span.set("stories", len(stories))
+        cluster_span.set("multi_source", sum(1 for story in stories if len(story.sources) > 1))
+    covered = [item for story in stories for item in story.items]
+    return fresh.select(story.representative for story in stories), covered
+
+
+def _select_items(cfg: Config, raw_items: list[NewsItem]) -> tuple[ItemBatch, list[str]]:
+    window = LookbackWindow(ItemBatch.from_items(raw_items))
+    deduped = _dedupe_window(window, cfg.lookback_hours)
     state = load_state(cfg.state_file)
-    fresh, state = filter_sent(deduped, state, cfg.state_ttl_hours)
+    stories, covered = _cluster(cfg, window, _filter_sent(cfg, deduped, state))
 
-    if len(fresh) < cfg.min_items and cfg.fallback_lookback_hours > cfg.lookback_hours:
+    if len(stories) < cfg.min_items and cfg.fallback_lookback_hours > cfg.lookback_hours:
         logger.info(
-            "Only %s items; expanding lookback to %sh",
-            len(fresh),
+            "Only %s stories; expanding lookback to %sh",
+            len(stories),
             cfg.fallback_lookback_hours,
         )
-        recent_items = filter_recent(raw_items, cfg.fallback_lookback_hours)
-        deduped = dedupe_items(recent_items)
-        fresh, state = filter_sent(deduped, state, cfg.state_ttl_hours)
+        deduped = _dedupe_window(window, cfg.fallback_lookback_hours)
+        stories, covered = _cluster(cfg, window, _filter_sent(cfg, deduped, state))
+    # Marked only once the edition is queued, so the fallback pass still sees
+    # the first pass's candidates as unsent. Every covered item is marked so
+    # other outlets' versions of a sent story do not come back next edition.
+    current_span().set("items", len(stories))
+    return stories, [item.link for item in covered]
 
-    if len(fresh) < cfg.min_items:
-        logger.warning(
-            "Only %s items after fallback (min=%s). Skipping send.",
-            len(fresh),
-            cfg.min_items,
-        )
-        return
 
-    heuristic_ranked = rank_items(fresh, cfg.max_items, edition_label)
+def _fetch_cutoff(cfg: Config) -> datetime:
+    # Entries older than the widest window _select_items may use are dropped
+    # while the feeds are parsed.
+    return utc_now() - timedelta(hours=max(cfg.lookback_hours, cfg.fallback_lookback_hours))
+
+
+def _query_store(cfg: Config) -> list[NewsItem]:
+    # The ingest loop keeps the store current, so send time is a range scan
+    # covering the fallback window too instead of a fetch of every source.
+    window_hours = max(cfg.lookback_hours, cfg.fallback_lookback_hours)
+    with span("store_query", window_hours=window_hours) as query_span:
+        with ItemStore(cfg.item_store_file) as store:
+            items = store.items_since(utc_now() - timedelta(hours=window_hours))
+            last_edition = store.last_edition_at()
+        query_span.set("items", len(items))
+        if last_edition is not None:
+            query_span.set(
+                "since_last_edition",
+                sum(1 for item in items if item.published_ts > last_edition.timestamp()),
+            )
+    return items
+
+
+def _rank(
+    cfg: Config, fresh: ItemBatch, edition_label: str, budget: RunBudget
+) -> list[NewsItem]:
+    story_weight = cfg.story_coverage_weight if cfg.story_clustering else 0.0
+    heuristic_ranked = rank_batch(fresh, cfg.max_items, edition_label, story_weight)
 
     ranked = heuristic_ranked
-    if cfg.openai_rerank and cfg.openai_api_key:
-        candidates = rank_items(fresh, cfg.openai_candidates, edition_label)
-        reranked = rerank_items(
-            candidates,
-            edition_label,
-            OpenAIRerankConfig(
-                api_key=cfg.openai_api_key,
-                model=cfg.openai_model,
-                base_url=cfg.openai_base_url,
-                candidates=cfg.openai_candidates,
-            ),
-        )
+    if cfg.openai_rerank and cfg.openai_api_key and budget.allow("rerank"):
+        candidates = rank_batch(fresh, cfg.openai_candidates, edition_label, story_weight)
+        with span("rerank", candidates=len(candidates)) as rerank_span:
+            reranked = rerank_items(
+                candidates,
+                edition_label,
+                OpenAIRerankConfig(
+                    api_key=cfg.openai_api_key,
+                    model=cfg.openai_model,
+                    base_url=cfg.openai_base_url,
+                    candidates=cfg.openai_candidates,
+                    timeout_seconds=budget.timeout(60.0),
+                ),
+            )
+            rerank_span.set("applied", bool(reranked))
         if reranked:
             ranked = reranked[: cfg.max_items]
-    if not ranked:
-        logger.warning("No items to send for %s", edition_label)
-        return
+    current_span().set("items", len(ranked))
+    return ranked
+
 
+def _translate(
+    cfg: Config, ranked: list[NewsItem], edition_label: str, budget: RunBudget
+) -> list[NewsItem]:
     reset_translation_stats()
     translator = build_translator(
         TranslatorConfig(
@@ -98,10 +236,23 @@ def run_digest(edition_label: str) -> None:
             backoff_base_seconds=cfg.translate_backoff_base_seconds,
             backoff_max_seconds=cfg.translate_backoff_max_seconds,
             cache_max_entries=cfg.translate_cache_max_entries,
+            deadline=budget.deadline(),
         )
     )
-    add_bilingual_fields(ranked, translator)
+    translate_summaries = isinstance(translator, NullTranslator) or budget.allow(
+        "summary_translation"
+    )
+    add_bilingual_fields(ranked, translator, translate_summaries)
     stats = get_translation_stats()
+    translate_span = current_span()
+    translate_span.set("calls", stats.translate_calls)
+    translate_span.set("cache_hits", stats.cache_hits)
+    translate_span.set(
+        "cache_hit_rate",
+        round(stats.cache_hits / stats.translate_calls, 4) if stats.translate_calls else None,
+    )
+    translate_span.set("fallbacks", stats.fallbacks)
+    translate_span.set("api_requests", stats.api_requests)
     if stats.translate_calls:
         cache_hit_rate = stats.cache_hits / stats.translate_calls * 100
         logger.info(
@@ -115,42 +266,270 @@ def run_digest(edition_label: str) -> None:
         )
     else:
         logger.info("Translation stats for %s: no translation calls", edition_label)
+    return ranked
+
+
+def _summarize(
+    cfg: Config, ranked: list[NewsItem], edition_label: str, budget: RunBudget
+) -> str | None:
+    if not (cfg.openai_summary and cfg.openai_api_key) or not budget.allow("summary"):
+        return None
+    return summarize_cn(
+        ranked[: min(12, len(ranked))],
+        edition_label,
+        OpenAISummaryConfig(
+            api_key=cfg.openai_api_key,
+            model=cfg.openai_model,
+            base_url=cfg.openai_base_url,
+            timeout_seconds=budget.timeout(60.0),
+        ),
+    )
+
+
+def _market_snapshot(cfg: Config, budget: RunBudget) -> list[MarketSection]:
+    if not cfg.market_snapshot or not budget.allow("market"):
+        return []
+    return build_market_snapshot(
+        cfg.alpha_vantage_api_key or "",
+        cfg.alpha_vantage_sleep_seconds,
+        cfg.market_snapshot_max_age_seconds,
+    )
+
+
+def prefetch_digest(edition_label: str | None = None) -> None:
+    # Warms the in-process caches (conditional feed cache, market snapshot,
+    # translation LRU, rerank cache) ahead of a send without touching state,
+    # checkpoints or the outbox. With an edition, the ranked and translated
+    # candidate set is precomputed too, so send time only covers deltas.
+    load_dotenv()
+    cfg = load_config()
+    configure_logging(cfg.log_level)
+
+    run_id = f"{edition_key(edition_label or 'feeds')}-prefetch"
+    # Prefetches are off the delivery path and run without a budget.
+    budget = RunBudget(None)
+    tracer = start_run("prefetch_digest", edition=edition_label, run_id=run_id)
+    result = "error"
+    try:
+        _prefetch(cfg, edition_label, budget)
+        result = "ok"
+    finally:
+        finish_run(tracer, cfg.run_report_dir, run_id)
+        _export_metrics(cfg, "prefetch_digest", result, tracer.root.duration_ms / 1000)
+
+
+def _prefetch(cfg: Config, edition_label: str | None, budget: RunBudget) -> None:
+    with span("fetch"):
+        raw_items = fetch_configured(
+            cfg, load_sources(cfg.sources_file), _fetch_cutoff(cfg)
+        )
+        current_span().set("items", len(raw_items))
+        if cfg.item_store_file:
+            with ItemStore(cfg.item_store_file) as store:
+                current_span().set("stored", store.add_items(raw_items))
+            raw_items = _query_store(cfg)
+    with span("market"):
+        _market_snapshot(cfg, budget)
+    if edition_label is None:
+        return
+    with span("select"):
+        fresh, _ = _select_items(cfg, raw_items)
+    if not fresh:
+        return
+    with span("rank"):
+        ranked = _rank(cfg, fresh, edition_label, budget)
+    with span("translate"):
+        _translate(cfg, ranked, edition_label, budget)
+
+
+def _export_metrics(cfg: Config, run: str, result: str, seconds: float) -> None:
+    metrics.RUNS.inc(run=run, result=result)
+    metrics.LAST_RUN_SECONDS.set(seconds, run=run)
+    metrics.LAST_RUN_TIMESTAMP.set(time.time(), run=run)
+    if cfg.metrics_file:
+        metrics.write_textfile(cfg.metrics_file)
+
 
+def _optional_stages(cfg: Config) -> frozenset[str]:
+    stages = set()
+    if cfg.openai_rerank and cfg.openai_api_key:
+        stages.add("rerank")
+    if cfg.openai_summary and cfg.openai_api_key:
+        stages.add("summary")
+    if cfg.market_snapshot:
+        stages.add("market")
+    if cfg.translate_provider.strip().lower() != "none":
+        stages.add("summary_translation")
+    return frozenset(stages)
+
+
+def run_editions(edition_labels: list[str]) -> None:
+    # One process sends several editions inside the workflow timeout, so each
+    # edition gets an equal share of what is left of RUN_BUDGET_SECONDS. A
+    # share of 0 still counts as a budget: every optional stage is skipped.
+    load_dotenv()
+    cfg = load_config()
+    started = time.monotonic()
+    for idx, edition_label in enumerate(edition_labels):
+        budget_seconds = None
+        if cfg.run_budget_seconds > 0:
+            left = cfg.run_budget_seconds - (time.monotonic() - started)
+            budget_seconds = max(left, 0.0) / (len(edition_labels) - idx)
+        run_digest(edition_label, budget_seconds=budget_seconds)
+
+
+def run_digest(
+    edition_label: str,
+    from_stage: str | None = None,
+    run_id: str | None = None,
+    budget_seconds: float | None = None,
+) -> None:
+    load_dotenv()
+    cfg = load_config()
+    configure_logging(cfg.log_level)
+
+    if not cfg.recipients:
+        raise RuntimeError("RECIPIENTS is empty")
+    if not cfg.smtp_host:
+        raise RuntimeError("SMTP_HOST is empty")
     sender = cfg.smtp_from or cfg.smtp_user
     if not sender:
         raise RuntimeError("SMTP_FROM or SMTP_USER must be set")
 
-    summary_cn = None
-    if cfg.openai_summary and cfg.openai_api_key:
-        summary_cn = summarize_cn(
-            ranked[: min(12, len(ranked))],
-            edition_label,
-            OpenAISummaryConfig(
-                api_key=cfg.openai_api_key,
-                model=cfg.openai_model,
-                base_url=cfg.openai_base_url,
-            ),
+    if budget_seconds is None and cfg.run_budget_seconds > 0:
+        budget_seconds = cfg.run_budget_seconds
+    budget = RunBudget(
+        budget_seconds,
+        cfg.run_budget_reserve_seconds,
+        parse_degrade_order(cfg.run_budget_degrade_order),
+        _optional_stages(cfg),
+    )
+    key = edition_key(edition_label)
+    run_id = run_id or key
+    tracer = start_run("run_digest", edition=edition_label, run_id=run_id)
+    profiler = start_profiling(cfg.profile_dir, run_id) if cfg.profile_dir else None
+    result = "error"
+    try:
+        _run_pipeline(cfg, edition_label, sender, key, run_id, from_stage, budget)
+        result = "skipped" if "skipped" in tracer.root.attrs else "ok"
+    except BaseException as exc:
+        tracer.root.set("error", f"{type(exc).__name__}: {exc}")
+        raise
+    finally:
+        if budget.enabled:
+            tracer.root.set("budget_seconds", round(budget.total_seconds, 1))
+            tracer.root.set("budget_remaining_seconds", round(budget.remaining(), 1))
+        tracer.root.set("degraded", budget.degraded)
+        if profiler is not None:
+            tracer.root.set("profile", str(finish_profiling(profiler).parent))
+        report_path = finish_run(tracer, cfg.run_report_dir, run_id)
+        if report_path is not None:
+            logger.info("Run report written to %s", report_path)
+        _export_metrics(cfg, "run_digest", result, tracer.root.duration_ms / 1000)
+
+
+def _run_pipeline(
+    cfg: Config,
+    edition_label: str,
+    sender: str,
+    key: str,
+    run_id: str,
+    from_stage: str | None,
+    budget: RunBudget,
+) -> None:
+    outbox = Outbox(cfg.outbox_dir)
+    outbox.prune(cfg.state_ttl_hours)
+    existing = outbox.load(key)
+    if from_stage is None and existing is not None and existing.undelivered():
+        logger.info(
+            "Outbox %s already rendered with %s undelivered recipients; resuming delivery",
+            key,
+            len(existing.undelivered()),
         )
+        current_span().set("resumed_outbox", key)
+        _deliver(cfg, existing)
+        return
 
-    market_snapshot = []
-    if cfg.market_snapshot:
-        market_snapshot = build_market_snapshot(
-            cfg.alpha_vantage_api_key or "", cfg.alpha_vantage_sleep_seconds
+    prune_checkpoints(cfg.checkpoint_dir, cfg.state_ttl_hours)
+    checkpoints = CheckpointStore(cfg.checkpoint_dir, run_id, cfg.checkpoints)
+    if from_stage is not None:
+        checkpoints.invalidate_from(from_stage)
+    elif checkpoints.is_complete():
+        # A finished run is only replayed on request; otherwise start over.
+        checkpoints.invalidate_from(STAGES[0])
+    elif checkpoints.age_seconds() > cfg.checkpoint_max_age_minutes * 60:
+        # An old crashed run (e.g. this morning's, for a later run the same
+        # day) is not resumed from its stale fetch.
+        logger.info("Checkpoint %s is too old to resume; starting over", run_id)
+        checkpoints.invalidate_from(STAGES[0])
+
+    def _fetch() -> list[NewsItem]:
+        if cfg.item_store_file:
+            items = _query_store(cfg)
+            current_span().set("items", len(items))
+            return items
+        with span("load_sources") as sources_span:
+            sources = load_sources(cfg.sources_file)
+            sources_span.set("sources", len(sources))
+        items = fetch_configured(cfg, sources, _fetch_cutoff(cfg))
+        current_span().set("items", len(items))
+        return items
+
+    with _stage("fetch"):
+        raw_items = checkpoints.run("fetch", _fetch)
+    metrics.STAGE_ITEMS.set(len(raw_items), stage="fetch")
+    with _stage("select"):
+        fresh, covered = checkpoints.run("select", lambda: _select_items(cfg, raw_items))
+    metrics.STAGE_ITEMS.set(len(fresh), stage="select")
+
+    if len(fresh) < cfg.min_items:
+        logger.warning(
+            "Only %s items after fallback (min=%s). Skipping send.",
+            len(fresh),
+            cfg.min_items,
         )
+        current_span().set("skipped", "min_items")
+        # A skip is a finished run: the next run fetches again instead of
+        # restoring this fetch and skipping on the same items.
+        checkpoints.mark_complete()
+        return
 
-    send_email_to_each(
-        host=cfg.smtp_host,
-        port=cfg.smtp_port,
-        use_tls=cfg.smtp_use_tls,
-        user=cfg.smtp_user,
-        password=cfg.smtp_pass,
-        subject=_subject_for(edition_label),
-        sender=sender,
-        recipients=cfg.recipients,
-        items=ranked,
-        edition_label=edition_label,
-        summary_cn=summary_cn,
-        market_snapshot=market_snapshot,
-    )
-    Path(cfg.state_file).parent.mkdir(parents=True, exist_ok=True)
-    save_state(cfg.state_file, state)
+    with _stage("rank"):
+        ranked = checkpoints.run("rank", lambda: _rank(cfg, fresh, edition_label, budget))
+    metrics.STAGE_ITEMS.set(len(ranked), stage="rank")
+    if not ranked:
+        logger.warning("No items to send for %s", edition_label)
+        current_span().set("skipped", "no_items")
+        checkpoints.mark_complete()
+        return
+
+    with _stage("translate"):
+        ranked = checkpoints.run(
+            "translate", lambda: _translate(cfg, ranked, edition_label, budget)
+        )
+    with _stage("summary"):
+        summary_cn = checkpoints.run(
+            "summary", lambda: _summarize(cfg, ranked, edition_label, budget)
+        )
+    with _stage("market"):
+        market_snapshot = checkpoints.run("market", lambda: _market_snapshot(cfg, budget))
+
+    with _stage("render", items=len(ranked)) as render_span:
+        subject = _subject_for(edition_label)
+        bodies = render_bodies(ranked, edition_label, summary_cn, market_snapshot)
+        prepared = prepare_message(subject, sender, bodies)
+        render_span.set("bytes", len(prepared.payload))
+        entry = outbox.create(key, edition_label, subject, prepared, cfg.recipients)
+    # The edition is durably queued, so mark its items as sent before delivery;
+    # delivery failures are retried from the outbox without re-running the pipeline.
+    record_sent(cfg.state_file, covered, cfg.state_ttl_hours)
+    if cfg.item_store_file:
+        with ItemStore(cfg.item_store_file) as store:
+            store.record_edition(key, edition_label, len(ranked))
+    _queue_archive(cfg, entry, ranked, summary_cn, market_snapshot)
+    if cfg.adaptive_polling:
+        ledger = SourceStatsLedger(cfg.source_stats_file)
+        ledger.record_sent(ranked, load_sources(cfg.sources_file))
+        ledger.save()
+    checkpoints.mark_complete()
+    _deliver(cfg, entry)
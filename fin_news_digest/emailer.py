@@ -1,31 +1,70 @@
 import logging
 import smtplib
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from email import policy
 from email.message import EmailMessage
+from email.utils import parseaddr
+from functools import lru_cache
 from pathlib import Path
-
-from jinja2 import Template
+from typing import TYPE_CHECKING
 
 from fin_news_digest.models import NewsItem
-from fin_news_digest.market_data import MarketSection
+from fin_news_digest.smtp_pool import DeliveryResult, SMTPPool, SMTPSettings
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+    from fin_news_digest.market_data import MarketSection
 
 logger = logging.getLogger(__name__)
 
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+TEXT_TEMPLATE = "email.txt"
+HTML_TEMPLATE = "email.html"
 
-def _render_template(path: str, context: dict) -> str:
-    template_text = Path(path).read_text(encoding="utf-8")
-    return Template(template_text).render(**context)
 
+@lru_cache(maxsize=None)
+def _template_environment() -> "Environment":
+    # jinja2 is only imported once something renders; outbox delivery and
+    # resume import this module for PreparedMessage alone.
+    from jinja2 import Environment, FileSystemLoader
 
-def build_message(
-    subject: str,
-    sender: str,
-    recipients: list[str],
+    # Templates ship with the package, so skip the per-render mtime check.
+    return Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), auto_reload=False)
+
+
+def enable_template_reload() -> None:
+    # For template development (preview_local): re-read a template whenever
+    # its file changes.
+    _template_environment().auto_reload = True
+
+
+def _get_template(name: str) -> "Template":
+    return _template_environment().get_template(name)
+
+
+@dataclass(frozen=True)
+class RenderedBodies:
+    text: str
+    html: str
+
+
+@dataclass(frozen=True)
+class PreparedMessage:
+    envelope_from: str
+    payload: bytes
+
+    def for_recipient(self, recipient: str) -> bytes:
+        return policy.SMTP.fold_binary("To", recipient) + self.payload
+
+
+def render_bodies(
     items: list[NewsItem],
     edition_label: str,
     summary_cn: str | None = None,
-    market_snapshot: list[MarketSection] | None = None,
-) -> EmailMessage:
+    market_snapshot: list["MarketSection"] | None = None,
+) -> RenderedBodies:
     date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     context = {
         "items": items,
@@ -35,18 +74,51 @@ def build_message(
         "summary_cn": summary_cn,
         "market_snapshot": market_snapshot or [],
     }
-    text_body = _render_template("fin_news_digest/templates/email.txt", context)
-    html_body = _render_template("fin_news_digest/templates/email.html", context)
+    return RenderedBodies(
+        text=_get_template(TEXT_TEMPLATE).render(**context),
+        html=_get_template(HTML_TEMPLATE).render(**context),
+    )
 
+
+def _assemble(
+    subject: str,
+    sender: str,
+    recipients: list[str] | None,
+    bodies: RenderedBodies,
+) -> EmailMessage:
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = sender
-    msg["To"] = ", ".join(recipients)
-    msg.set_content(text_body)
-    msg.add_alternative(html_body, subtype="html")
+    if recipients:
+        msg["To"] = ", ".join(recipients)
+    msg.set_content(bodies.text)
+    msg.add_alternative(bodies.html, subtype="html")
     return msg
 
 
+def build_message(
+    subject: str,
+    sender: str,
+    recipients: list[str],
+    items: list[NewsItem],
+    edition_label: str,
+    summary_cn: str | None = None,
+    market_snapshot: list["MarketSection"] | None = None,
+) -> EmailMessage:
+    bodies = render_bodies(items, edition_label, summary_cn, market_snapshot)
+    return _assemble(subject, sender, recipients, bodies)
+
+
+def prepare_message(subject: str, sender: str, bodies: RenderedBodies) -> PreparedMessage:
+    # Serialize everything except the To header once; each recipient only
+    # prepends its own header line to the shared payload.
+    msg = _assemble(subject, sender, None, bodies)
+    return PreparedMessage(
+        envelope_from=parseaddr(sender)[1] or sender,
+        payload=msg.as_bytes(policy=policy.SMTP),
+    )
+
+
 def send_email(
     host: str,
     port: int,
@@ -76,22 +148,16 @@ def send_email_to_each(
     items: list[NewsItem],
     edition_label: str,
     summary_cn: str | None = None,
-    market_snapshot: list[MarketSection] | None = None,
-) -> None:
+    market_snapshot: list["MarketSection"] | None = None,
+    connections: int = 1,
+    rate_per_second: float = 0.0,
+) -> list[DeliveryResult]:
     logger.info("Sending individualized emails to %s recipients", len(recipients))
-    with smtplib.SMTP(host, port, timeout=30) as server:
-        if use_tls:
-            server.starttls()
-        if user:
-            server.login(user, password)
-        for recipient in recipients:
-            message = build_message(
-                subject=subject,
-                sender=sender,
-                recipients=[recipient],
-                items=items,
-                edition_label=edition_label,
-                summary_cn=summary_cn,
-                market_snapshot=market_snapshot,
-            )
-            server.send_message(message)
+    bodies = render_bodies(items, edition_label, summary_cn, market_snapshot)
+    prepared = prepare_message(subject, sender, bodies)
+    pool = SMTPPool(
+        SMTPSettings(host=host, port=port, use_tls=use_tls, user=user, password=password),
+        connections=connections,
+        rate_per_second=rate_per_second,
+    )
+    return pool.deliver(prepared, recipients)
@@ -1,7 +1,7 @@
 import logging
 
 from fin_news_digest.models import NewsItem
-from fin_news_digest.translator import BaseTranslator
+from fin_news_digest.translator import BaseTranslator, NullTranslator
 from fin_news_digest.utils import truncate
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,12 @@ def _lang_pair(language: str) -> tuple[str, str]:
     return "en", "zh-CN"
 
 
-def add_bilingual_fields(items: list[NewsItem], translator: BaseTranslator) -> None:
+def add_bilingual_fields(
+    items: list[NewsItem], translator: BaseTranslator, translate_summaries: bool = True
+) -> None:
+    # Without summary translation (run budget) the summary is shown as-is in
+    # both languages, the same as a failed translation.
+    summary_translator = translator if translate_summaries else NullTranslator()
     for item in items:
         source_lang, target_lang = _lang_pair(item.language)
         if source_lang == "en":
@@ -23,7 +28,7 @@ def add_bilingual_fields(items: list[NewsItem], translator: BaseTranslator) -> N
                 translator.translate(item.title, source_lang, target_lang), 200
             )
             item.summary_zh = truncate(
-                translator.translate(item.summary, source_lang, target_lang), 360
+                summary_translator.translate(item.summary, source_lang, target_lang), 360
             )
         else:
             item.title_zh = item.title
@@ -32,5 +37,5 @@ def add_bilingual_fields(items: list[NewsItem], translator: BaseTranslator) -> N
                 translator.translate(item.title, source_lang, target_lang), 200
             )
             item.summary_en = truncate(
-                translator.translate(item.summary, source_lang, target_lang), 360
+                summary_translator.translate(item.summary, source_lang, target_lang), 360
             )
@@ -0,0 +1,53 @@
+import gzip
+import hashlib
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+_STAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+_PAYLOAD = re.compile(r"^(\d{8}T\d{6}Z)\.xml\.gz$")
+
+
+class FeedArchive:
+    # Raw feed payloads as fetched (cut at FEED_MAX_BYTES), one gzip file per
+    # capture: <root>/<source id>/<UTC capture time>.xml.gz. A payload
+    # identical to the previous capture of the same source (in this process)
+    # is not stored again, so a warm daemon polling unchanged feeds adds nothing.
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+        self._last_digest: dict[str, bytes] = {}
+
+    def save(self, source_id: str, body: bytes, captured: datetime) -> Path | None:
+        digest = hashlib.sha1(body).digest()
+        if self._last_digest.get(source_id) == digest:
+            return None
+        directory = self.root / source_id
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{captured.astimezone(timezone.utc).strftime(_STAMP_FORMAT)}.xml.gz"
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(gzip.compress(body, compresslevel=6))
+        os.replace(tmp, path)
+        self._last_digest[source_id] = digest
+        return path
+
+    def payloads(self) -> Iterator[tuple[str, datetime, Path]]:
+        if not self.root.exists():
+            return
+        for directory in sorted(self.root.iterdir()):
+            if not directory.is_dir():
+                continue
+            for path in sorted(directory.iterdir()):
+                match = _PAYLOAD.match(path.name)
+                if match is None:
+                    continue
+                captured = datetime.strptime(match.group(1), _STAMP_FORMAT)
+                yield directory.name, captured.replace(tzinfo=timezone.utc), path
+
+
+def read_payload(path: Path) -> bytes:
+    return gzip.decompress(path.read_bytes())
@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+from fin_news_digest.textnorm import clean_text
+from fin_news_digest.utils import truncate
+
+# (title, link, published epoch seconds, summary), same shape as fetcher.EntryRow.
+StreamRow = tuple[str, str, float, str]
+
+# Feeds are nearly always newest-first; after this many consecutive entries
+# older than the cutoff the rest of the document is not read.
+_OLD_RUN_LIMIT = 10
+
+_ENTRY_TAGS = {"item", "entry"}
+_DATE_TAGS = ("pubDate", "published", "updated", "date")
+_SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+
+
+class FeedStreamError(Exception):
+    pass
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _children(elem: Element) -> dict[str, Element]:
+    found: dict[str, Element] = {}
+    for child in elem:
+        found.setdefault(_local(child.tag), child)
+    return found
+
+
+def _text(elem: Element | None) -> str:
+    if elem is None:
+        return ""
+    return "".join(elem.itertext()).strip()
+
+
+def _link(elem: Element) -> str:
+    for child in elem:
+        if _local(child.tag) != "link":
+            continue
+        href = child.get("href")
+        if href is None:
+            return _text(child)
+        if child.get("rel", "alternate") == "alternate":
+            return href.strip()
+    return ""
+
+
+def _timestamp(value: str) -> float:
+    try:
+        if value[:4].isdigit():
+            parsed = datetime.fromisoformat(value)
+        else:
+            parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError) as exc:
+        # Unusual date formats are left to feedparser's much larger set of parsers.
+        raise FeedStreamError(f"unsupported date {value!r}") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class StreamingFeedParser:
+    def __init__(self, cutoff_ts: float | None = None) -> None:
+        self.cutoff_ts = cutoff_ts
+        self.rows: list[StreamRow] = []
+        self.entries_seen = 0
+        self.skipped_old = 0
+        self.stopped_early = False
+        self._old_run = 0
+        self._parser = XMLPullParser(events=("end",))
+
+    def feed(self, chunk: bytes) -> bool:
+        # Returns False once the rest of the document can be skipped.
+        try:
+            self._parser.feed(chunk)
+            return self._drain()
+        except ParseError as exc:
+            raise FeedStreamError(str(exc)) from exc
+
+    def close(self) -> None:
+        try:
+            self._parser.close()
+            self._drain()
+        except ParseError as exc:
+            raise FeedStreamError(str(exc)) from exc
+
+    def _drain(self) -> bool:
+        for _, elem in self._parser.read_events():
+            if _local(elem.tag) not in _ENTRY_TAGS:
+                continue
+            self.entries_seen += 1
+            self._entry(elem)
+            # Drop the parsed subtree; the parser keeps it attached otherwise.
+            elem.clear()
+            if self._old_run >= _OLD_RUN_LIMIT:
+                self.stopped_early = True
+                return False
+        return True
+
+    def _entry(self, elem: Element) -> None:
+        fields = _children(elem)
+        date_text = next((_text(fields.get(tag)) for tag in _DATE_TAGS if tag in fields), "")
+        if not date_text:
+            raise FeedStreamError("entry without a date")
+        published = _timestamp(date_text)
+        if self.cutoff_ts is not None and published < self.cutoff_ts:
+            self.skipped_old += 1
+            self._old_run += 1
+            return
+        self._old_run = 0
+        title = clean_text(_text(fields.get("title")))
+        link = _link(elem)
+        if not title or not link:
+            return
+        # Summaries are only cleaned for entries that survive the cutoff.
+        summary = ""
+        for tag in _SUMMARY_TAGS:
+            summary = _text(fields.get(tag))
+            if summary:
+                break
+        self.rows.append((title, link, published, truncate(clean_text(summary), 360) or title))
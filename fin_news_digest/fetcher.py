@@ -1,55 +1,430 @@
+import calendar
 import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Callable, Iterable
 
-import feedparser
+import requests
+from requests.adapters import HTTPAdapter
 
+from fin_news_digest import metrics
+from fin_news_digest.config import Config
+from fin_news_digest.feed_archive import FeedArchive
+from fin_news_digest.feed_stream import FeedStreamError, StreamingFeedParser
 from fin_news_digest.models import NewsItem
+from fin_news_digest.source_health import FetchResult, SourceHealthLedger
 from fin_news_digest.source_loader import Source
-from fin_news_digest.utils import strip_html, truncate
+from fin_news_digest.source_stats import SourceStatsLedger, plan_fetch
+from fin_news_digest.textnorm import clean_text
+from fin_news_digest.tracing import Span, current_span, span
+from fin_news_digest.utils import truncate, utc_now
 
 logger = logging.getLogger(__name__)
 
+_USER_AGENT = "Mozilla/5.0 (compatible; fin-news-digest; +https://github.com/)"
+_STREAM_CHUNK_BYTES = 64 * 1024
 
-def _parse_datetime(entry: dict) -> datetime:
-    if entry.get("published_parsed"):
-        return datetime(*entry["published_parsed"][:6], tzinfo=timezone.utc)
-    if entry.get("updated_parsed"):
-        return datetime(*entry["updated_parsed"][:6], tzinfo=timezone.utc)
-    return datetime.now(timezone.utc)
+# (title, link, published epoch seconds or None, summary): what a parse worker
+# sends back, kept to plain tuples of str/float so pickling stays cheap.
+EntryRow = tuple[str, str, float | None, str]
+
+
+def _parse_timestamp(entry: dict) -> float | None:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if parsed:
+        return float(calendar.timegm(parsed[:6]))
+    return None
 
 
 def _entry_summary(entry: dict) -> str:
     summary = entry.get("summary") or entry.get("description") or ""
     if not summary and entry.get("content"):
         summary = entry["content"][0].get("value", "")
-    summary = strip_html(summary)
+    summary = clean_text(summary)
     return truncate(summary, 360)
 
 
-def fetch_sources(sources: Iterable[Source]) -> list[NewsItem]:
-    items: list[NewsItem] = []
-    for source in sources:
-        logger.info("Fetching %s", source.name)
-        feed = feedparser.parse(source.url)
-        if feed.bozo:
-            logger.warning("Feed parse issue for %s: %s", source.name, feed.bozo_exception)
-        for entry in feed.entries:
-            title = strip_html(entry.get("title", ""))
-            link = entry.get("link", "")
-            if not title or not link:
-                continue
-            summary = _entry_summary(entry)
-            published = _parse_datetime(entry)
-            items.append(
-                NewsItem(
-                    title=title,
-                    link=link,
-                    published=published,
-                    summary=summary or title,
-                    source=source.name,
-                    language=source.language,
-                    priority=source.priority,
+def parse_feed_rows(
+    content: bytes,
+    headers: dict[str, str],
+    cutoff_ts: float | None = None,
+) -> tuple[list[EntryRow], str | None]:
+    # Runs in parse worker processes: no logging, tracing or clock access here.
+    # feedparser is imported on first use: with streaming on it is only
+    # needed for feeds the incremental parser falls back on.
+    import feedparser
+
+    feed = feedparser.parse(content, response_headers=headers)
+    rows: list[EntryRow] = []
+    for entry in feed.entries:
+        published = _parse_timestamp(entry)
+        if cutoff_ts is not None and published is not None and published < cutoff_ts:
+            continue
+        title = clean_text(entry.get("title", ""))
+        link = entry.get("link", "")
+        if not title or not link:
+            continue
+        rows.append((title, link, published, _entry_summary(entry) or title))
+    bozo = str(feed.bozo_exception) if feed.bozo else None
+    return rows, bozo
+
+
+def _rows_to_items(rows: list[EntryRow], source: Source) -> list[NewsItem]:
+    now = utc_now()
+    return [
+        NewsItem(
+            title=title,
+            link=link,
+            published=(
+                datetime.fromtimestamp(published, tz=timezone.utc)
+                if published is not None
+                else now
+            ),
+            summary=summary,
+            source=source.name,
+            language=source.language,
+            priority=source.priority,
+        )
+        for title, link, published, summary in rows
+    ]
+
+
+@dataclass(frozen=True)
+class FetchOptions:
+    workers: int = 1
+    parse_processes: int = 0
+    streaming: bool = False
+    max_bytes: int = 2 * 1024 * 1024
+    # Entries published before this are dropped while parsing.
+    cutoff: datetime | None = None
+    # Raw payloads are also stored here for backfills (see feed_archive).
+    archive_dir: str = ""
+
+
+@dataclass
+class _CachedFeed:
+    etag: str | None
+    last_modified: str | None
+    items: list[NewsItem]
+
+
+# Shared across runs in a long-lived process (scheduler daemon) so feed
+# connections stay pooled and unchanged feeds cost a 304 instead of a parse.
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = _USER_AGENT
+_SESSION.mount("https://", HTTPAdapter(pool_maxsize=32))
+_SESSION.mount("http://", HTTPAdapter(pool_maxsize=32))
+_FEED_CACHE: dict[str, _CachedFeed] = {}
+
+_FEED_ARCHIVE: FeedArchive | None = None
+
+_PARSE_POOL: ProcessPoolExecutor | None = None
+_PARSE_POOL_SIZE = 0
+
+
+def _parse_pool(processes: int) -> ProcessPoolExecutor | None:
+    # Kept for the life of the process so worker startup (and the feedparser
+    # import in each worker) is paid once, not per run.
+    global _PARSE_POOL, _PARSE_POOL_SIZE
+    if processes <= 0:
+        return None
+    if _PARSE_POOL is None or _PARSE_POOL_SIZE != processes:
+        if _PARSE_POOL is not None:
+            _PARSE_POOL.shutdown(wait=False)
+        _PARSE_POOL = ProcessPoolExecutor(max_workers=processes)
+        _PARSE_POOL_SIZE = processes
+    return _PARSE_POOL
+
+
+def _archive_payload(archive_dir: str, source: Source, body: bytes) -> None:
+    global _FEED_ARCHIVE
+    if _FEED_ARCHIVE is None or str(_FEED_ARCHIVE.root) != archive_dir:
+        _FEED_ARCHIVE = FeedArchive(archive_dir)
+    try:
+        _FEED_ARCHIVE.save(source.source_id, body, utc_now())
+    except OSError as exc:
+        logger.warning("Could not archive feed payload of %s: %s", source.name, exc)
+
+
+def _download(source: Source, stream: bool = False) -> requests.Response:
+    headers = {}
+    cached = _FEED_CACHE.get(source.url)
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    return _SESSION.get(source.url, headers=headers, timeout=20, stream=stream)
+
+
+def _parse_body(
+    body: bytes,
+    headers: dict[str, str],
+    cutoff_ts: float | None,
+    parse_pool: Executor | None,
+) -> tuple[list[EntryRow], str | None]:
+    if parse_pool is not None:
+        return parse_pool.submit(parse_feed_rows, body, headers, cutoff_ts).result()
+    return parse_feed_rows(body, headers, cutoff_ts)
+
+
+def _read_rest(
+    stream: Iterable[bytes], chunks: list[bytes], received: int, max_bytes: int
+) -> int:
+    # Appends the rest of a partly consumed body, up to max_bytes in total.
+    if received >= max_bytes:
+        return received
+    for chunk in stream:
+        chunk = chunk[: max_bytes - received]
+        received += len(chunk)
+        chunks.append(chunk)
+        if received >= max_bytes:
+            break
+    return received
+
+
+def _stream_rows(
+    resp: requests.Response,
+    source: Source,
+    options: FetchOptions,
+    parse_pool: Executor | None,
+    source_span: Span,
+) -> tuple[list[EntryRow], str | None, list[bytes]]:
+    # Parses while downloading and stops at the size limit or once entries are
+    # past the cutoff; feeds the incremental parser cannot handle are read to
+    # the end (up to the size limit) and re-parsed with feedparser. With a feed
+    # archive the rest of the body is read too, so the whole payload is kept.
+    cutoff_ts = options.cutoff.timestamp() if options.cutoff is not None else None
+    parser = StreamingFeedParser(cutoff_ts)
+    chunks: list[bytes] = []
+    received = 0
+    error = None
+    stream = resp.iter_content(_STREAM_CHUNK_BYTES)
+    try:
+        for chunk in stream:
+            truncated = received + len(chunk) > options.max_bytes
+            if truncated:
+                chunk = chunk[: options.max_bytes - received]
+            received += len(chunk)
+            chunks.append(chunk)
+            if not parser.feed(chunk):
+                break
+            if truncated:
+                logger.warning(
+                    "Feed %s exceeds %s bytes; keeping entries read so far",
+                    source.name,
+                    options.max_bytes,
                 )
+                source_span.set("truncated", True)
+                break
+        else:
+            parser.close()
+    except FeedStreamError as exc:
+        error = exc
+        received = _read_rest(stream, chunks, received, options.max_bytes)
+    else:
+        if options.archive_dir:
+            received = _read_rest(stream, chunks, received, options.max_bytes)
+    finally:
+        resp.close()
+
+    source_span.set("entries_seen", parser.entries_seen)
+    source_span.set("skipped_old", parser.skipped_old)
+    source_span.set("stopped_early", parser.stopped_early)
+    if error is None:
+        return parser.rows, None, chunks
+    logger.debug("Streaming parse of %s fell back to feedparser: %s", source.name, error)
+    source_span.set("fallback", True)
+    headers = {k.lower(): v for k, v in resp.headers.items()}
+    rows, bozo = _parse_body(b"".join(chunks), headers, cutoff_ts, parse_pool)
+    return rows, bozo, chunks
+
+
+def _parse_entries(
+    resp: requests.Response,
+    source: Source,
+    options: FetchOptions,
+    parse_pool: Executor | None,
+    source_span: Span,
+) -> tuple[list[NewsItem], bool]:
+    if options.streaming:
+        rows, bozo, chunks = _stream_rows(resp, source, options, parse_pool, source_span)
+        received = sum(len(chunk) for chunk in chunks)
+        if options.archive_dir:
+            _archive_payload(options.archive_dir, source, b"".join(chunks))
+    else:
+        headers = {k.lower(): v for k, v in resp.headers.items()}
+        cutoff_ts = options.cutoff.timestamp() if options.cutoff is not None else None
+        rows, bozo = _parse_body(resp.content, headers, cutoff_ts, parse_pool)
+        received = len(resp.content)
+        if options.archive_dir:
+            _archive_payload(options.archive_dir, source, resp.content)
+    source_span.set("bytes", received)
+    if bozo is not None:
+        logger.warning("Feed parse issue for %s: %s", source.name, bozo)
+        source_span.set("bozo", True)
+    return _rows_to_items(rows, source), bozo is not None
+
+
+def _fetch_source(
+    source: Source,
+    options: FetchOptions,
+    parse_pool: Executor | None = None,
+    parent: Span | None = None,
+) -> tuple[list[NewsItem], FetchResult]:
+    logger.info("Fetching %s", source.name)
+    with span("fetch_source", parent=parent, source=source.source_id) as source_span:
+        started = time.perf_counter()
+        try:
+            resp = _download(source, stream=options.streaming)
+        except Exception as exc:  # noqa: BLE001
+            # One source failing (however it fails) must not abort the others.
+            logger.warning("Feed download failed for %s: %s", source.name, exc)
+            source_span.set("error", str(exc))
+            latency_ms = (time.perf_counter() - started) * 1000
+            return [], FetchResult(ok=False, latency_ms=latency_ms, error=str(exc))
+        latency_ms = (time.perf_counter() - started) * 1000
+        source_span.set("status", resp.status_code)
+        cached = _FEED_CACHE.get(source.url)
+        if resp.status_code == 304 and cached is not None:
+            metrics.CACHE_REQUESTS.inc(cache="feed", result="hit")
+            resp.close()
+            source_span.set("items", len(cached.items))
+            return list(cached.items), FetchResult(ok=True, latency_ms=latency_ms)
+        metrics.CACHE_REQUESTS.inc(cache="feed", result="miss")
+        if not resp.ok:
+            resp.close()
+            logger.warning("Feed %s returned HTTP %s", source.name, resp.status_code)
+            return [], FetchResult(
+                ok=False, latency_ms=latency_ms, error=f"HTTP {resp.status_code}"
             )
+        try:
+            items, bozo = _parse_entries(resp, source, options, parse_pool, source_span)
+        except requests.RequestException as exc:
+            logger.warning("Feed download failed for %s: %s", source.name, exc)
+            source_span.set("error", str(exc))
+            return [], FetchResult(ok=False, latency_ms=latency_ms, error=str(exc))
+        except Exception as exc:  # noqa: BLE001
+            # A parser bug or a broken parse pool, recorded as a failed fetch.
+            logger.exception("Feed parse failed for %s", source.name)
+            resp.close()
+            error = f"{type(exc).__name__}: {exc}"
+            source_span.set("error", error)
+            return [], FetchResult(ok=False, latency_ms=latency_ms, error=error)
+        _FEED_CACHE[source.url] = _CachedFeed(
+            resp.headers.get("ETag"), resp.headers.get("Last-Modified"), list(items)
+        )
+        source_span.set("items", len(items))
+        # A bozo feed that still yields entries is degraded, not down.
+        error = "unparseable feed" if bozo and not items else None
+        return items, FetchResult(ok=error is None, latency_ms=latency_ms, bozo=bozo, error=error)
+
+
+def _fetch_each(
+    sources: list[Source],
+    health: SourceHealthLedger | None,
+    options: FetchOptions,
+    on_fetched: Callable[[Source, list[NewsItem]], None] | None = None,
+) -> list[NewsItem]:
+    allowed: list[Source] = []
+    for source in sources:
+        if health is not None and not health.allow(source.source_id):
+            logger.info("Skipping %s: circuit open", source.name)
+            continue
+        allowed.append(source)
+    skipped = len(sources) - len(allowed)
+    if skipped:
+        current_span().set("circuit_open", skipped)
+
+    # Threads overlap the network waits; with a parse pool each thread hands its
+    # body to a worker process so feedparser's CPU work leaves the GIL too.
+    parse_pool = _parse_pool(options.parse_processes)
+    parent = current_span()
+    if options.workers > 1 and len(allowed) > 1:
+        with ThreadPoolExecutor(max_workers=min(options.workers, len(allowed))) as pool:
+            results = list(
+                pool.map(lambda s: _fetch_source(s, options, parse_pool, parent), allowed)
+            )
+    else:
+        results = [_fetch_source(source, options, parse_pool) for source in allowed]
+
+    items: list[NewsItem] = []
+    for source, (fetched, result) in zip(allowed, results):
+        metrics.FEED_FETCH_SECONDS.observe(result.latency_ms / 1000, source=source.source_id)
+        metrics.FEED_FETCHES.inc(source=source.source_id, result="ok" if result.ok else "error")
+        if health is not None:
+            health.record(source.source_id, result)
+        if on_fetched is not None:
+            on_fetched(source, fetched)
+        items.extend(fetched)
+    return items
+
+
+def fetch_sources(
+    sources: Iterable[Source],
+    health: SourceHealthLedger | None = None,
+    options: FetchOptions | None = None,
+) -> list[NewsItem]:
+    return _fetch_each(list(sources), health, options or FetchOptions())
+
+
+def fetch_adaptive(
+    sources: Iterable[Source],
+    ledger: SourceStatsLedger,
+    max_defer_hours: float,
+    health: SourceHealthLedger | None = None,
+    options: FetchOptions | None = None,
+) -> list[NewsItem]:
+    sources = list(sources)
+    ledger.apply(sources)
+    due, deferred = plan_fetch(sources, ledger, max_defer_hours)
+    # A deferred feed contributes what this process saw last time; without a
+    # copy (a fresh process, e.g. a one-shot run) it is fetched after all.
+    cached = [_FEED_CACHE[s.url] for s in deferred if s.url in _FEED_CACHE]
+    due += [source for source in deferred if source.url not in _FEED_CACHE]
+    current_span().set("deferred", len(cached))
+    if cached:
+        logger.info("Deferring %s slow-moving sources", len(cached))
+    items = _fetch_each(due, health, options or FetchOptions(), ledger.observe_fetch)
+    for feed in cached:
+        items.extend(feed.items)
+    ledger.save()
+    return items
+
+
+def fetch_configured(
+    cfg: Config,
+    sources: Iterable[Source],
+    cutoff: datetime | None = None,
+) -> list[NewsItem]:
+    options = FetchOptions(
+        workers=cfg.fetch_workers,
+        parse_processes=cfg.feed_parse_processes,
+        streaming=cfg.feed_streaming,
+        max_bytes=cfg.feed_max_bytes,
+        cutoff=cutoff,
+        archive_dir=cfg.feed_archive_dir,
+    )
+    health = None
+    if cfg.circuit_breaker:
+        health = SourceHealthLedger(
+            cfg.source_health_file,
+            failure_threshold=cfg.circuit_failure_threshold,
+            base_open_minutes=cfg.circuit_base_open_minutes,
+            max_open_hours=cfg.circuit_max_open_hours,
+        )
+    if cfg.adaptive_polling:
+        items = fetch_adaptive(
+            sources,
+            SourceStatsLedger(cfg.source_stats_file),
+            cfg.adaptive_max_defer_hours,
+            health,
+            options,
+        )
+    else:
+        items = fetch_sources(sources, health, options)
+    if health is not None:
+        health.save()
     return items
@@ -0,0 +1,64 @@
+import argparse
+import logging
+import time
+from datetime import timedelta
+
+from dotenv import load_dotenv
+
+from fin_news_digest.config import Config, load_config
+from fin_news_digest.fetcher import fetch_configured
+from fin_news_digest.item_store import ItemStore
+from fin_news_digest.source_loader import load_sources
+from fin_news_digest.utils import configure_logging, utc_now
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_once(cfg: Config, store: ItemStore) -> int:
+    started = time.perf_counter()
+    cutoff = utc_now() - timedelta(hours=cfg.item_store_retention_hours)
+    items = fetch_configured(cfg, load_sources(cfg.sources_file), cutoff)
+    added = store.add_items(items)
+    pruned = store.prune(cfg.item_store_retention_hours)
+    logger.info(
+        "Ingested %s new of %s fetched items in %.1fs (pruned %s, stored %s)",
+        added,
+        len(items),
+        time.perf_counter() - started,
+        pruned,
+        store.count(),
+    )
+    return added
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Poll sources continuously and append new items to the local item store."
+    )
+    parser.add_argument("--once", action="store_true", help="Poll all sources once and exit")
+    parser.add_argument("--interval-minutes", type=float, help="Override INGEST_INTERVAL_MINUTES")
+    args = parser.parse_args()
+
+    load_dotenv()
+    cfg = load_config()
+    configure_logging(cfg.log_level)
+    if not cfg.item_store_file:
+        raise SystemExit("ITEM_STORE_FILE is empty")
+
+    interval = (args.interval_minutes or cfg.ingest_interval_minutes) * 60
+    with ItemStore(cfg.item_store_file) as store:
+        while True:
+            started = time.monotonic()
+            try:
+                ingest_once(cfg, store)
+            except Exception:  # noqa: BLE001
+                if args.once:
+                    raise
+                logger.exception("Ingest pass failed")
+            if args.once:
+                return
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    main()
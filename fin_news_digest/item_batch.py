@@ -0,0 +1,120 @@
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+from fin_news_digest.models import NewsItem
+
+
+def link_fingerprint(link: str) -> int:
+    # Only compared within one process, so the builtin (seeded) hash is enough;
+    # callers confirm matches against the exact link.
+    return hash(link)
+
+
+class ItemBatch:
+    # Column view over items: the NewsItem objects (an object array) stay the
+    # source of truth, numeric columns let recency, sent-state and top-k
+    # checks run as array operations instead of per-item Python loops.
+    __slots__ = ("items", "published", "priority", "source_id", "fingerprint", "_boosts")
+
+    def __init__(
+        self,
+        items: np.ndarray,
+        published: np.ndarray,
+        priority: np.ndarray,
+        source_id: np.ndarray,
+        fingerprint: np.ndarray,
+        boosts: dict[str, np.ndarray] | None = None,
+    ) -> None:
+        self.items = items
+        self.published = published
+        self.priority = priority
+        self.source_id = source_id
+        self.fingerprint = fingerprint
+        self._boosts = boosts or {}
+
+    @classmethod
+    def from_items(cls, items: Iterable[NewsItem]) -> "ItemBatch":
+        items = list(items)
+        count = len(items)
+        sources: dict[str, int] = {}
+        column = np.empty(count, dtype=object)
+        column[:] = items
+        return cls(
+            column,
+            np.fromiter((item.published_ts for item in items), dtype=np.int64, count=count),
+            np.fromiter((item.priority for item in items), dtype=np.float64, count=count),
+            np.fromiter(
+                (sources.setdefault(item.source, len(sources)) for item in items),
+                dtype=np.int32,
+                count=count,
+            ),
+            np.fromiter(
+                (link_fingerprint(item.link) for item in items), dtype=np.int64, count=count
+            ),
+        )
+
+    def __getstate__(self) -> dict:
+        # Fingerprints use the per-process string hash, so they are rebuilt
+        # on load rather than pickled (e.g. into a stage checkpoint).
+        return {
+            "items": self.items,
+            "published": self.published,
+            "priority": self.priority,
+            "source_id": self.source_id,
+            "boosts": self._boosts,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.items = state["items"]
+        self.published = state["published"]
+        self.priority = state["priority"]
+        self.source_id = state["source_id"]
+        self._boosts = state["boosts"]
+        self.fingerprint = np.fromiter(
+            (link_fingerprint(item.link) for item in self.items),
+            dtype=np.int64,
+            count=len(self.items),
+        )
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[NewsItem]:
+        return iter(self.items)
+
+    def __getitem__(self, index: int) -> NewsItem:
+        return self.items[index]
+
+    def to_list(self) -> list[NewsItem]:
+        return self.items.tolist()
+
+    def take(self, indices: np.ndarray) -> "ItemBatch":
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        return ItemBatch(
+            self.items[indices],
+            self.published[indices],
+            self.priority[indices],
+            self.source_id[indices],
+            self.fingerprint[indices],
+            {label: boost[indices] for label, boost in self._boosts.items()},
+        )
+
+    def select(self, items: Iterable[NewsItem]) -> "ItemBatch":
+        # Sub-batch for items returned by a list-based stage (e.g. dedupe_items).
+        positions = {id(item): idx for idx, item in enumerate(self.items.tolist())}
+        return self.take(np.fromiter((positions[id(item)] for item in items), dtype=np.int64))
+
+    def boost(self, label: str, compute: Callable[[NewsItem, str], float]) -> np.ndarray:
+        # Keyword boosts need substring matching, which stays a Python loop
+        # (numpy string ufuncs measured slower); it runs once per item and
+        # label (an edition, or "story" for coverage) and the column is
+        # carried through take().
+        if label not in self._boosts:
+            self._boosts[label] = np.fromiter(
+                (compute(item, label) for item in self.items.tolist()),
+                dtype=np.float64,
+                count=len(self.items),
+            )
+        return self._boosts[label]
@@ -0,0 +1,155 @@
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+
+from fin_news_digest.models import NewsItem
+from fin_news_digest.textnorm import TextFeatures
+from fin_news_digest.utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Same-title rewrites of one story published further apart than this are
+# treated as separate stories.
+_TITLE_DUPLICATE_WINDOW = timedelta(hours=24)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    link TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    source TEXT NOT NULL,
+    language TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    published_ts REAL NOT NULL,
+    ingested_ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_published ON items (published_ts);
+CREATE INDEX IF NOT EXISTS items_title_key ON items (title_key, published_ts);
+CREATE TABLE IF NOT EXISTS editions (
+    key TEXT PRIMARY KEY,
+    edition_label TEXT NOT NULL,
+    built_ts REAL NOT NULL,
+    items INTEGER NOT NULL
+);
+"""
+
+
+def title_key(title: str) -> str:
+    return TextFeatures(title).title_key
+
+
+def _row_to_item(row: sqlite3.Row) -> NewsItem:
+    return NewsItem(
+        title=row["title"],
+        link=row["link"],
+        published=row["published_ts"],
+        summary=row["summary"],
+        source=row["source"],
+        language=row["language"],
+        priority=row["priority"],
+    )
+
+
+class ItemStore:
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30.0)
+        self._conn.row_factory = sqlite3.Row
+        # WAL lets the digest read while the ingest loop is writing.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ItemStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def add_items(self, items: Iterable[NewsItem]) -> int:
+        # Exact link repeats are ignored; a same-title rewrite within the
+        # duplicate window keeps the higher (priority, published) copy, the
+        # same preference dedupe_items applies.
+        window = _TITLE_DUPLICATE_WINDOW.total_seconds()
+        now_ts = utc_now().timestamp()
+        added = 0
+        with self._lock, self._conn:
+            for item in items:
+                published_ts = item.published_ts
+                if self._conn.execute(
+                    "SELECT 1 FROM items WHERE link = ?", (item.link,)
+                ).fetchone():
+                    continue
+                key = title_key(item.title)
+                existing = self._conn.execute(
+                    "SELECT link, priority, published_ts FROM items "
+                    "WHERE title_key = ? AND published_ts BETWEEN ? AND ?",
+                    (key, published_ts - window, published_ts + window),
+                ).fetchone()
+                if existing is not None:
+                    if (item.priority, published_ts) <= (
+                        existing["priority"],
+                        existing["published_ts"],
+                    ):
+                        continue
+                    self._conn.execute("DELETE FROM items WHERE link = ?", (existing["link"],))
+                self._conn.execute(
+                    "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        item.link,
+                        item.title,
+                        key,
+                        item.summary,
+                        item.source,
+                        item.language,
+                        item.priority,
+                        published_ts,
+                        now_ts,
+                    ),
+                )
+                added += 1
+        return added
+
+    def items_since(self, since: datetime) -> list[NewsItem]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM items WHERE published_ts >= ? ORDER BY published_ts DESC",
+                (since.timestamp(),),
+            ).fetchall()
+        return [_row_to_item(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def prune(self, retention_hours: int) -> int:
+        cutoff = (utc_now() - timedelta(hours=retention_hours)).timestamp()
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM items WHERE published_ts < ?", (cutoff,))
+        return cursor.rowcount
+
+    def record_edition(self, key: str, edition_label: str, items: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO editions VALUES (?, ?, ?, ?)",
+                (key, edition_label, utc_now().timestamp(), items),
+            )
+
+    def last_edition_at(self, edition_label: str | None = None) -> datetime | None:
+        query = "SELECT MAX(built_ts) FROM editions"
+        params: tuple = ()
+        if edition_label is not None:
+            query += " WHERE edition_label = ?"
+            params = (edition_label,)
+        with self._lock:
+            value = self._conn.execute(query, params).fetchone()[0]
+        return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
@@ -1,11 +1,15 @@
 import json
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any
 
 import requests
 
+from fin_news_digest import metrics
+from fin_news_digest.clustering import coverage_note
 from fin_news_digest.models import NewsItem
+from fin_news_digest.tracing import timed
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,13 @@ class OpenAIRerankConfig:
     model: str
     base_url: str
     candidates: int
+    timeout_seconds: float = 60.0
+
+
+_RERANK_CACHE_MAX = 32
+# Keyed by model, edition and candidate identity; lets a warm process reuse
+# a prefetched ranking when the candidate set has not changed by send time.
+_RERANK_CACHE: OrderedDict[tuple, list[int]] = OrderedDict()
 
 
 def _build_prompt(items: list[NewsItem], edition_label: str) -> str:
@@ -27,12 +38,13 @@ def _build_prompt(items: list[NewsItem], edition_label: str) -> str:
         "- Prefer major policy decisions, macro releases, central bank actions, market-moving company news.",
         "- Prefer high-impact, timely, and reputable sources.",
         "- Avoid duplicated or low-signal items.",
+        "- Stories covered by several independent sources are usually more important.",
         "- Output JSON only.",
         "Items:",
     ]
     for idx, item in enumerate(items, start=1):
         lines.append(
-            f"[{idx}] {item.title} | {item.source} | {item.summary}"
+            f"[{idx}] {item.title} | {item.source}{coverage_note(item)} | {item.summary}"
         )
     lines.append(
         "Return JSON with: order (array of item ids) and scores (map id->0-100)."
@@ -76,6 +88,18 @@ def rerank_items(
         return None
 
     candidates = items[: cfg.candidates]
+    cache_key = (
+        cfg.model,
+        edition_label,
+        tuple((item.link, item.title) for item in candidates),
+    )
+    order = _RERANK_CACHE.get(cache_key)
+    metrics.CACHE_REQUESTS.inc(cache="rerank", result="hit" if order is not None else "miss")
+    if order is not None:
+        _RERANK_CACHE.move_to_end(cache_key)
+        logger.info("LLM rerank cache hit for %s candidates", len(candidates))
+        return _apply_order(candidates, order)
+
     prompt = _build_prompt(candidates, edition_label)
 
     payload = {
@@ -97,7 +121,11 @@ def rerank_items(
     }
 
     try:
-        resp = requests.post(url, headers=headers, data=json.dumps(payload), timeout=60)
+        with timed("http.openai") as counts:
+            resp = requests.post(
+                url, headers=headers, data=json.dumps(payload), timeout=cfg.timeout_seconds
+            )
+            counts["bytes"] = len(resp.content)
         resp.raise_for_status()
         data = resp.json()
         content = data["choices"][0]["message"]["content"]
@@ -110,6 +138,13 @@ def rerank_items(
     if not order:
         return None
 
+    _RERANK_CACHE[cache_key] = order
+    if len(_RERANK_CACHE) > _RERANK_CACHE_MAX:
+        _RERANK_CACHE.popitem(last=False)
+    return _apply_order(candidates, order)
+
+
+def _apply_order(candidates: list[NewsItem], order: list[int]) -> list[NewsItem]:
     id_to_item = {idx: item for idx, item in enumerate(candidates, start=1)}
     ranked: list[NewsItem] = []
     for idx in order:
@@ -8,6 +8,9 @@ from typing import Any
 
 import requests
 
+from fin_news_digest import metrics
+from fin_news_digest.tracing import timed
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,7 +63,9 @@ def fetch_alpha_vantage_quote(
         "https://www.alphavantage.co/query"
         f"?function=GLOBAL_QUOTE&symbol={symbol}&apikey={api_key}"
     )
-    resp = requests.get(url, timeout=20)
+    with timed("http.alpha_vantage") as counts:
+        resp = requests.get(url, timeout=20)
+        counts["bytes"] = len(resp.content)
     resp.raise_for_status()
     data = resp.json()
     quote = data.get("Global Quote", {})
@@ -102,7 +107,9 @@ def fetch_stooq_daily(
             "Chrome/121.0.0.0 Safari/537.36"
         )
     }
-    resp = requests.get(url, headers=headers, timeout=20)
+    with timed("http.stooq") as counts:
+        resp = requests.get(url, headers=headers, timeout=20)
+        counts["bytes"] = len(resp.content)
     resp.raise_for_status()
     text = resp.text.strip()
     if not text or "No data" in text:
@@ -149,7 +156,9 @@ def fetch_alpha_vantage_metal(
         f"?function=GOLD_SILVER_HISTORY&symbol={metal_symbol}"
         f"&interval=daily&apikey={api_key}"
     )
-    resp = requests.get(url, timeout=20)
+    with timed("http.alpha_vantage") as counts:
+        resp = requests.get(url, timeout=20)
+        counts["bytes"] = len(resp.content)
     resp.raise_for_status()
     data = resp.json()
     series = data.get("data") or data.get("Time Series (Daily)")
@@ -200,7 +209,9 @@ def fetch_coingecko_prices() -> list[MarketItem]:
         "?ids=bitcoin,ethereum&vs_currencies=usd"
         "&include_24hr_change=true&include_last_updated_at=true"
     )
-    resp = requests.get(url, timeout=20)
+    with timed("http.coingecko") as counts:
+        resp = requests.get(url, timeout=20)
+        counts["bytes"] = len(resp.content)
     resp.raise_for_status()
     data = resp.json()
 
@@ -260,7 +271,9 @@ def fetch_eastmoney_indices(
             "Chrome/121.0.0.0 Safari/537.36"
         )
     }
-    resp = requests.get(url, params=params, headers=headers, timeout=20)
+    with timed("http.eastmoney") as counts:
+        resp = requests.get(url, params=params, headers=headers, timeout=20)
+        counts["bytes"] = len(resp.content)
     resp.raise_for_status()
     payload = resp.json()
     diff = payload.get("data", {}).get("diff", []) or []
@@ -304,9 +317,31 @@ def fetch_eastmoney_indices(
     return ordered_items
 
 
+_SNAPSHOT_CACHE: tuple[float, list[MarketSection]] | None = None
+
+
 def build_market_snapshot(
     api_key: str,
     sleep_seconds: float,
+    max_age_seconds: float = 0.0,
+) -> list[MarketSection]:
+    # A warm process (scheduler daemon) reuses a recent prefetched snapshot.
+    global _SNAPSHOT_CACHE
+    if max_age_seconds > 0 and _SNAPSHOT_CACHE is not None:
+        fetched_at, sections = _SNAPSHOT_CACHE
+        if time.monotonic() - fetched_at <= max_age_seconds:
+            logger.info("Using market snapshot prefetched %.0fs ago", time.monotonic() - fetched_at)
+            metrics.CACHE_REQUESTS.inc(cache="market", result="hit")
+            return sections
+    metrics.CACHE_REQUESTS.inc(cache="market", result="miss")
+    sections = _fetch_market_snapshot(api_key, sleep_seconds)
+    _SNAPSHOT_CACHE = (time.monotonic(), sections)
+    return sections
+
+
+def _fetch_market_snapshot(
+    api_key: str,
+    sleep_seconds: float,
 ) -> list[MarketSection]:
     # Stooq (US/EU + metals ETFs, no API key) + Eastmoney (China indices) + CoinGecko (crypto)
     us_symbols = [("SPY.US", "S&P 500"), ("QQQ.US", "Nasdaq 100"), ("DIA.US", "Dow Jones")]
@@ -0,0 +1,217 @@
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(labels: LabelKey, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: dict[str, str]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in values]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in values]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...]) -> None:
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: non-cumulative bucket counts, sum, count.
+        self._values: dict[LabelKey, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[idx] += 1
+                    break
+            total[0] += value
+
+    def samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            values = sorted((k, (list(c), t[0])) for k, (c, t) in self._values.items())
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge(name, help_text))
+
+    def histogram(
+        self, name: str, help_text: str, buckets: tuple[float, ...] = _LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+FEED_FETCH_SECONDS = REGISTRY.histogram(
+    "fin_digest_feed_fetch_seconds", "Feed download time per source."
+)
+FEED_FETCHES = REGISTRY.counter(
+    "fin_digest_feed_fetches_total", "Feed fetches per source and result (ok, error)."
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "fin_digest_stage_seconds", "Pipeline stage durations.", _STAGE_BUCKETS
+)
+STAGE_ITEMS = REGISTRY.gauge(
+    "fin_digest_stage_items", "Items leaving each stage in the latest run."
+)
+DEDUPE_RATIO = REGISTRY.gauge(
+    "fin_digest_dedupe_ratio", "Share of windowed items kept by dedupe in the latest run."
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "fin_digest_cache_requests_total",
+    "Cache lookups by cache (feed, translation, rerank, market) and result (hit, miss).",
+)
+RETRIES = REGISTRY.counter(
+    "fin_digest_retries_total", "Retried requests by operation (translation, smtp)."
+)
+SMTP_SEND_SECONDS = REGISTRY.histogram(
+    "fin_digest_smtp_send_seconds", "Time to send one message to one recipient."
+)
+RUNS = REGISTRY.counter(
+    "fin_digest_runs_total", "Digest runs by run and result (ok, skipped, error)."
+)
+LAST_RUN_SECONDS = REGISTRY.gauge(
+    "fin_digest_last_run_duration_seconds", "Duration of the latest run."
+)
+LAST_RUN_TIMESTAMP = REGISTRY.gauge(
+    "fin_digest_last_run_timestamp_seconds", "Unix time the latest run finished."
+)
+
+
+def write_textfile(path: str) -> None:
+    # node-exporter's textfile collector reads *.prom files; the rename keeps
+    # it from ever seeing a half-written file.
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(REGISTRY.render(), encoding="utf-8")
+    os.replace(tmp, target)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.debug("metrics %s", format % args)
+
+
+def serve(port: int, host: str = "") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("Serving metrics on :%s/metrics", server.server_address[1])
+    return server
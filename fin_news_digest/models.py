@@ -1,18 +1,129 @@
-from dataclasses import dataclass
-from datetime import datetime
+import sys
+from datetime import datetime, timezone
+
+from fin_news_digest.textnorm import TextFeatures
+
+
+class _Bilingual:
+    __slots__ = ("title_en", "title_zh", "summary_en", "summary_zh")
+
+    def __init__(self) -> None:
+        self.title_en: str | None = None
+        self.title_zh: str | None = None
+        self.summary_en: str | None = None
+        self.summary_zh: str | None = None
+
+
+def _bilingual_field(name: str) -> property:
+    def _get(self: "NewsItem") -> str | None:
+        extra = self._bilingual
+        return getattr(extra, name) if extra is not None else None
+
+    def _set(self: "NewsItem", value: str | None) -> None:
+        if self._bilingual is None:
+            if value is None:
+                return
+            self._bilingual = _Bilingual()
+        setattr(self._bilingual, name, value)
+
+    return property(_get, _set)
 
 
-@dataclass
 class NewsItem:
-    title: str
-    link: str
-    published: datetime
-    summary: str
-    source: str
-    language: str
-    priority: int
-
-    title_en: str | None = None
-    title_zh: str | None = None
-    summary_en: str | None = None
-    summary_zh: str | None = None
+    # Slotted with interned source/language and an integer epoch so large
+    # windows (ingest store, multi-day backfills) stay compact; bilingual
+    # fields only allocate storage once translation attaches them.
+    __slots__ = (
+        "title",
+        "link",
+        "published_ts",
+        "summary",
+        "source",
+        "language",
+        "priority",
+        "story",
+        "_bilingual",
+        "_text",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        published: datetime | int | float,
+        summary: str,
+        source: str,
+        language: str,
+        priority: int,
+        title_en: str | None = None,
+        title_zh: str | None = None,
+        summary_en: str | None = None,
+        summary_zh: str | None = None,
+    ) -> None:
+        self.title = title
+        self.link = link
+        self.published = published
+        self.summary = summary
+        self.source = sys.intern(source)
+        self.language = sys.intern(language)
+        self.priority = priority
+        # StoryCluster this item represents, attached by clustering.
+        self.story = None
+        self._bilingual: _Bilingual | None = None
+        self._text: TextFeatures | None = None
+        self.title_en = title_en
+        self.title_zh = title_zh
+        self.summary_en = summary_en
+        self.summary_zh = summary_zh
+
+    @property
+    def published(self) -> datetime:
+        return datetime.fromtimestamp(self.published_ts, tz=timezone.utc)
+
+    @published.setter
+    def published(self, value: datetime | int | float) -> None:
+        if isinstance(value, datetime):
+            value = value.timestamp()
+        self.published_ts = int(value)
+
+    @property
+    def text(self) -> TextFeatures:
+        # Normalized title/summary, rebuilt only if either is reassigned.
+        cached = self._text
+        if cached is None or not cached.matches(self.title, self.summary):
+            cached = self._text = TextFeatures(self.title, self.summary)
+        return cached
+
+    title_en = _bilingual_field("title_en")
+    title_zh = _bilingual_field("title_zh")
+    summary_en = _bilingual_field("summary_en")
+    summary_zh = _bilingual_field("summary_zh")
+
+    def _key(self) -> tuple:
+        return (
+            self.title,
+            self.link,
+            self.published_ts,
+            self.summary,
+            self.source,
+            self.language,
+            self.priority,
+            self.title_en,
+            self.title_zh,
+            self.summary_en,
+            self.summary_zh,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"NewsItem(title={self.title!r}, link={self.link!r}, "
+            f"published={self.published.isoformat()}, source={self.source!r}, "
+            f"language={self.language!r}, priority={self.priority!r})"
+        )
@@ -5,7 +5,9 @@ from typing import Any
 
 import requests
 
+from fin_news_digest.clustering import coverage_note
 from fin_news_digest.models import NewsItem
+from fin_news_digest.tracing import timed
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,7 @@ class OpenAISummaryConfig:
     api_key: str
     model: str
     base_url: str
+    timeout_seconds: float = 60.0
 
 
 def build_summary_prompt(items: list[NewsItem], edition_label: str) -> str:
@@ -25,7 +28,7 @@ def build_summary_prompt(items: list[NewsItem], edition_label: str) -> str:
         "新闻列表：",
     ]
     for item in items:
-        lines.append(f"- {item.title} | {item.source} | {item.summary}")
+        lines.append(f"- {item.title} | {item.source}{coverage_note(item)} | {item.summary}")
     return "\n".join(lines)
 
 
@@ -72,7 +75,11 @@ def summarize_cn(
     }
 
     try:
-        resp = requests.post(url, headers=headers, data=json.dumps(payload), timeout=60)
+        with timed("http.openai") as counts:
+            resp = requests.post(
+                url, headers=headers, data=json.dumps(payload), timeout=cfg.timeout_seconds
+            )
+            counts["bytes"] = len(resp.content)
         resp.raise_for_status()
         data = resp.json()
         content = data["choices"][0]["message"]["content"]
@@ -0,0 +1,251 @@
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fin_news_digest.config import Config
+from fin_news_digest.emailer import PreparedMessage
+from fin_news_digest.smtp_pool import DeliveryResult, SMTPPool, SMTPSettings
+
+logger = logging.getLogger(__name__)
+
+_MESSAGE_FILE = "message.eml"
+_META_FILE = "meta.json"
+_LOG_FILE = "deliveries.jsonl"
+
+
+def edition_key(edition_label: str, when: datetime | None = None) -> str:
+    when = when or datetime.now(timezone.utc)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", edition_label).strip("-").lower() or "edition"
+    return f"{when.strftime('%Y-%m-%d')}-{slug}"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+@dataclass
+class OutboxEntry:
+    key: str
+    path: Path
+    subject: str
+    edition_label: str
+    recipients: list[str]
+    created_at: str
+    delivered: set[str] = field(default_factory=set)
+    attempts: dict[str, int] = field(default_factory=dict)
+    last_error: dict[str, str] = field(default_factory=dict)
+
+    def undelivered(self) -> list[str]:
+        return [r for r in self.recipients if r not in self.delivered]
+
+    def message(self) -> PreparedMessage:
+        meta = json.loads((self.path / _META_FILE).read_text(encoding="utf-8"))
+        return PreparedMessage(
+            envelope_from=meta["envelope_from"],
+            payload=(self.path / _MESSAGE_FILE).read_bytes(),
+        )
+
+
+class _DeliveryLog:
+    def __init__(self, entry: OutboxEntry) -> None:
+        self.entry = entry
+        self._lock = threading.Lock()
+        self._fh = open(entry.path / _LOG_FILE, "a", encoding="utf-8")
+
+    def record(self, result: DeliveryResult) -> None:
+        line = json.dumps(
+            {
+                "recipient": result.recipient,
+                "ok": result.ok,
+                "error": result.error,
+                "at": datetime.now(timezone.utc).isoformat(),
+            },
+            ensure_ascii=True,
+        )
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            _apply(self.entry, result.recipient, result.ok, result.error)
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def _apply(entry: OutboxEntry, recipient: str, ok: bool, error: str | None) -> None:
+    entry.attempts[recipient] = entry.attempts.get(recipient, 0) + 1
+    if ok:
+        entry.delivered.add(recipient)
+        entry.last_error.pop(recipient, None)
+    elif error:
+        entry.last_error[recipient] = error
+
+
+class Outbox:
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def create(
+        self,
+        key: str,
+        edition_label: str,
+        subject: str,
+        prepared: PreparedMessage,
+        recipients: list[str],
+    ) -> OutboxEntry:
+        path = self.root / key
+        path.mkdir(parents=True, exist_ok=True)
+        log_path = path / _LOG_FILE
+        if log_path.exists():
+            log_path.unlink()
+        created_at = datetime.now(timezone.utc).isoformat()
+        _write_atomic(path / _MESSAGE_FILE, prepared.payload)
+        meta = {
+            "key": key,
+            "edition_label": edition_label,
+            "subject": subject,
+            "envelope_from": prepared.envelope_from,
+            "recipients": recipients,
+            "created_at": created_at,
+        }
+        _write_atomic(
+            path / _META_FILE,
+            json.dumps(meta, ensure_ascii=True, indent=2).encode("utf-8"),
+        )
+        return OutboxEntry(
+            key=key,
+            path=path,
+            subject=subject,
+            edition_label=edition_label,
+            recipients=list(recipients),
+            created_at=created_at,
+        )
+
+    def load(self, key: str) -> OutboxEntry | None:
+        path = self.root / key
+        meta_path = path / _META_FILE
+        if not meta_path.exists() or not (path / _MESSAGE_FILE).exists():
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            logger.warning("Corrupt outbox metadata at %s", meta_path)
+            return None
+        entry = OutboxEntry(
+            key=key,
+            path=path,
+            subject=meta.get("subject", ""),
+            edition_label=meta.get("edition_label", ""),
+            recipients=meta.get("recipients", []),
+            created_at=meta.get("created_at", ""),
+        )
+        log_path = path / _LOG_FILE
+        if log_path.exists():
+            for line in log_path.read_text(encoding="utf-8").splitlines():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write.
+                    continue
+                _apply(entry, record["recipient"], record["ok"], record.get("error"))
+        return entry
+
+    def prune(self, max_age_hours: int) -> None:
+        # Entries are kept for resume and inspection, then dropped after the
+        # same retention as checkpoints; an entry still undelivered by then is
+        # too stale to send.
+        if not self.root.exists():
+            return
+        cutoff = time.time() - max_age_hours * 3600
+        for path in self.root.iterdir():
+            meta_path = path / _META_FILE
+            written = meta_path if meta_path.exists() else path
+            if path.is_dir() and written.stat().st_mtime < cutoff:
+                entry = self.load(path.name)
+                if entry is not None and entry.undelivered():
+                    logger.warning(
+                        "Dropping outbox %s with %s undelivered recipients",
+                        path.name,
+                        len(entry.undelivered()),
+                    )
+                shutil.rmtree(path, ignore_errors=True)
+
+    def pending(self) -> list[OutboxEntry]:
+        if not self.root.exists():
+            return []
+        entries = []
+        for path in sorted(self.root.iterdir()):
+            if not path.is_dir():
+                continue
+            entry = self.load(path.name)
+            if entry is not None and entry.undelivered():
+                entries.append(entry)
+        return entries
+
+
+def deliver_entry(
+    entry: OutboxEntry,
+    pool: SMTPPool,
+    max_rounds: int,
+    backoff_base_seconds: float,
+    backoff_max_seconds: float,
+) -> list[str]:
+    prepared = entry.message()
+    log = _DeliveryLog(entry)
+    try:
+        for round_idx in range(max(1, max_rounds)):
+            pending = entry.undelivered()
+            if not pending:
+                break
+            if round_idx:
+                delay = min(backoff_max_seconds, backoff_base_seconds * (2 ** (round_idx - 1)))
+                logger.info(
+                    "Retrying %s undelivered recipients for %s in %.1fs",
+                    len(pending),
+                    entry.key,
+                    delay,
+                )
+                time.sleep(delay)
+            pool.deliver(prepared, pending, on_result=log.record)
+    finally:
+        log.close()
+    remaining = entry.undelivered()
+    logger.info(
+        "Outbox %s: delivered %s/%s recipients",
+        entry.key,
+        len(entry.recipients) - len(remaining),
+        len(entry.recipients),
+    )
+    return remaining
+
+
+def deliver_from_config(cfg: Config, entry: OutboxEntry) -> list[str]:
+    pool = SMTPPool(
+        SMTPSettings(
+            host=cfg.smtp_host,
+            port=cfg.smtp_port,
+            use_tls=cfg.smtp_use_tls,
+            user=cfg.smtp_user,
+            password=cfg.smtp_pass,
+        ),
+        connections=cfg.smtp_connections,
+        rate_per_second=cfg.smtp_rate_per_second,
+    )
+    return deliver_entry(
+        entry,
+        pool,
+        cfg.delivery_max_rounds,
+        cfg.delivery_backoff_base_seconds,
+        cfg.delivery_backoff_max_seconds,
+    )
@@ -1,25 +1,73 @@
-import os
+import argparse
+import html
+import json
+import logging
+import pickle
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
 
 from dotenv import load_dotenv
 
-from fin_news_digest.config import load_config
-from fin_news_digest.market_data import build_market_snapshot
-from fin_news_digest.news_summary import OpenAISummaryConfig, summarize_cn
-from fin_news_digest.source_loader import load_sources
-from fin_news_digest.fetcher import fetch_sources
-from fin_news_digest.dedupe import dedupe_items, filter_recent, rank_items
-from fin_news_digest.emailer import build_message
+from fin_news_digest.archive import Archive
+from fin_news_digest.checkpoint import CHECKPOINT_VERSION, CheckpointStore
+from fin_news_digest.config import Config, load_config
+from fin_news_digest.emailer import (
+    HTML_TEMPLATE,
+    TEMPLATES_DIR,
+    TEXT_TEMPLATE,
+    enable_template_reload,
+    render_bodies,
+)
+from fin_news_digest.market_data import MarketItem, MarketSection
+from fin_news_digest.models import NewsItem
 from fin_news_digest.utils import configure_logging
 
+logger = logging.getLogger(__name__)
+
+_EDITIONS = ("Preview", "NY 08:00", "BJ 08:00")
+_DEFAULT_OUTPUT = "/tmp/finance_digest_preview.html"
+_DEFAULT_CACHE = "/tmp/finance_digest_preview.pkl"
+_TEMPLATES = (HTML_TEMPLATE, TEXT_TEMPLATE)
+
+# Appended after the rendered email: edition/snapshot switches and a poll of
+# /version that reloads the page when a template changes.
+_TOOLBAR = """
+<div style="position:fixed;bottom:0;left:0;right:0;padding:6px 10px;background:#222;
+color:#eee;font:12px monospace;z-index:9999">{links} &middot; rendered in {ms:.1f} ms</div>
+<script>
+(function () {{
+  var version = "{version}";
+  setInterval(function () {{
+    fetch("/version").then(function (r) {{ return r.text(); }}).then(function (v) {{
+      if (v !== version) {{ location.reload(); }}
+    }}).catch(function () {{}});
+  }}, 700);
+}})();
+</script>
+"""
 
-def main() -> None:
-    load_dotenv()
-    cfg = load_config()
-    configure_logging(cfg.log_level)
 
-    sources = load_sources(cfg.sources_file)
-    items = fetch_sources(sources)
+@dataclass
+class PreviewData:
+    items: list[NewsItem]
+    summary_cn: str | None
+    market_snapshot: list
+
+
+def _live_data(cfg: Config) -> PreviewData:
+    # The full fetch -> dedupe -> rank -> summary -> market path; only run
+    # when there is no cached copy (or on --refresh).
+    from fin_news_digest.dedupe import dedupe_items, filter_recent, rank_items
+    from fin_news_digest.fetcher import fetch_sources
+    from fin_news_digest.market_data import build_market_snapshot
+    from fin_news_digest.news_summary import OpenAISummaryConfig, summarize_cn
+    from fin_news_digest.source_loader import load_sources
+
+    items = fetch_sources(load_sources(cfg.sources_file))
     items = filter_recent(items, cfg.lookback_hours)
     items = dedupe_items(items)
     items = rank_items(items, cfg.max_items, "Preview")
@@ -41,21 +89,256 @@ def main() -> None:
         snapshot = build_market_snapshot(
             cfg.alpha_vantage_api_key, cfg.alpha_vantage_sleep_seconds
         )
+    return PreviewData(items, summary, snapshot)
+
+
+def _cached_live_data(cfg: Config, cache_path: str, refresh: bool) -> PreviewData:
+    path = Path(cache_path)
+    if not refresh and path.exists():
+        try:
+            with open(path, "rb") as fh:
+                record = pickle.load(fh)
+            if record.get("version") == CHECKPOINT_VERSION:
+                logger.info("Preview data from %s (saved %s)", path, record["created_at"])
+                return record["data"]
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Ignoring unreadable preview cache %s: %s", path, exc)
+    data = _live_data(cfg)
+    with open(path, "wb") as fh:
+        pickle.dump(
+            {
+                "version": CHECKPOINT_VERSION,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "data": data,
+            },
+            fh,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    return data
+
+
+def _checkpoint_data(cfg: Config, run_id: str) -> PreviewData:
+    store = CheckpointStore(cfg.checkpoint_dir, run_id)
+    items = None
+    # The latest stage that produced items wins: translated, then ranked.
+    for stage in ("translate", "rank"):
+        found, data = store.load(stage)
+        if found:
+            items = data
+            break
+    if items is None:
+        raise LookupError(f"Checkpoint {run_id} has no rank or translate stage")
+    _, summary = store.load("summary")
+    _, market = store.load("market")
+    return PreviewData(items, summary, market or [])
+
+
+def _archive_data(cfg: Config, key: str) -> PreviewData:
+    archive = Archive(cfg.archive_dir)
+    edition = next((e for e in archive.editions() if e["key"] == key), None)
+    if edition is None:
+        raise LookupError(f"Archive has no edition {key}")
+    first, end = edition["docs"]
+    items = [
+        NewsItem(
+            title=record["title"],
+            link=record["link"],
+            published=record["published_ts"],
+            summary=record["summary"],
+            source=record["source"],
+            language=record["language"],
+            priority=record["priority"],
+            title_en=record.get("title_en", record["title"]),
+            title_zh=record.get("title_zh", record["title"]),
+            summary_en=record.get("summary_en", record["summary"]),
+            summary_zh=record.get("summary_zh", record["summary"]),
+        )
+        for record in archive.records(range(first, end))
+    ]
+    market = [
+        MarketSection(
+            title=section["title"],
+            items=[MarketItem(**item) for item in section["items"]],
+        )
+        for section in edition["market"]
+    ]
+    return PreviewData(items, edition["summary_cn"], market)
+
+
+class PreviewServer:
+    # Data snapshots are loaded once and kept in memory; a request only
+    # renders the templates, which jinja re-reads when their mtime changes.
+    def __init__(self, cfg: Config, cache_path: str, refresh: bool = False) -> None:
+        self.cfg = cfg
+        self.cache_path = cache_path
+        self.refresh = refresh
+        self.snapshots: dict[str, PreviewData] = {}
+
+    def snapshot_names(self) -> list[str]:
+        names = ["live"]
+        checkpoint_dir = Path(self.cfg.checkpoint_dir)
+        if checkpoint_dir.exists():
+            names += [
+                f"checkpoint:{path.name}"
+                for path in sorted(checkpoint_dir.iterdir(), reverse=True)
+                if (path / "rank.pkl").exists() or (path / "translate.pkl").exists()
+            ]
+        if self.cfg.archive_dir:
+            names += [
+                f"archive:{edition['key']}"
+                for edition in reversed(Archive(self.cfg.archive_dir).editions())
+            ]
+        return names
+
+    def snapshot(self, name: str) -> PreviewData:
+        if name not in self.snapshots:
+            kind, _, ref = name.partition(":")
+            if kind == "live":
+                self.snapshots[name] = _cached_live_data(self.cfg, self.cache_path, self.refresh)
+            elif kind == "checkpoint":
+                self.snapshots[name] = _checkpoint_data(self.cfg, ref)
+            elif kind == "archive":
+                self.snapshots[name] = _archive_data(self.cfg, ref)
+            else:
+                raise LookupError(f"Unknown snapshot {name}")
+        return self.snapshots[name]
 
-    msg = build_message(
-        subject="Preview",
-        sender=cfg.smtp_from or cfg.smtp_user or "preview@example.com",
-        recipients=["preview@example.com"],
-        items=items,
-        edition_label="Preview",
-        summary_cn=summary,
-        market_snapshot=snapshot,
+    @staticmethod
+    def version() -> str:
+        return ",".join(
+            str((TEMPLATES_DIR / name).stat().st_mtime_ns) for name in _TEMPLATES
+        )
+
+    def render(self, edition: str, snapshot: str, text: bool) -> tuple[str, float]:
+        data = self.snapshot(snapshot)
+        started = time.perf_counter()
+        bodies = render_bodies(data.items, edition, data.summary_cn, data.market_snapshot)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return (bodies.text if text else bodies.html), elapsed_ms
+
+    def toolbar(self, edition: str, snapshot: str, elapsed_ms: float) -> str:
+        def link(label: str, **params: str) -> str:
+            query = {"edition": edition, "snapshot": snapshot, **params}
+            current = query == {"edition": edition, "snapshot": snapshot}
+            style = "color:#fff;font-weight:bold" if current else "color:#9cf"
+            return f'<a style="{style}" href="/?{urlencode(query)}">{html.escape(label)}</a>'
+
+        editions = " ".join(link(name, edition=name) for name in _EDITIONS)
+        snapshots = "<select onchange=\"location.search=this.value\">" + "".join(
+            '<option value="?{}"{}>{}</option>'.format(
+                html.escape(urlencode({"edition": edition, "snapshot": name})),
+                " selected" if name == snapshot else "",
+                html.escape(name),
+            )
+            for name in self.snapshot_names()
+        ) + "</select>"
+        text = link("text", edition=edition, format="text")
+        return _TOOLBAR.format(
+            links=f"{editions} &middot; {snapshots} &middot; {text}",
+            ms=elapsed_ms,
+            version=self.version(),
+        )
+
+
+def _handler(server: PreviewServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            url = urlparse(self.path)
+            if url.path == "/version":
+                self._send(server.version(), "text/plain")
+                return
+            if url.path == "/snapshots":
+                self._send(json.dumps(server.snapshot_names()), "application/json")
+                return
+            if url.path != "/":
+                self.send_error(404)
+                return
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            edition = params.get("edition", _EDITIONS[0])
+            snapshot = params.get("snapshot", "live")
+            text = params.get("format") == "text"
+            try:
+                body, elapsed_ms = server.render(edition, snapshot, text)
+            except LookupError as exc:
+                self.send_error(404, str(exc))
+                return
+            except Exception as exc:  # noqa: BLE001
+                # Template errors are the normal state while editing one.
+                logger.warning("Render failed: %s", exc)
+                page = f"<pre>{html.escape(type(exc).__name__ + ': ' + str(exc))}</pre>"
+                self._send(page + server.toolbar(edition, snapshot, 0.0), "text/html")
+                return
+            logger.info("Rendered %s / %s in %.1f ms", edition, snapshot, elapsed_ms)
+            if text:
+                self._send(body, "text/plain")
+            else:
+                self._send(body + server.toolbar(edition, snapshot, elapsed_ms), "text/html")
+
+        def _send(self, body: str, content_type: str) -> None:
+            payload = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: object) -> None:
+            logger.debug("preview %s", format % args)
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=f"Render the digest email to --output (default {_DEFAULT_OUTPUT})."
+    )
+    parser.add_argument("--output", default=_DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve the preview instead, re-rendering templates on every reload",
+    )
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--snapshot",
+        default="live",
+        help="live (cached fetch), checkpoint:<run id> or archive:<edition key>",
+    )
+    parser.add_argument("--edition", default=_EDITIONS[0], help="Edition label to render")
+    parser.add_argument("--cache", default=_DEFAULT_CACHE, help="Where live data is cached")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="With --serve, re-fetch live data instead of using the cache",
     )
+    args = parser.parse_args()
+
+    load_dotenv()
+    cfg = load_config()
+    configure_logging(cfg.log_level)
+
+    # A one-shot render fetches live data afresh, as it always has; the cache
+    # is for restarting the server.
+    server = PreviewServer(cfg, args.cache, args.refresh or not args.serve)
+    if not args.serve:
+        body, elapsed_ms = server.render(args.edition, args.snapshot, text=False)
+        out = Path(args.output)
+        out.write_text(body, encoding="utf-8")
+        print(f"Preview saved to {out} (rendered in {elapsed_ms:.1f} ms)")
+        return
 
-    html = msg.get_body(preferencelist=("html",)).get_content()
-    out = Path("/tmp/finance_digest_preview.html")
-    out.write_text(html, encoding="utf-8")
-    print(f"Preview saved to {out}")
+    enable_template_reload()
+    # Load the starting snapshot up front so the first reload is fast too.
+    server.snapshot(args.snapshot)
+    httpd = ThreadingHTTPServer((args.host, args.port), _handler(server))
+    query = urlencode({"edition": args.edition, "snapshot": args.snapshot})
+    print(f"Previewing on http://{args.host}:{httpd.server_address[1]}/?{query}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+import cProfile
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_INTERVAL_SECONDS = 0.005
+_TOP_ALLOCATORS = 15
+_TOP_FUNCTIONS = 15
+# Frames kept per traceback; enough to attribute allocations to the caller
+# of a library helper without making tracemalloc much slower.
+_TRACEMALLOC_FRAMES = 4
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", Path(code.co_filename).stem)
+    return f"{module}:{code.co_name}"
+
+
+class _StackSampler:
+    # Samples the stacks of every thread (fetch workers included, which
+    # cProfile does not see) into collapsed "a;b;c count" lines, the input
+    # format of flamegraph.pl, speedscope and inferno.
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(labels))] += 1
+
+
+class Profiler:
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = out_dir
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.stages: dict[str, dict[str, Any]] = {}
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        profile = cProfile.Profile()
+        sampler = _StackSampler(_SAMPLE_INTERVAL_SECONDS)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            wall_ms = (time.perf_counter() - started) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            self.stages[name] = self._write_stage(name, profile, sampler, before, after)
+            self.stages[name].update(
+                wall_ms=round(wall_ms, 1), peak_kib=round((peak - baseline) / 1024, 1)
+            )
+
+    def _write_stage(
+        self,
+        name: str,
+        profile: cProfile.Profile,
+        sampler: _StackSampler,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+    ) -> dict[str, Any]:
+        # A stage that runs twice (e.g. smtp after a resume) keeps the last run.
+        profile.dump_stats(str(self.out_dir / f"{name}.pstats"))
+        with open(self.out_dir / f"{name}.collapsed", "w", encoding="utf-8") as handle:
+            for stack, count in sampler.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+
+        stats = pstats.Stats(profile)
+        # Entries are (primitive calls, calls, tottime, cumtime, callers).
+        functions = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)
+        functions = functions[:_TOP_FUNCTIONS]
+        allocators = after.filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        ).compare_to(before, "lineno")
+        return {
+            "samples": sum(sampler.stacks.values()),
+            "top_functions": [
+                {
+                    "function": f"{Path(file).name}:{line}({func})",
+                    "calls": calls,
+                    "tottime_ms": round(tottime * 1000, 2),
+                    "cumtime_ms": round(cumtime * 1000, 2),
+                }
+                for (file, line, func), (_, calls, tottime, cumtime, _) in functions
+            ],
+            "top_allocators": [
+                {
+                    "where": f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}",
+                    "size_kib": round(diff.size_diff / 1024, 1),
+                    "count": diff.count_diff,
+                }
+                for diff in allocators[:_TOP_ALLOCATORS]
+                if diff.size_diff > 0
+            ],
+        }
+
+    def finish(self) -> Path:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        path = self.out_dir / "stages.json"
+        path.write_text(json.dumps(self.stages, indent=2), encoding="utf-8")
+        for name, stage in self.stages.items():
+            top = stage["top_allocators"][:3]
+            logger.info(
+                "Profile %s: %.0f ms, peak +%.0f KiB; top allocators: %s",
+                name,
+                stage["wall_ms"],
+                stage["peak_kib"],
+                ", ".join(f"{a['where']} ({a['size_kib']:.0f} KiB)" for a in top) or "none",
+            )
+        return path
+
+
+_ACTIVE: Profiler | None = None
+
+
+def start_profiling(profile_dir: str, run_id: str) -> Profiler:
+    global _ACTIVE
+    stamp = datetime.now(timezone.utc).strftime("%H%M%S")
+    _ACTIVE = Profiler(Path(profile_dir) / f"{run_id}-{stamp}")
+    return _ACTIVE
+
+
+def finish_profiling(profiler: Profiler) -> Path:
+    global _ACTIVE
+    if _ACTIVE is profiler:
+        _ACTIVE = None
+    path = profiler.finish()
+    logger.info("Profiles written to %s", path.parent)
+    return path
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    # Without an active profiler this is a single global check per stage.
+    if _ACTIVE is None:
+        yield
+        return
+    with _ACTIVE.stage(name):
+        yield
+
@@ -0,0 +1,315 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import smtplib
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from fin_news_digest.utils import pin_utc_now
+
+logger = logging.getLogger(__name__)
+
+_INDEX_FILE = "index.json"
+_BODIES_DIR = "bodies"
+_KEPT_HEADERS = ("content-type", "content-encoding", "etag", "last-modified", "retry-after")
+
+_ORIGINAL_REQUEST = requests.Session.request
+
+
+def _canonical_url(url: str, params: Any) -> str:
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if isinstance(params, dict):
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    elif params:
+        query.extend(params)
+    return urlunsplit(
+        (parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), "")
+    )
+
+
+def _body_bytes(kwargs: dict[str, Any]) -> bytes:
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"], sort_keys=True).encode("utf-8")
+    data = kwargs.get("data")
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, dict):
+        return urlencode(sorted(data.items())).encode("utf-8")
+    return b""
+
+
+def request_key(method: str, url: str, kwargs: dict[str, Any]) -> str:
+    canonical = f"{method.upper()} {_canonical_url(url, kwargs.get('params'))}"
+    body = _body_bytes(kwargs)
+    if body:
+        canonical += " " + hashlib.sha256(body).hexdigest()
+    return canonical
+
+
+class FixtureBundle:
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+        self.recorded_at: datetime | None = None
+        self.entries: dict[str, list[dict[str, Any]]] = {}
+        self._cursor: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, root: str) -> "FixtureBundle":
+        bundle = cls(root)
+        index = json.loads((bundle.root / _INDEX_FILE).read_text(encoding="utf-8"))
+        bundle.recorded_at = datetime.fromisoformat(index["recorded_at"])
+        bundle.entries = index["entries"]
+        return bundle
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        index = {
+            "recorded_at": (self.recorded_at or datetime.now(timezone.utc)).isoformat(),
+            "entries": self.entries,
+        }
+        (self.root / _INDEX_FILE).write_text(
+            json.dumps(index, ensure_ascii=True, indent=2), encoding="utf-8"
+        )
+
+    def add(self, key: str, resp: requests.Response, elapsed_ms: float) -> None:
+        body = resp.content
+        digest = hashlib.sha256(body).hexdigest()
+        bodies = self.root / _BODIES_DIR
+        bodies.mkdir(parents=True, exist_ok=True)
+        body_path = bodies / digest
+        if not body_path.exists():
+            body_path.write_bytes(body)
+        headers = {k: v for k, v in resp.headers.items() if k.lower() in _KEPT_HEADERS}
+        # requests already decoded the body, so the stored copy is identity-encoded.
+        headers.pop("Content-Encoding", None)
+        headers.pop("content-encoding", None)
+        with self._lock:
+            self.entries.setdefault(key, []).append(
+                {
+                    "url": resp.url,
+                    "status": resp.status_code,
+                    "headers": headers,
+                    "body": digest,
+                    "elapsed_ms": round(elapsed_ms, 3),
+                }
+            )
+
+    def next_response(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                return None
+            idx = self._cursor.get(key, 0)
+            self._cursor[key] = idx + 1
+            # Repeat the last response once the recorded sequence is exhausted.
+            return recorded[min(idx, len(recorded) - 1)]
+
+    def body(self, digest: str) -> bytes:
+        return (self.root / _BODIES_DIR / digest).read_bytes()
+
+
+def _build_response(entry: dict[str, Any], body: bytes, method: str) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = entry["status"]
+    resp.headers = CaseInsensitiveDict(entry["headers"])
+    resp._content = body
+    resp._content_consumed = True
+    resp.url = entry["url"]
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp.request = requests.Request(method=method, url=entry["url"]).prepare()
+    return resp
+
+
+@contextmanager
+def recording(bundle_dir: str) -> Iterator[FixtureBundle]:
+    bundle = FixtureBundle(bundle_dir)
+    bundle.recorded_at = datetime.now(timezone.utc)
+
+    def _record(session: requests.Session, method: str, url: str, **kwargs: Any):
+        started = time.perf_counter()
+        resp = _ORIGINAL_REQUEST(session, method, url, **kwargs)
+        bundle.add(request_key(method, url, kwargs), resp, (time.perf_counter() - started) * 1000)
+        return resp
+
+    requests.Session.request = _record
+    try:
+        yield bundle
+    finally:
+        requests.Session.request = _ORIGINAL_REQUEST
+        bundle.save()
+        logger.info(
+            "Recorded %s responses to %s",
+            sum(len(v) for v in bundle.entries.values()),
+            bundle_dir,
+        )
+
+
+@contextmanager
+def replaying(
+    bundle_dir: str,
+    latency_ms: float = 0.0,
+    latency_scale: float = 0.0,
+    pin_clock: bool = True,
+) -> Iterator[FixtureBundle]:
+    # Injected delay per response = latency_ms + latency_scale * recorded time.
+    bundle = FixtureBundle.load(bundle_dir)
+
+    def _replay(session: requests.Session, method: str, url: str, **kwargs: Any):
+        key = request_key(method, url, kwargs)
+        entry = bundle.next_response(key)
+        if entry is None:
+            raise requests.ConnectionError(f"No recorded response for {key}")
+        delay = latency_ms + latency_scale * entry.get("elapsed_ms", 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return _build_response(entry, bundle.body(entry["body"]), method)
+
+    requests.Session.request = _replay
+    if pin_clock:
+        pin_utc_now(bundle.recorded_at)
+    try:
+        yield bundle
+    finally:
+        requests.Session.request = _ORIGINAL_REQUEST
+        if pin_clock:
+            pin_utc_now(None)
+
+
+class NullSMTP:
+    latency_seconds = 0.0
+    sent = 0
+    _lock = threading.Lock()
+
+    def __init__(self, host: str = "", port: int = 0, timeout: float = 30.0, **kwargs: Any):
+        self.host = host
+        self.port = port
+
+    def __enter__(self) -> "NullSMTP":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def starttls(self, *args: Any, **kwargs: Any) -> tuple[int, bytes]:
+        return 220, b"ready"
+
+    def login(self, user: str, password: str) -> tuple[int, bytes]:
+        return 235, b"ok"
+
+    def sendmail(self, from_addr: str, to_addrs: list[str], msg: bytes, *args: Any) -> dict:
+        if NullSMTP.latency_seconds:
+            time.sleep(NullSMTP.latency_seconds)
+        with NullSMTP._lock:
+            NullSMTP.sent += 1
+        return {}
+
+    def send_message(self, msg: Any, *args: Any, **kwargs: Any) -> dict:
+        return self.sendmail("", [], b"")
+
+    def quit(self) -> tuple[int, bytes]:
+        return 221, b"bye"
+
+    def close(self) -> None:
+        pass
+
+
+@contextmanager
+def null_smtp(latency_ms: float = 0.0) -> Iterator[type[NullSMTP]]:
+    original = smtplib.SMTP
+    NullSMTP.latency_seconds = latency_ms / 1000
+    NullSMTP.sent = 0
+    smtplib.SMTP = NullSMTP
+    try:
+        yield NullSMTP
+    finally:
+        smtplib.SMTP = original
+
+
+@contextmanager
+def isolated_run_env(workdir: str | None = None) -> Iterator[Path]:
+    # Point state, ledgers, outbox, archive, checkpoints and reports at a scratch
+    # directory so offline runs never touch the real state files (or open real
+    # circuits) and never send real mail. A scratch directory created here is
+    # removed on exit.
+    root = Path(workdir or tempfile.mkdtemp(prefix="fin_news_replay_"))
+    overrides = {
+        "STATE_FILE": str(root / "state.json"),
+        "SOURCE_HEALTH_FILE": str(root / "source_health.json"),
+        "SOURCE_STATS_FILE": str(root / "source_stats.json"),
+        "OUTBOX_DIR": str(root / "outbox"),
+        "ARCHIVE_DIR": str(root / "archive"),
+        "CHECKPOINT_DIR": str(root / "checkpoints"),
+        "RUN_REPORT_DIR": str(root / "reports"),
+        "CHECKPOINTS": "false",
+    }
+    defaults = {
+        "RECIPIENTS": "replay@example.com",
+        "SMTP_HOST": "localhost",
+        "SMTP_FROM": "Replay <replay@example.com>",
+    }
+    previous = {key: os.environ.get(key) for key in [*overrides, *defaults]}
+    os.environ.update(overrides)
+    for key, value in defaults.items():
+        if not os.getenv(key) and not os.getenv(f"FIN_{key}"):
+            os.environ[key] = value
+    try:
+        yield root
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Record outbound HTTP of a digest run into a fixture bundle, or replay one."
+    )
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("--bundle", required=True, help="Fixture bundle directory")
+    parser.add_argument("--edition", default="Manual", help="Edition label")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Replay delay per response")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=0.0,
+        help="Replay delay as a multiple of the recorded response time",
+    )
+    parser.add_argument("--workdir", help="Scratch directory for state/outbox/reports")
+    args = parser.parse_args()
+
+    from fin_news_digest.digest import run_digest
+
+    # Kept after the run (isolated_run_env only removes directories it creates).
+    scratch = args.workdir or tempfile.mkdtemp(prefix="fin_news_replay_")
+    with isolated_run_env(scratch) as workdir, null_smtp():
+        if args.mode == "record":
+            with recording(args.bundle):
+                run_digest(args.edition)
+        else:
+            with replaying(args.bundle, args.latency_ms, args.latency_scale):
+                run_digest(args.edition)
+    print(f"Run artifacts in {workdir}")
+
+
+if __name__ == "__main__":
+    main()
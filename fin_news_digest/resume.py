@@ -0,0 +1,54 @@
+import argparse
+import logging
+import sys
+
+from dotenv import load_dotenv
+
+from fin_news_digest.config import load_config
+from fin_news_digest.digest import archive_delivered
+from fin_news_digest.outbox import Outbox, deliver_from_config, edition_key
+from fin_news_digest.utils import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Retry undelivered recipients from the outbox without re-running the pipeline."
+    )
+    parser.add_argument("--edition", help="Only resume today's outbox for this edition label")
+    parser.add_argument("--key", help="Only resume this outbox key (e.g. 2024-01-31-ny-08-00)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    cfg = load_config()
+    configure_logging(cfg.log_level)
+
+    outbox = Outbox(cfg.outbox_dir)
+    if args.key or args.edition:
+        entry = outbox.load(args.key or edition_key(args.edition))
+        entries = [entry] if entry is not None and entry.undelivered() else []
+    else:
+        entries = outbox.pending()
+    if not entries:
+        print("Outbox has no undelivered recipients.")
+        return
+
+    incomplete = 0
+    for entry in entries:
+        logger.info(
+            "Resuming %s: %s/%s recipients undelivered",
+            entry.key,
+            len(entry.undelivered()),
+            len(entry.recipients),
+        )
+        if deliver_from_config(cfg, entry):
+            incomplete += 1
+        else:
+            archive_delivered(cfg, entry)
+    if incomplete:
+        sys.exit(f"{incomplete} outbox edition(s) still have undelivered recipients")
+
+
+if __name__ == "__main__":
+    main()
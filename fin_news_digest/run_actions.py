@@ -1,3 +1,4 @@
+import argparse
 from datetime import datetime
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -8,9 +9,6 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from fin_news_digest.digest import run_digest
-
-
 _WINDOW_MINUTES = 20
 
 
@@ -19,32 +17,46 @@ def _should_run(tz_name: str) -> bool:
     return now.hour == 8 and 0 <= now.minute <= _WINDOW_MINUTES
 
 
+def run_editions(edition_labels: list[str]) -> None:
+    # The pipeline (feedparser, jinja2, requests, numpy) is only imported
+    # once an edition is due, so out-of-window cron runs exit in milliseconds.
+    from fin_news_digest.digest import run_editions as _run_editions
+
+    _run_editions(edition_labels)
+
+
 def _truthy(value: str) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y"}
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--profile", metavar="DIR", help="Write per-stage profiles here (same as PROFILE_DIR)"
+    )
+    args = parser.parse_args()
+    if args.profile:
+        os.environ["PROFILE_DIR"] = args.profile
+
     if _truthy(os.getenv("FORCE_SEND", "")):
         print("FORCE_SEND enabled: sending both editions.")
-        run_digest("NY 08:00")
-        run_digest("BJ 08:00")
+        run_editions(["NY 08:00", "BJ 08:00"])
         return
 
     if _truthy(os.getenv("SCHEDULED_RUN", "")):
         print("SCHEDULED_RUN enabled: sending scheduled editions.")
         # Send both editions on schedule to avoid delay skips
-        run_digest("NY 08:00")
-        run_digest("BJ 08:00")
+        run_editions(["NY 08:00", "BJ 08:00"])
         return
 
-    ran = False
+    due = []
     if _should_run("America/New_York"):
-        run_digest("NY 08:00")
-        ran = True
+        due.append("NY 08:00")
     if _should_run("Asia/Shanghai"):
-        run_digest("BJ 08:00")
-        ran = True
-    if not ran:
+        due.append("BJ 08:00")
+    if due:
+        run_editions(due)
+    else:
         print("No matching schedule window. Skipping.")
 
 
@@ -1,13 +1,30 @@
 import argparse
+import os
 
-from fin_news_digest.digest import run_digest
+from fin_news_digest.checkpoint import STAGES
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--edition", default="Manual", help="Edition label")
+    parser.add_argument(
+        "--from-stage",
+        choices=STAGES,
+        help="Recompute this stage and everything after it; earlier stages load from checkpoints",
+    )
+    parser.add_argument(
+        "--run-id", help="Checkpoint run id (default: <UTC date>-<edition>)"
+    )
+    parser.add_argument(
+        "--profile", metavar="DIR", help="Write per-stage profiles here (same as PROFILE_DIR)"
+    )
     args = parser.parse_args()
-    run_digest(args.edition)
+    if args.profile:
+        os.environ["PROFILE_DIR"] = args.profile
+
+    from fin_news_digest.digest import run_digest
+
+    run_digest(args.edition, from_stage=args.from_stage, run_id=args.run_id)
 
 
 if __name__ == "__main__":
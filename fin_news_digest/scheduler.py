@@ -1,24 +1,78 @@
+import argparse
+import logging
+
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from dotenv import load_dotenv
 from zoneinfo import ZoneInfo
 
-from fin_news_digest.digest import run_digest
+from fin_news_digest import metrics
+from fin_news_digest.config import load_config
+from fin_news_digest.digest import prefetch_digest, run_digest
+
+logger = logging.getLogger(__name__)
+
+_EDITIONS = [
+    ("ny_0800", "NY 08:00", "America/New_York"),
+    ("bj_0800", "BJ 08:00", "Asia/Shanghai"),
+]
+
+
+def _safe(fn, *args) -> None:
+    # A failed prefetch must never take the daemon (or the 08:00 send) down.
+    try:
+        fn(*args)
+    except Exception:  # noqa: BLE001
+        logger.exception("Prefetch %s%s failed", fn.__name__, args)
 
 
 def main() -> None:
-    scheduler = BlockingScheduler()
-    scheduler.add_job(
-        run_digest,
-        CronTrigger(hour=8, minute=0, timezone=ZoneInfo("America/New_York")),
-        kwargs={"edition_label": "NY 08:00"},
-        id="ny_0800",
-    )
-    scheduler.add_job(
-        run_digest,
-        CronTrigger(hour=8, minute=0, timezone=ZoneInfo("Asia/Shanghai")),
-        kwargs={"edition_label": "BJ 08:00"},
-        id="bj_0800",
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay warm: prefetch feeds/market data on a rolling schedule and before each edition",
     )
+    args = parser.parse_args()
+
+    # One worker so prefetches and sends never overlap and share warm caches.
+    scheduler = BlockingScheduler(executors={"default": ThreadPoolExecutor(1)})
+    for job_id, edition_label, tz_name in _EDITIONS:
+        scheduler.add_job(
+            run_digest,
+            CronTrigger(hour=8, minute=0, timezone=ZoneInfo(tz_name)),
+            kwargs={"edition_label": edition_label},
+            id=job_id,
+            misfire_grace_time=1200,
+        )
+
+    if args.daemon:
+        load_dotenv()
+        cfg = load_config()
+        if cfg.metrics_port > 0:
+            metrics.serve(cfg.metrics_port)
+        lead = max(1, min(cfg.prefetch_lead_minutes, 59))
+        for job_id, edition_label, tz_name in _EDITIONS:
+            scheduler.add_job(
+                _safe,
+                CronTrigger(hour=7, minute=60 - lead, timezone=ZoneInfo(tz_name)),
+                args=[prefetch_digest, edition_label],
+                id=f"{job_id}_prefetch",
+                misfire_grace_time=300,
+                coalesce=True,
+            )
+        if cfg.prefetch_interval_minutes > 0:
+            scheduler.add_job(
+                _safe,
+                IntervalTrigger(minutes=cfg.prefetch_interval_minutes),
+                args=[prefetch_digest],
+                id="rolling_prefetch",
+                misfire_grace_time=60,
+                coalesce=True,
+                max_instances=1,
+            )
     scheduler.start()
 
 
@@ -0,0 +1,50 @@
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+from fin_news_digest.archive import Archive
+from fin_news_digest.config import load_config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Search the archive of sent editions (English words, Chinese text)."
+    )
+    parser.add_argument("query", help='e.g. "pboc rate" or "降准"')
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument(
+        "--any", action="store_true", help="Match items containing any term instead of all"
+    )
+    parser.add_argument("--archive-dir", help="Defaults to ARCHIVE_DIR")
+    parser.add_argument("--json", action="store_true", help="Print hits as JSON lines")
+    args = parser.parse_args()
+
+    load_dotenv()
+    archive = Archive(args.archive_dir or load_config().archive_dir)
+    started = time.perf_counter()
+    hits = archive.search(args.query, args.limit, match_all=not args.any)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for hit in hits:
+        record = hit.record
+        if args.json:
+            print(json.dumps({"score": round(hit.score, 3), **record}, ensure_ascii=False))
+            continue
+        published = datetime.fromtimestamp(record["published_ts"], tz=timezone.utc)
+        print(
+            f"{hit.score:6.2f}  {published:%Y-%m-%d %H:%M}  {record['edition_label']:<9} "
+            f"[{record['source']}] {record['title']}"
+        )
+        translated = record.get("title_zh") or record.get("title_en")
+        if translated:
+            print(f"{'':35}{translated}")
+        print(f"{'':35}{record['link']}")
+    if not args.json:
+        print(f"{len(hits)} hits in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
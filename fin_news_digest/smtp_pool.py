@@ -0,0 +1,190 @@
+import logging
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+from fin_news_digest import metrics
+from fin_news_digest.tracing import Span, current_span, timed
+
+if TYPE_CHECKING:
+    from fin_news_digest.emailer import PreparedMessage
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the session itself is gone; anything else from smtplib is
+# treated as a per-recipient failure and the session is kept.
+_DISCONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+@dataclass(frozen=True)
+class SMTPSettings:
+    host: str
+    port: int
+    use_tls: bool
+    user: str
+    password: str
+    timeout: float = 30.0
+
+
+@dataclass
+class DeliveryResult:
+    recipient: str
+    ok: bool
+    attempts: int
+    error: str | None = None
+
+
+class RateLimiter:
+    def __init__(self, rate_per_second: float) -> None:
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SMTPSession:
+    def __init__(self, settings: SMTPSettings) -> None:
+        self.settings = settings
+        self._server: smtplib.SMTP | None = None
+
+    def connect(self) -> None:
+        self.close()
+        server = smtplib.SMTP(
+            self.settings.host, self.settings.port, timeout=self.settings.timeout
+        )
+        try:
+            if self.settings.use_tls:
+                server.starttls()
+            if self.settings.user:
+                server.login(self.settings.user, self.settings.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def send(self, envelope_from: str, recipient: str, data: bytes) -> None:
+        if self._server is None:
+            self.connect()
+        self._server.sendmail(envelope_from, [recipient], data)
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        server, self._server = self._server, None
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+
+class SMTPPool:
+    def __init__(
+        self,
+        settings: SMTPSettings,
+        connections: int = 1,
+        rate_per_second: float = 0.0,
+        max_reconnects: int = 2,
+    ) -> None:
+        self.settings = settings
+        self.connections = max(1, connections)
+        self.limiter = RateLimiter(rate_per_second)
+        self.max_reconnects = max_reconnects
+
+    def deliver(
+        self,
+        prepared: "PreparedMessage",
+        recipients: list[str],
+        on_result: Callable[[DeliveryResult], None] | None = None,
+    ) -> list[DeliveryResult]:
+        if not recipients:
+            return []
+        pending: queue.SimpleQueue[str] = queue.SimpleQueue()
+        for recipient in recipients:
+            pending.put(recipient)
+        results: dict[str, DeliveryResult] = {}
+        workers = min(self.connections, len(recipients))
+        logger.info(
+            "Delivering to %s recipients over %s SMTP sessions via %s:%s",
+            len(recipients),
+            workers,
+            self.settings.host,
+            self.settings.port,
+        )
+        parent = current_span()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smtp") as pool:
+            futures = [
+                pool.submit(self._worker, prepared, pending, results, on_result, parent)
+                for _ in range(workers)
+            ]
+            for future in futures:
+                future.result()
+        return [results[recipient] for recipient in recipients]
+
+    def _worker(
+        self,
+        prepared: "PreparedMessage",
+        pending: "queue.SimpleQueue[str]",
+        results: dict[str, DeliveryResult],
+        on_result: Callable[[DeliveryResult], None] | None,
+        parent: Span,
+    ) -> None:
+        session = SMTPSession(self.settings)
+        try:
+            while True:
+                try:
+                    recipient = pending.get_nowait()
+                except queue.Empty:
+                    return
+                started = time.perf_counter()
+                with timed("smtp.send", parent=parent) as counts:
+                    result = self._send_one(session, prepared, recipient)
+                    counts["delivered" if result.ok else "failed"] = 1
+                    counts["bytes"] = len(prepared.payload)
+                metrics.SMTP_SEND_SECONDS.observe(time.perf_counter() - started)
+                results[recipient] = result
+                if on_result is not None:
+                    on_result(result)
+        finally:
+            session.close()
+
+    def _send_one(
+        self, session: SMTPSession, prepared: "PreparedMessage", recipient: str
+    ) -> DeliveryResult:
+        data = prepared.for_recipient(recipient)
+        attempt = 0
+        while True:
+            attempt += 1
+            self.limiter.acquire()
+            try:
+                session.send(prepared.envelope_from, recipient, data)
+                return DeliveryResult(recipient=recipient, ok=True, attempts=attempt)
+            except _DISCONNECT_ERRORS as exc:
+                session.close()
+                if attempt > self.max_reconnects:
+                    logger.warning(
+                        "SMTP session lost sending to %s after %s attempts: %s",
+                        recipient,
+                        attempt,
+                        exc,
+                    )
+                    return DeliveryResult(recipient, False, attempt, str(exc))
+                logger.info("SMTP session dropped (%s); reconnecting", exc)
+                metrics.RETRIES.inc(operation="smtp")
+            except (smtplib.SMTPAuthenticationError, smtplib.SMTPNotSupportedError):
+                raise
+            except (smtplib.SMTPException, OSError) as exc:
+                logger.warning("SMTP send to %s failed: %s", recipient, exc)
+                return DeliveryResult(recipient, False, attempt, str(exc))
@@ -0,0 +1,169 @@
+import argparse
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from fin_news_digest.utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+_RECENT_WINDOW = 50
+
+
+@dataclass
+class FetchResult:
+    ok: bool
+    latency_ms: float
+    bozo: bool = False
+    error: str | None = None
+
+
+@dataclass
+class SourceHealth:
+    source_id: str
+    consecutive_failures: int = 0
+    open_until: str | None = None
+    last_error: str | None = None
+    last_success: str | None = None
+    latencies_ms: list[float] = field(default_factory=list)
+    recent_bozo: list[int] = field(default_factory=list)
+    recent_ok: list[int] = field(default_factory=list)
+
+    def latency_percentile(self, pct: float) -> float | None:
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    @property
+    def bozo_rate(self) -> float:
+        return sum(self.recent_bozo) / len(self.recent_bozo) if self.recent_bozo else 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        return 1 - sum(self.recent_ok) / len(self.recent_ok) if self.recent_ok else 0.0
+
+    def is_open(self) -> bool:
+        return bool(self.open_until) and utc_now() < datetime.fromisoformat(self.open_until)
+
+
+def _push(values: list, value) -> None:
+    values.append(value)
+    del values[:-_RECENT_WINDOW]
+
+
+class SourceHealthLedger:
+    def __init__(
+        self,
+        path: str,
+        failure_threshold: int = 3,
+        base_open_minutes: float = 30.0,
+        max_open_hours: float = 24.0,
+    ) -> None:
+        self.path = Path(path)
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_open_minutes = base_open_minutes
+        self.max_open_hours = max_open_hours
+        self.health: dict[str, SourceHealth] = {}
+        if self.path.exists():
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring unreadable source health %s", self.path)
+                raw = {}
+            known = {f.name for f in fields(SourceHealth)}
+            for source_id, values in raw.items():
+                values = {k: v for k, v in values.items() if k in known}
+                self.health[source_id] = SourceHealth(**{**values, "source_id": source_id})
+
+    def get(self, source_id: str) -> SourceHealth:
+        if source_id not in self.health:
+            self.health[source_id] = SourceHealth(source_id=source_id)
+        return self.health[source_id]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {sid: asdict(health) for sid, health in sorted(self.health.items())}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=True, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def allow(self, source_id: str) -> bool:
+        # Once the open window has passed, the next fetch is a probe: success
+        # closes the breaker, failure re-opens it for twice as long.
+        return not self.get(source_id).is_open()
+
+    def record(self, source_id: str, result: FetchResult) -> None:
+        health = self.get(source_id)
+        now = utc_now()
+        _push(health.latencies_ms, round(result.latency_ms, 1))
+        _push(health.recent_bozo, int(result.bozo))
+        _push(health.recent_ok, int(result.ok))
+        if result.ok:
+            health.consecutive_failures = 0
+            health.open_until = None
+            health.last_success = now.isoformat()
+            return
+        health.consecutive_failures += 1
+        health.last_error = result.error
+        if health.consecutive_failures >= self.failure_threshold:
+            exponent = health.consecutive_failures - self.failure_threshold
+            minutes = min(self.base_open_minutes * 2**exponent, self.max_open_hours * 60)
+            health.open_until = (now + timedelta(minutes=minutes)).isoformat()
+            logger.warning(
+                "Circuit open for %s after %s consecutive failures; next probe in %.0f min",
+                source_id,
+                health.consecutive_failures,
+                minutes,
+            )
+
+    def unhealthy(self, bozo_threshold: float = 0.5) -> list[SourceHealth]:
+        return [
+            health
+            for health in self.health.values()
+            if health.is_open()
+            or health.consecutive_failures
+            or health.bozo_rate >= bozo_threshold
+        ]
+
+
+def _format_ms(value: float | None) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List feed sources by health.")
+    parser.add_argument("--all", action="store_true", help="Include healthy sources")
+    args = parser.parse_args()
+
+    load_dotenv()
+    from fin_news_digest.config import load_config
+
+    cfg = load_config()
+    ledger = SourceHealthLedger(cfg.source_health_file)
+    rows = list(ledger.health.values()) if args.all else ledger.unhealthy()
+    if not rows:
+        print("All tracked sources are healthy.")
+        return
+    rows.sort(key=lambda h: (not h.is_open(), -h.consecutive_failures, h.source_id))
+    print(
+        f"{'source':<28} {'state':<7} {'fails':>5} {'fail%':>6} {'bozo%':>6} "
+        f"{'p50 ms':>7} {'p95 ms':>7}  last error"
+    )
+    for health in rows:
+        state = "open" if health.is_open() else ("probe" if health.open_until else "closed")
+        print(
+            f"{health.source_id:<28} {state:<7} {health.consecutive_failures:>5} "
+            f"{health.failure_rate * 100:>5.0f}% {health.bozo_rate * 100:>5.0f}% "
+            f"{_format_ms(health.latency_percentile(50)):>7} "
+            f"{_format_ms(health.latency_percentile(95)):>7}  {health.last_error or ''}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import json
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 
 
@@ -11,6 +12,11 @@ class Source:
     language: str
     priority: int
 
+    # Learned from fetch history (see source_stats.SourceStatsLedger.apply).
+    last_changed: datetime | None = None
+    avg_gap_seconds: float | None = None
+    items_sent: int = 0
+
 
 def load_sources(path: str) -> list[Source]:
     data = json.loads(Path(path).read_text(encoding="utf-8"))
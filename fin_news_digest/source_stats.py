@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable
+
+from fin_news_digest.models import NewsItem
+from fin_news_digest.source_loader import Source
+from fin_news_digest.utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest observation in the moving average of publication gaps.
+_GAP_SMOOTHING = 0.3
+# A source is deferred while it was fetched less than this fraction of its
+# typical publication gap ago.
+_DEFER_FRACTION = 0.5
+
+
+@dataclass
+class SourceStats:
+    source_id: str
+    fetches: int = 0
+    changed_fetches: int = 0
+    last_fetched: str | None = None
+    last_changed: str | None = None
+    newest_published: str | None = None
+    avg_gap_seconds: float | None = None
+    items_sent: int = 0
+
+
+def _publication_gap(items: list[NewsItem]) -> float | None:
+    stamps = sorted({item.published_ts for item in items})
+    gaps = [b - a for a, b in zip(stamps, stamps[1:]) if b > a]
+    if not gaps:
+        return None
+    return sorted(gaps)[len(gaps) // 2]
+
+
+class SourceStatsLedger:
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.stats: dict[str, SourceStats] = {}
+        if self.path.exists():
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring unreadable source stats %s", self.path)
+                raw = {}
+            known = {f.name for f in fields(SourceStats)}
+            for source_id, values in raw.items():
+                values = {k: v for k, v in values.items() if k in known}
+                self.stats[source_id] = SourceStats(**{**values, "source_id": source_id})
+
+    def get(self, source_id: str) -> SourceStats:
+        if source_id not in self.stats:
+            self.stats[source_id] = SourceStats(source_id=source_id)
+        return self.stats[source_id]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {sid: asdict(stats) for sid, stats in sorted(self.stats.items())}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=True, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def apply(self, sources: Iterable[Source]) -> None:
+        for source in sources:
+            stats = self.stats.get(source.source_id)
+            if stats is None:
+                continue
+            source.last_changed = (
+                datetime.fromisoformat(stats.last_changed) if stats.last_changed else None
+            )
+            source.avg_gap_seconds = stats.avg_gap_seconds
+            source.items_sent = stats.items_sent
+
+    def observe_fetch(self, source: Source, items: list[NewsItem]) -> None:
+        now = utc_now()
+        stats = self.get(source.source_id)
+        stats.fetches += 1
+        stats.last_fetched = now.isoformat()
+        if not items:
+            return
+        newest = max(items, key=lambda item: item.published_ts).published
+        previous = (
+            datetime.fromisoformat(stats.newest_published) if stats.newest_published else None
+        )
+        if previous is None or newest > previous:
+            stats.changed_fetches += 1
+            stats.last_changed = now.isoformat()
+            stats.newest_published = newest.isoformat()
+        gap = _publication_gap(items)
+        if gap is not None:
+            if stats.avg_gap_seconds is None:
+                stats.avg_gap_seconds = gap
+            else:
+                stats.avg_gap_seconds = (
+                    _GAP_SMOOTHING * gap + (1 - _GAP_SMOOTHING) * stats.avg_gap_seconds
+                )
+
+    def record_sent(self, items: Iterable[NewsItem], sources: Iterable[Source]) -> None:
+        by_name = {source.name: source.source_id for source in sources}
+        for item in items:
+            source_id = by_name.get(item.source)
+            if source_id is not None:
+                self.get(source_id).items_sent += 1
+
+
+def _value(stats: SourceStats, source: Source) -> float:
+    # Items that made it into digests per fetch; priority breaks ties and
+    # ranks sources without history.
+    return stats.items_sent / max(stats.fetches, 1) + source.priority * 0.01
+
+
+def plan_fetch(
+    sources: list[Source],
+    ledger: SourceStatsLedger,
+    max_defer_hours: float,
+) -> tuple[list[Source], list[Source]]:
+    now = utc_now()
+    due: list[Source] = []
+    deferred: list[Source] = []
+    for source in sources:
+        stats = ledger.get(source.source_id)
+        if stats.last_fetched and stats.avg_gap_seconds:
+            defer_for = min(
+                stats.avg_gap_seconds * _DEFER_FRACTION, max_defer_hours * 3600
+            )
+            if now - datetime.fromisoformat(stats.last_fetched) < timedelta(seconds=defer_for):
+                deferred.append(source)
+                continue
+        due.append(source)
+    due.sort(key=lambda s: _value(ledger.get(s.source_id), s), reverse=True)
+    return due, deferred
@@ -1,7 +1,13 @@
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from fin_news_digest.item_batch import ItemBatch, link_fingerprint
+from fin_news_digest.utils import utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -20,22 +26,46 @@ def save_state(path: str, state: dict) -> None:
     Path(path).write_text(json.dumps(state, ensure_ascii=True, indent=2), encoding="utf-8")
 
 
-def filter_sent(items, state: dict, ttl_hours: int):
-    now = datetime.now(timezone.utc)
-    cutoff = now - timedelta(hours=ttl_hours)
-    sent = state.get("sent", {})
-
-    # Prune old entries
-    sent = {
-        link: ts for link, ts in sent.items() if datetime.fromisoformat(ts) >= cutoff
-    }
+def _unexpired(sent: dict[str, str], ttl_hours: int) -> dict[str, str]:
+    cutoff = utc_now() - timedelta(hours=ttl_hours)
+    return {link: ts for link, ts in sent.items() if datetime.fromisoformat(ts) >= cutoff}
 
-    remaining = []
-    for item in items:
-        if item.link in sent:
-            continue
-        remaining.append(item)
-        sent[item.link] = now.isoformat()
 
+def unsent_batch(batch: ItemBatch, state: dict, ttl_hours: int) -> ItemBatch:
+    # Prunes expired entries but does not mark anything, so a widened
+    # lookback can re-check candidates; mark_sent runs once on the final set.
+    sent = _unexpired(state.get("sent", {}), ttl_hours)
     state["sent"] = sent
-    return remaining, state
+
+    sent_fingerprints = np.fromiter(
+        (link_fingerprint(link) for link in sent), dtype=np.int64, count=len(sent)
+    )
+    candidates = np.isin(batch.fingerprint, sent_fingerprints)
+    # Fingerprint hits are confirmed against the exact link.
+    for idx in np.flatnonzero(candidates).tolist():
+        candidates[idx] = batch.items[idx].link in sent
+    remaining = batch.take(~candidates)
+
+    # Repeated links within the batch: only the first occurrence is kept.
+    _, first = np.unique(remaining.fingerprint, return_index=True)
+    if len(first) != len(remaining):
+        remaining = remaining.take(np.sort(first))
+    return remaining
+
+
+def mark_sent(state: dict, links: Iterable[str]) -> dict:
+    stamp = utc_now().isoformat()
+    sent = state.setdefault("sent", {})
+    for link in links:
+        sent[link] = stamp
+    return state
+
+
+def record_sent(path: str, links: Iterable[str], ttl_hours: int) -> None:
+    # Re-reads the state file instead of writing back the dict a run selected
+    # with: marks made since (another edition, a later run) are kept.
+    state = load_state(path)
+    state["sent"] = _unexpired(state.get("sent", {}), ttl_hours)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    save_state(path, mark_sent(state, links))
+
@@ -0,0 +1,80 @@
+import html
+import re
+
+_TAG = re.compile(r"<[^>]+>")
+# Applied to lowercased text. Replacing everything else with spaces and
+# splitting leaves exactly these runs, so one findall does both.
+_TOKEN = re.compile(r"[a-z0-9]+")
+_CJK_RUN = re.compile(r"[\u4e00-\u9fff]+")
+
+STOPWORDS = frozenset(
+    {"a", "an", "the", "and", "or", "for", "to", "in", "on", "of", "at", "with", "from", "by"}
+)
+
+
+def clean_text(text: str) -> str:
+    # Same result as unescape -> drop tags -> collapse whitespace, but most
+    # titles have no entities or markup and only pay for the whitespace join
+    # (str.split and \s agree on what counts as whitespace).
+    if not text:
+        return ""
+    if "&" in text:
+        text = html.unescape(text)
+    if "<" in text:
+        text = _TAG.sub(" ", text)
+    return " ".join(text.split())
+
+
+def title_tokens(lower: str) -> tuple[str, ...]:
+    return tuple(t for t in _TOKEN.findall(lower) if t not in STOPWORDS)
+
+
+def cjk_bigrams(text: str) -> list[str]:
+    # Chinese has no word boundaries; overlapping character bigrams (a lone
+    # character stays a unigram) match headlines without a segmenter.
+    grams: list[str] = []
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            grams.append(run)
+        else:
+            grams.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return grams
+
+
+def search_terms(text: str) -> list[str]:
+    # Index/query terms with repeats (term frequency matters for ranking).
+    if not text:
+        return []
+    terms = list(title_tokens(text.lower()))
+    if not text.isascii():
+        terms.extend(cjk_bigrams(text))
+    return terms
+
+
+class TextFeatures:
+    # Everything the hot loops derive from an item's text, computed together
+    # once: dedupe and item_store use the tokens, clustering the shingles
+    # (tokens plus CJK character bigrams), edition boosts the lowercased
+    # title and summary.
+    __slots__ = ("title", "summary", "lower", "tokens", "token_set", "shingles", "text_lower")
+
+    def __init__(self, title: str, summary: str = "") -> None:
+        self.title = title
+        self.summary = summary
+        self.lower = title.lower()
+        self.tokens = title_tokens(self.lower)
+        self.token_set = frozenset(self.tokens)
+        if title.isascii():
+            self.shingles = self.token_set
+        else:
+            self.shingles = self.token_set.union(cjk_bigrams(title))
+        self.text_lower = f"{self.lower} {summary.lower()}"
+
+    def matches(self, title: str, summary: str) -> bool:
+        # Identity, not equality: a cache hit costs two pointer compares.
+        return self.title is title and self.summary is summary
+
+    @property
+    def title_key(self) -> str:
+        # Titles without latin tokens (e.g. Chinese) fall back to the raw text.
+        return " ".join(self.tokens) if self.tokens else " ".join(self.lower.split())
@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    def __init__(self, name: str, attrs: dict[str, Any] | None = None) -> None:
+        self.name = name
+        self.attrs: dict[str, Any] = dict(attrs or {})
+        self.children: list[Span] = []
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    def incr(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def child(self, name: str, attrs: dict[str, Any] | None = None) -> "Span":
+        span = Span(name, attrs)
+        with self._lock:
+            self.children.append(span)
+        return span
+
+    def aggregate(self, name: str) -> "AggregateSpan":
+        with self._lock:
+            for child in self.children:
+                if child.name == name and isinstance(child, AggregateSpan):
+                    return child
+            span = AggregateSpan(name)
+            self.children.append(span)
+            return span
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {"name": self.name, "duration_ms": round(self.duration_ms, 3)}
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+class AggregateSpan(Span):
+    # Collapses many short, repeated operations (HTTP calls, SMTP sends) into
+    # one node so the report stays readable.
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.end = self.start
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return self.total_ms
+
+    def observe(self, duration_ms: float, **counts: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            self.max_ms = max(self.max_ms, duration_ms)
+            for key, value in counts.items():
+                self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def to_dict(self) -> dict[str, Any]:
+        data = super().to_dict()
+        data["count"] = self.count
+        data["max_ms"] = round(self.max_ms, 3)
+        return data
+
+
+class _NullSpan(Span):
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def incr(self, key: str, amount: float = 1) -> None:
+        pass
+
+    def child(self, name: str, attrs: dict[str, Any] | None = None) -> Span:
+        return self
+
+    def aggregate(self, name: str) -> "AggregateSpan":
+        return _NULL_AGGREGATE
+
+
+class _NullAggregate(AggregateSpan):
+    def observe(self, duration_ms: float, **counts: float) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan("null")
+_NULL_AGGREGATE = _NullAggregate("null")
+
+
+class Tracer:
+    def __init__(self, name: str, attrs: dict[str, Any] | None = None) -> None:
+        self.root = Span(name, attrs)
+        self.started_at = datetime.now(timezone.utc)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "run": self.root.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.root.duration_ms, 3),
+            "attrs": self.root.attrs,
+            "stages": {child.name: round(child.duration_ms, 3) for child in self.root.children},
+            "spans": [child.to_dict() for child in self.root.children],
+        }
+
+
+_ACTIVE: Tracer | None = None
+_LOCAL = threading.local()
+
+
+def _stack() -> list[Span]:
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = []
+        _LOCAL.stack = stack
+    return stack
+
+
+def current_span() -> Span:
+    if _ACTIVE is None:
+        return _NULL_SPAN
+    stack = _stack()
+    return stack[-1] if stack else _ACTIVE.root
+
+
+@contextmanager
+def span(name: str, parent: Span | None = None, **attrs: Any) -> Iterator[Span]:
+    if _ACTIVE is None:
+        yield _NULL_SPAN
+        return
+    node = (parent or current_span()).child(name, attrs)
+    stack = _stack()
+    stack.append(node)
+    try:
+        yield node
+    except BaseException as exc:
+        node.set("error", f"{type(exc).__name__}: {exc}")
+        raise
+    finally:
+        node.end = time.perf_counter()
+        stack.pop()
+
+
+@contextmanager
+def timed(name: str, parent: Span | None = None) -> Iterator[dict[str, float]]:
+    # Yields a dict the caller can fill with counters (e.g. bytes) that are
+    # summed into the aggregate alongside the duration.
+    counts: dict[str, float] = {}
+    if _ACTIVE is None:
+        yield counts
+        return
+    aggregate = (parent or current_span()).aggregate(name)
+    started = time.perf_counter()
+    try:
+        yield counts
+    except BaseException:
+        counts["errors"] = counts.get("errors", 0) + 1
+        raise
+    finally:
+        aggregate.observe((time.perf_counter() - started) * 1000, **counts)
+
+
+def start_run(name: str, **attrs: Any) -> Tracer:
+    global _ACTIVE
+    _ACTIVE = Tracer(name, attrs)
+    _LOCAL.stack = []
+    return _ACTIVE
+
+
+def finish_run(tracer: Tracer, report_dir: str, run_id: str) -> Path | None:
+    global _ACTIVE
+    tracer.root.end = time.perf_counter()
+    if _ACTIVE is tracer:
+        _ACTIVE = None
+    report = tracer.report()
+    logger.info(
+        "Run %s finished in %.1fs: %s",
+        run_id,
+        report["duration_ms"] / 1000,
+        ", ".join(f"{name}={ms / 1000:.2f}s" for name, ms in report["stages"].items()),
+    )
+    if not report_dir:
+        return None
+    path = Path(report_dir) / f"{run_id}-{tracer.started_at.strftime('%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(report, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
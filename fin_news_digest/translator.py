@@ -6,6 +6,9 @@ from typing import Callable
 
 import requests
 
+from fin_news_digest import metrics
+from fin_news_digest.tracing import current_span, timed
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +22,9 @@ class TranslatorConfig:
     backoff_base_seconds: float
     backoff_max_seconds: float
     cache_max_entries: int
+    # Monotonic time after which no more requests are made (the run budget);
+    # remaining texts fall back to the original.
+    deadline: float | None = None
 
 
 _MISSING = object()
@@ -29,6 +35,9 @@ class TranslationCache:
         self.max_entries = max_entries
         self._data: OrderedDict[tuple[str, str, str, str, str], str] = OrderedDict()
 
+    def clear(self) -> None:
+        self._data.clear()
+
     def resize(self, max_entries: int) -> None:
         self.max_entries = max_entries
         while len(self._data) > self.max_entries:
@@ -69,6 +78,10 @@ def reset_translation_stats() -> None:
     _TRANSLATION_STATS.api_requests = 0
 
 
+def clear_translation_cache() -> None:
+    _TRANSLATION_CACHE.clear()
+
+
 def get_translation_stats() -> TranslationStats:
     return TranslationStats(
         translate_calls=_TRANSLATION_STATS.translate_calls,
@@ -92,6 +105,10 @@ def _retry_delay(attempt: int, base: float, max_seconds: float) -> float:
     return min(max_seconds, base * (2**attempt))
 
 
+def _seconds_left(deadline: float | None) -> float:
+    return float("inf") if deadline is None else deadline - time.monotonic()
+
+
 def _retry_after_seconds(resp: requests.Response) -> float | None:
     retry_after = resp.headers.get("Retry-After", "").strip()
     if retry_after.isdigit():
@@ -105,14 +122,18 @@ def _request_with_retries(
     max_retries: int,
     backoff_base_seconds: float,
     backoff_max_seconds: float,
+    deadline: float | None = None,
 ) -> requests.Response | None:
     attempt = 0
     while True:
         try:
             _TRANSLATION_STATS.api_requests += 1
-            resp = request_fn()
+            with timed(f"http.{provider_label}") as counts:
+                resp = request_fn()
+                counts["bytes"] = len(resp.content)
         except requests.RequestException as exc:
-            if attempt >= max_retries:
+            delay = _retry_delay(attempt, backoff_base_seconds, backoff_max_seconds)
+            if attempt >= max_retries or delay >= _seconds_left(deadline):
                 logger.warning(
                     "Translation request failed for %s after %s attempts: %s",
                     provider_label,
@@ -120,7 +141,6 @@ def _request_with_retries(
                     exc,
                 )
                 return None
-            delay = _retry_delay(attempt, backoff_base_seconds, backoff_max_seconds)
             logger.warning(
                 "Translation request error for %s (attempt %s/%s): %s. Retrying in %.1fs",
                 provider_label,
@@ -131,10 +151,16 @@ def _request_with_retries(
             )
             time.sleep(delay)
             attempt += 1
+            current_span().incr("retries")
+            metrics.RETRIES.inc(operation="translation")
             continue
 
         if _should_retry_status(resp.status_code):
-            if attempt >= max_retries:
+            delay = _retry_after_seconds(resp) or _retry_delay(
+                attempt, backoff_base_seconds, backoff_max_seconds
+            )
+            delay = min(backoff_max_seconds, max(delay, backoff_base_seconds))
+            if attempt >= max_retries or delay >= _seconds_left(deadline):
                 logger.warning(
                     "Translation request for %s failed with status %s after %s attempts",
                     provider_label,
@@ -142,10 +168,6 @@ def _request_with_retries(
                     attempt + 1,
                 )
                 return None
-            delay = _retry_after_seconds(resp) or _retry_delay(
-                attempt, backoff_base_seconds, backoff_max_seconds
-            )
-            delay = min(backoff_max_seconds, max(delay, backoff_base_seconds))
             logger.warning(
                 "Translation request for %s returned %s (attempt %s/%s). Retrying in %.1fs",
                 provider_label,
@@ -156,6 +178,8 @@ def _request_with_retries(
             )
             time.sleep(delay)
             attempt += 1
+            current_span().incr("retries")
+            metrics.RETRIES.inc(operation="translation")
             continue
 
         if not resp.ok:
@@ -187,6 +211,7 @@ class LibreTranslateTranslator(BaseTranslator):
         max_retries: int,
         backoff_base_seconds: float,
         backoff_max_seconds: float,
+        deadline: float | None = None,
     ):
         self.endpoint = endpoint
         self.api_key = api_key
@@ -194,6 +219,7 @@ class LibreTranslateTranslator(BaseTranslator):
         self.max_retries = max_retries
         self.backoff_base_seconds = backoff_base_seconds
         self.backoff_max_seconds = backoff_max_seconds
+        self.deadline = deadline
         self.provider_label = "libretranslate"
 
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
@@ -208,7 +234,13 @@ class LibreTranslateTranslator(BaseTranslator):
         cached = _TRANSLATION_CACHE.get(cache_key)
         if cached is not _MISSING:
             _TRANSLATION_STATS.cache_hits += 1
+            metrics.CACHE_REQUESTS.inc(cache="translation", result="hit")
             return cached
+        metrics.CACHE_REQUESTS.inc(cache="translation", result="miss")
+        if _seconds_left(self.deadline) <= 0:
+            # Out of budget: not cached, so a later run still translates it.
+            _TRANSLATION_STATS.fallbacks += 1
+            return text
         payload = {
             "q": text,
             "source": source_lang,
@@ -219,7 +251,11 @@ class LibreTranslateTranslator(BaseTranslator):
             payload["api_key"] = self.api_key
 
         def _request() -> requests.Response:
-            return requests.post(self.endpoint, json=payload, timeout=20)
+            return requests.post(
+                self.endpoint,
+                json=payload,
+                timeout=max(1.0, min(20.0, _seconds_left(self.deadline))),
+            )
 
         resp = _request_with_retries(
             _request,
@@ -227,6 +263,7 @@ class LibreTranslateTranslator(BaseTranslator):
             self.max_retries,
             self.backoff_base_seconds,
             self.backoff_max_seconds,
+            self.deadline,
         )
         if resp is None:
             _TRANSLATION_STATS.fallbacks += 1
@@ -255,11 +292,13 @@ class MyMemoryTranslator(BaseTranslator):
         max_retries: int,
         backoff_base_seconds: float,
         backoff_max_seconds: float,
+        deadline: float | None = None,
     ):
         self.sleep_seconds = sleep_seconds
         self.max_retries = max_retries
         self.backoff_base_seconds = backoff_base_seconds
         self.backoff_max_seconds = backoff_max_seconds
+        self.deadline = deadline
         self.provider_label = "mymemory"
 
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
@@ -276,7 +315,13 @@ class MyMemoryTranslator(BaseTranslator):
         cached = _TRANSLATION_CACHE.get(cache_key)
         if cached is not _MISSING:
             _TRANSLATION_STATS.cache_hits += 1
+            metrics.CACHE_REQUESTS.inc(cache="translation", result="hit")
             return cached
+        metrics.CACHE_REQUESTS.inc(cache="translation", result="miss")
+        if _seconds_left(self.deadline) <= 0:
+            # Out of budget: not cached, so a later run still translates it.
+            _TRANSLATION_STATS.fallbacks += 1
+            return text
         params = {
             "q": text,
             "langpair": f"{source_lang}|{target_lang}",
@@ -284,7 +329,9 @@ class MyMemoryTranslator(BaseTranslator):
 
         def _request() -> requests.Response:
             return requests.get(
-                "https://api.mymemory.translated.net/get", params=params, timeout=20
+                "https://api.mymemory.translated.net/get",
+                params=params,
+                timeout=max(1.0, min(20.0, _seconds_left(self.deadline))),
             )
 
         resp = _request_with_retries(
@@ -293,6 +340,7 @@ class MyMemoryTranslator(BaseTranslator):
             self.max_retries,
             self.backoff_base_seconds,
             self.backoff_max_seconds,
+            self.deadline,
         )
         if resp is None:
             _TRANSLATION_STATS.fallbacks += 1
@@ -325,6 +373,7 @@ def build_translator(cfg: TranslatorConfig) -> BaseTranslator:
             cfg.max_retries,
             cfg.backoff_base_seconds,
             cfg.backoff_max_seconds,
+            cfg.deadline,
         )
     if provider == "mymemory":
         return MyMemoryTranslator(
@@ -332,6 +381,7 @@ def build_translator(cfg: TranslatorConfig) -> BaseTranslator:
             cfg.max_retries,
             cfg.backoff_base_seconds,
             cfg.backoff_max_seconds,
+            cfg.deadline,
         )
     if provider == "none":
         return NullTranslator()
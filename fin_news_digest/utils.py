@@ -1,8 +1,8 @@
-import html
 import logging
-import re
 from datetime import datetime, timezone
 
+from fin_news_digest.textnorm import clean_text, title_tokens
+
 
 def configure_logging(level: str) -> None:
     logging.basicConfig(
@@ -12,12 +12,7 @@ def configure_logging(level: str) -> None:
 
 
 def strip_html(text: str) -> str:
-    if not text:
-        return ""
-    text = html.unescape(text)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    return clean_text(text)
 
 
 def truncate(text: str, limit: int) -> str:
@@ -26,34 +21,25 @@ def truncate(text: str, limit: int) -> str:
     return text[: limit - 1].rstrip() + "…"
 
 
+_PINNED_NOW: datetime | None = None
+
+
 def utc_now() -> datetime:
+    if _PINNED_NOW is not None:
+        return _PINNED_NOW
     return datetime.now(timezone.utc)
 
 
-_STOPWORDS = {
-    "a",
-    "an",
-    "the",
-    "and",
-    "or",
-    "for",
-    "to",
-    "in",
-    "on",
-    "of",
-    "at",
-    "with",
-    "from",
-    "by",
-}
+def pin_utc_now(value: datetime | None) -> None:
+    # Lets offline replays evaluate lookback/TTL windows at the recording time.
+    global _PINNED_NOW
+    _PINNED_NOW = value
 
 
 def normalize_title(title: str) -> list[str]:
     if not title:
         return []
-    cleaned = re.sub(r"[^a-zA-Z0-9\s]", " ", title.lower())
-    tokens = [t for t in cleaned.split() if t and t not in _STOPWORDS]
-    return tokens
+    return list(title_tokens(title.lower()))
 
 
 def jaccard_similarity(a: list[str], b: list[str]) -> float:
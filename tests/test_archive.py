@@ -0,0 +1,107 @@
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fin_news_digest import search
+from fin_news_digest.archive import Archive, _decode_postings, _encode_postings, _Segment
+from fin_news_digest.models import NewsItem
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _item(idx: int, title: str, summary: str = "") -> NewsItem:
+    return NewsItem(
+        title=title,
+        link=f"https://example.com/{idx}",
+        published=NOW - timedelta(minutes=idx),
+        summary=summary,
+        source="Wire",
+        language="en",
+        priority=1,
+    )
+
+
+def test_postings_varint_round_trip():
+    postings = [(0, 1), (5, 300), (127, 2), (128, 1), (70_000, 65_535), (2**31, 3)]
+    data = _encode_postings(postings)
+    assert _decode_postings(data) == postings
+    # Small gaps and counts take one byte each.
+    assert len(_encode_postings([(3, 1), (4, 2)])) == 4
+
+
+def test_segment_write_and_lookup(tmp_path):
+    index = {"rate": [(10, 3), (12, 1)], "oil": [(11, 2)], "降准": [(12, 4)]}
+    segment = _Segment(_Segment.write(tmp_path, 10, 13, index))
+    assert (segment.first, segment.end, segment.docs) == (10, 13, 3)
+    assert segment.postings("rate") == [(10, 3), (12, 1)]
+    assert segment.postings("降准") == [(12, 4)]
+    assert segment.postings("missing") == []
+    assert segment.all_postings() == index
+
+
+def test_search_ranks_title_matches_first(tmp_path):
+    archive = Archive(str(tmp_path))
+    archive.append(
+        "2026-10-18-ny",
+        "NY 08:00",
+        "Digest",
+        [
+            _item(0, "Oil slips as inventories build", "Fed rate path in focus for traders"),
+            _item(1, "Fed signals rate cut in December", "Powell comments"),
+            _item(2, "Equities mixed ahead of earnings"),
+        ],
+    )
+    hits = archive.search("fed rates")
+    assert [hit.record["link"] for hit in hits] == [
+        "https://example.com/1",
+        "https://example.com/0",
+    ]
+    assert hits[0].score > hits[1].score
+    assert archive.search("fed earnings") == []
+    assert len(archive.search("fed earnings", match_all=False)) == 3
+
+
+def test_editions_merge_segments_and_keep_results(tmp_path):
+    archive = Archive(str(tmp_path))
+    for day in range(4):
+        archive.append(
+            f"2026-10-1{day}-ny",
+            "NY 08:00",
+            "Digest",
+            [_item(day * 10 + n, f"Yuan story {day} {n}") for n in range(2)],
+        )
+    assert not archive.append("2026-10-10-ny", "NY 08:00", "Digest", [_item(99, "Yuan")])
+    assert len(list(archive.segment_dir.glob("seg-*.idx"))) < 4
+    hits = archive.search("yuan", limit=20)
+    assert len(hits) == 8
+    # Equal scores: newest doc first.
+    assert hits[0].doc == 7
+    assert [e["docs"] for e in archive.editions()] == [[0, 2], [2, 4], [4, 6], [6, 8]]
+
+
+def test_uncommitted_append_is_discarded(tmp_path):
+    archive = Archive(str(tmp_path))
+    archive.append("2026-10-18-ny", "NY 08:00", "Digest", [_item(0, "Gold hits record")])
+    # Fails after the docs and segment are written, before the edition line.
+    with pytest.raises(TypeError):
+        archive.append(
+            "2026-10-19-ny", "NY 08:00", "Digest", [_item(1, "Gold retreats")], market=[object()]
+        )
+    archive.append("2026-10-19-hk", "HK 08:00", "Digest", [_item(2, "Copper rallies")])
+    links = [hit.record["link"] for hit in archive.search("gold copper", match_all=False)]
+    assert sorted(links) == ["https://example.com/0", "https://example.com/2"]
+
+
+def test_search_cli_prints_json_hits(tmp_path, monkeypatch, capsys):
+    Archive(str(tmp_path)).append(
+        "2026-10-18-ny", "NY 08:00", "Digest", [_item(0, "Treasury yields climb")]
+    )
+    monkeypatch.setattr(
+        sys, "argv", ["search", "yield", "--json", "--archive-dir", str(tmp_path)]
+    )
+    search.main()
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["title"] == "Treasury yields climb"
@@ -0,0 +1,137 @@
+import pytest
+
+from fin_news_digest import budget as budget_module
+from fin_news_digest import digest
+from fin_news_digest.budget import OPTIONAL_STAGES, RunBudget, parse_degrade_order
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(budget_module.time, "monotonic", clock)
+    return clock
+
+
+def test_parse_degrade_order_appends_missing_stages():
+    assert parse_degrade_order("market, rerank") == (
+        "market",
+        "rerank",
+        "summary",
+        "summary_translation",
+    )
+    assert parse_degrade_order("") == OPTIONAL_STAGES
+
+
+def test_parse_degrade_order_rejects_unknown_stages():
+    with pytest.raises(ValueError, match="translate"):
+        parse_degrade_order("rerank,translate")
+
+
+def test_disabled_budget_allows_everything(clock):
+    budget = RunBudget(None)
+    clock.now += 10_000
+    assert budget.allow("rerank")
+    assert budget.remaining() == float("inf")
+    assert budget.deadline() is None
+    assert budget.timeout(20.0) == 20.0
+
+
+def test_zero_budget_is_spent(clock):
+    budget = RunBudget(0.0, reserve_seconds=60.0, started=clock.now)
+    assert budget.enabled
+    assert not budget.allow("summary")
+    assert budget.degraded == ["summary"]
+    assert budget.timeout(20.0) == 1.0
+
+
+def test_allow_charges_later_stages(clock):
+    # rerank (60s) also has to leave room for summary (60), market (30) and
+    # summary_translation (60): 210s on top of the 60s reserve.
+    budget = RunBudget(300.0, reserve_seconds=60.0, started=clock.now)
+    clock.now += 31
+    assert not budget.allow("rerank")
+    assert budget.allow("summary")
+    assert budget.allow("market")
+    assert budget.allow("summary_translation")
+    assert budget.degraded == ["rerank"]
+
+
+def test_degrade_order_decides_what_goes_first(clock):
+    budget = RunBudget(
+        200.0,
+        reserve_seconds=60.0,
+        degrade_order=parse_degrade_order("market,rerank,summary,summary_translation"),
+        started=clock.now,
+    )
+    # 140s available: market (30) plus the three stages after it (180) does not
+    # fit, and neither does rerank with the two after it (180).
+    assert not budget.allow("market")
+    assert not budget.allow("rerank")
+    assert budget.allow("summary")
+    assert budget.allow("summary_translation")
+    assert budget.degraded == ["market", "rerank"]
+
+
+def test_unconfigured_stages_are_not_charged(clock):
+    budget = RunBudget(
+        200.0, reserve_seconds=60.0, stages=frozenset({"rerank", "summary"}), started=clock.now
+    )
+    assert budget.allow("rerank")
+    assert budget.allow("summary")
+
+
+def test_timeout_is_capped_by_remaining_budget(clock):
+    budget = RunBudget(100.0, reserve_seconds=60.0, started=clock.now)
+    assert budget.timeout(60.0) == 40.0
+    clock.now += 30
+    assert budget.timeout(60.0) == 10.0
+    assert budget.deadline() == 1000.0 + 40.0
+
+
+def test_run_editions_splits_what_is_left(monkeypatch, clock):
+    monkeypatch.setenv("RUN_BUDGET_SECONDS", "480")
+    monkeypatch.setattr(digest, "load_dotenv", lambda: None)
+    shares = []
+
+    def run_digest(edition_label, budget_seconds=None):
+        shares.append((edition_label, budget_seconds))
+        clock.now += {"NY 08:00": 300, "BJ 08:00": 10}[edition_label]
+
+    monkeypatch.setattr(digest, "run_digest", run_digest)
+    digest.run_editions(["NY 08:00", "BJ 08:00"])
+    # The first edition gets half; the second gets all that is left.
+    assert shares == [("NY 08:00", 240.0), ("BJ 08:00", 180.0)]
+
+
+def test_run_editions_overrun_leaves_a_spent_budget(monkeypatch, clock):
+    monkeypatch.setenv("RUN_BUDGET_SECONDS", "480")
+    monkeypatch.setattr(digest, "load_dotenv", lambda: None)
+    shares = []
+
+    def run_digest(edition_label, budget_seconds=None):
+        shares.append(budget_seconds)
+        clock.now += 600
+
+    monkeypatch.setattr(digest, "run_digest", run_digest)
+    digest.run_editions(["NY 08:00", "BJ 08:00"])
+    assert shares == [240.0, 0.0]
+    assert not RunBudget(shares[1], started=clock.now).allow("market")
+
+
+def test_run_editions_without_budget(monkeypatch, clock):
+    monkeypatch.setenv("RUN_BUDGET_SECONDS", "0")
+    monkeypatch.setattr(digest, "load_dotenv", lambda: None)
+    shares = []
+    monkeypatch.setattr(
+        digest, "run_digest", lambda label, budget_seconds=None: shares.append(budget_seconds)
+    )
+    digest.run_editions(["NY 08:00", "BJ 08:00"])
+    assert shares == [None, None]
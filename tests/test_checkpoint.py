@@ -0,0 +1,89 @@
+import os
+import pickle
+import time
+
+from fin_news_digest import checkpoint
+from fin_news_digest.checkpoint import CheckpointStore, STAGES
+
+
+def _store(tmp_path) -> CheckpointStore:
+    return CheckpointStore(str(tmp_path), "2026-10-19-ny-08-00")
+
+
+def test_round_trip(tmp_path):
+    store = _store(tmp_path)
+    assert store.load("fetch") == (False, None)
+    store.save("fetch", [{"link": "https://example.com/1"}])
+    assert _store(tmp_path).load("fetch") == (True, [{"link": "https://example.com/1"}])
+
+
+def test_run_computes_once(tmp_path):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["item"]
+
+    assert _store(tmp_path).run("fetch", compute) == ["item"]
+    assert _store(tmp_path).run("fetch", compute) == ["item"]
+    assert len(calls) == 1
+
+
+def test_version_mismatch_is_discarded(tmp_path, monkeypatch):
+    _store(tmp_path).save("fetch", ["old shape"])
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_VERSION", checkpoint.CHECKPOINT_VERSION + 1)
+    store = _store(tmp_path)
+    assert store.load("fetch") == (False, None)
+    assert store.run("fetch", lambda: ["new shape"]) == ["new shape"]
+
+
+def test_unreadable_checkpoint_is_discarded(tmp_path):
+    store = _store(tmp_path)
+    store.save("fetch", ["ok"])
+    (store.root / "fetch.pkl").write_bytes(pickle.dumps({"version": 1})[:5])
+    assert store.load("fetch") == (False, None)
+
+
+def test_complete_marker(tmp_path):
+    store = _store(tmp_path)
+    store.mark_complete()
+    assert not store.is_complete()  # nothing saved yet
+    for stage in STAGES:
+        store.save(stage, stage)
+    store.mark_complete()
+    assert _store(tmp_path).is_complete()
+    # A finished run is started over rather than restored.
+    store.invalidate_from(STAGES[0])
+    assert not store.is_complete()
+    assert all(not store.load(stage)[0] for stage in STAGES)
+
+
+def test_from_stage_keeps_earlier_stages(tmp_path):
+    store = _store(tmp_path)
+    for stage in STAGES:
+        store.save(stage, f"{stage} output")
+    store.mark_complete()
+    store.invalidate_from("translate")
+    replay = _store(tmp_path)
+    assert not replay.is_complete()
+    assert replay.load("fetch") == (True, "fetch output")
+    assert replay.load("rank") == (True, "rank output")
+    assert replay.load("translate") == (False, None)
+    assert replay.load("market") == (False, None)
+
+
+def test_age_seconds(tmp_path):
+    store = _store(tmp_path)
+    assert store.age_seconds() == 0.0
+    store.save("fetch", [])
+    store.save("select", [])
+    hour_ago = time.time() - 3600
+    os.utime(store.root / "fetch.pkl", (hour_ago, hour_ago))
+    assert 3590 < store.age_seconds() < 3700
+
+
+def test_disabled_store_saves_nothing(tmp_path):
+    store = CheckpointStore(str(tmp_path), "run", enabled=False)
+    store.save("fetch", ["x"])
+    assert store.load("fetch") == (False, None)
+    assert not (tmp_path / "run").exists()
@@ -0,0 +1,96 @@
+import math
+from datetime import timedelta
+
+from fin_news_digest.clustering import cluster_items, coverage_note, story_boost
+from fin_news_digest.models import NewsItem
+from fin_news_digest.utils import utc_now
+
+
+def _item(title: str, source: str, hours_ago: float = 0, priority: int = 1) -> NewsItem:
+    return NewsItem(
+        title=title,
+        link=f"https://{source}.example.com/{abs(hash((title, hours_ago)))}",
+        published=utc_now() - timedelta(hours=hours_ago),
+        summary=title,
+        source=source,
+        language="en",
+        priority=priority,
+    )
+
+
+def test_similar_titles_merge_into_one_story():
+    items = [
+        _item("Fed holds interest rates steady amid cooling inflation", "reuters"),
+        _item("Fed holds rates steady amid cooling inflation", "cnbc", priority=3),
+        _item("Oil prices jump after surprise OPEC output cut", "reuters"),
+        _item("Fed keeps interest rates steady amid cooling inflation data", "wsj", 1),
+    ]
+    stories = cluster_items(items)
+    assert len(stories) == 2
+    fed = stories[0]
+    assert fed.coverage == 3
+    assert fed.sources == {"reuters", "cnbc", "wsj"}
+    # The highest-priority member represents the story and carries it.
+    assert fed.representative is items[1]
+    assert items[1].story is fed
+    assert items[0].story is None
+    assert stories[1].coverage == 1
+
+
+def test_chinese_titles_cluster_on_bigrams():
+    items = [
+        _item("央行宣布下调存款准备金率0.5个百分点", "xinhua"),
+        _item("央行宣布下调存款准备金率", "caixin"),
+        _item("港股收盘恒指上涨", "xinhua"),
+    ]
+    stories = cluster_items(items)
+    assert [story.coverage for story in stories] == [2, 1]
+
+
+def test_member_gap_keeps_recurring_headlines_apart():
+    # The same template a day apart is two stories, not one.
+    items = [
+        _item("S&P 500 closes higher as tech stocks rally", "reuters", hours_ago=0),
+        _item("S&P 500 closes higher as tech stocks rally", "cnbc", hours_ago=11),
+        _item("S&P 500 closes higher as tech stocks rally", "wsj", hours_ago=24),
+    ]
+    stories = cluster_items(items)
+    assert [story.coverage for story in stories] == [2, 1]
+    assert stories[0].latest_ts - stories[0].earliest_ts == 11 * 3600
+
+
+def test_dedupe_duplicates_count_as_coverage():
+    kept = _item("Yen slides to a new low against the dollar", "reuters")
+    folded = _item("Yen slides to a new low against the dollar", "bloomberg")
+    [story] = cluster_items([kept], duplicates={id(kept): [folded]})
+    assert story.coverage == 2
+    assert story.other_sources == ["bloomberg"]
+
+
+def test_coverage_note_and_boost():
+    single = _item("Gold edges up as dollar weakens", "reuters")
+    cluster_items([single])
+    assert coverage_note(single) == ""
+    assert story_boost(single) == 0.0
+
+    items = [
+        _item("Fed holds interest rates steady amid cooling inflation", "reuters"),
+        _item("Fed holds interest rates steady amid cooling inflation", "cnbc"),
+        _item("Fed holds rates steady amid cooling inflation", "cnbc"),
+        _item("Fed holds rates steady amid cooling inflation", "wsj"),
+    ]
+    [story] = cluster_items(items)
+    rep = story.representative
+    assert coverage_note(rep) == " | covered by 3 sources (4 items)"
+    assert story_boost(rep) == math.log2(3)
+
+
+def test_reclustering_resets_stories():
+    items = [
+        _item("Fed holds interest rates steady amid cooling inflation", "reuters"),
+        _item("Fed holds interest rates steady amid cooling inflation", "cnbc"),
+    ]
+    cluster_items(items)
+    [story] = cluster_items(items[:1])
+    assert story.coverage == 1
+    assert items[0].story is story
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from fin_news_digest.dedupe import LookbackWindow, dedupe_items, filter_recent
+from fin_news_digest.item_batch import ItemBatch
+from fin_news_digest.models import NewsItem
+from fin_news_digest.utils import utc_now
+
+
+def _item(title: str, link: str, hours_ago: float) -> NewsItem:
+    return NewsItem(
+        title=title,
+        link=link,
+        published=utc_now() - timedelta(hours=hours_ago),
+        summary=title,
+        source="Wire",
+        language="en",
+        priority=1,
+    )
+
+
+ITEMS = [
+    _item("Fed holds rates steady as inflation cools further", "https://a/1", 1),
+    _item("China central bank cuts reserve requirement ratio", "https://a/2", 5),
+    _item("Oil jumps after OPEC announces surprise output cut", "https://a/3", 20),
+    # Same story as the first item, published earlier by another outlet.
+    _item("Fed holds rates steady as inflation cools further", "https://b/1", 50),
+    _item("Yen slides to a new low against the dollar", "https://a/4", 60),
+]
+
+
+def _links(batch: ItemBatch) -> list[str]:
+    return [item.link for item in batch.to_list()]
+
+
+def test_widened_window_matches_full_dedupe():
+    window = LookbackWindow(ItemBatch.from_items(ITEMS))
+    assert _links(window.extend(36)) == ["https://a/1", "https://a/2", "https://a/3"]
+    widened = window.extend(72)
+    expected = dedupe_items(filter_recent(ITEMS, 72))
+    assert _links(widened) == [item.link for item in expected]
+    assert window.recent == len(ITEMS)
+
+
+def test_item_from_previous_band_is_not_duplicated():
+    window = LookbackWindow(ItemBatch.from_items(ITEMS))
+    window.extend(36)
+    widened = _links(window.extend(72))
+    # The first band's survivors are not added again, and the older copy of
+    # the Fed story folds into the one already kept.
+    assert len(widened) == len(set(widened))
+    assert "https://b/1" not in widened
+    folded = window.index.duplicate_map()[id(ITEMS[0])]
+    assert [item.link for item in folded] == ["https://b/1"]
+
+
+def test_narrower_extend_is_a_no_op():
+    window = LookbackWindow(ItemBatch.from_items(ITEMS))
+    first = _links(window.extend(72))
+    assert _links(window.extend(36)) == first
+    assert window.lookback_hours == 72
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from fin_news_digest import fetcher
+from fin_news_digest.feed_archive import FeedArchive, read_payload
+from fin_news_digest.fetcher import (
+    FetchOptions,
+    _parse_entries,
+    _stream_rows,
+    fetch_sources,
+    parse_feed_rows,
+)
+from fin_news_digest.source_health import SourceHealthLedger
+from fin_news_digest.source_loader import Source
+from fin_news_digest.tracing import Span
+
+
+class _Response:
+    status_code = 200
+    ok = True
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.content = body
+        self.headers = {"Content-Type": "application/rss+xml"}
+        self.closed = False
+
+    def iter_content(self, size: int):
+        for start in range(0, len(self.body), size):
+            if self.closed:
+                raise RuntimeError("read after close")
+            yield self.body[start : start + size]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _feed(entries: int, first_title: str, spacing: timedelta = timedelta(minutes=1)) -> bytes:
+    now = datetime.now(timezone.utc)
+    items = []
+    for idx in range(entries):
+        title = first_title if idx == 0 else f"Market update {idx}"
+        published = format_datetime(now - idx * spacing)
+        items.append(
+            f"<item><title>{title}</title><link>https://example.com/{idx}</link>"
+            f"<pubDate>{published}</pubDate>"
+            f"<description>{'Rates and equities moved. ' * 12}</description></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        "<title>Test</title>" + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def test_stream_fallback_parses_whole_body():
+    # An undefined entity early on sends the streaming parser to feedparser,
+    # which must see the whole feed, not only the chunks read so far.
+    body = _feed(400, "Stocks&nbsp;rally")
+    assert len(body) > 2 * 64 * 1024
+    expected, _ = parse_feed_rows(body, {})
+    source = Source("test", "Test", "https://example.com/feed", "en", 1)
+    rows, _, chunks = _stream_rows(
+        _Response(body), source, FetchOptions(streaming=True), None, Span("test")
+    )
+    assert b"".join(chunks) == body
+    assert len(rows) == len(expected) == 400
+
+
+def test_archived_payload_is_whole_body(tmp_path):
+    # The streaming parser stops once entries are past the cutoff; the archive
+    # must still get the whole feed, for backfills with a longer lookback.
+    body = _feed(400, "Stocks rally", spacing=timedelta(hours=1))
+    options = FetchOptions(
+        streaming=True,
+        cutoff=datetime.now(timezone.utc) - timedelta(hours=24),
+        archive_dir=str(tmp_path),
+    )
+    source = Source("test", "Test", "https://example.com/feed", "en", 1)
+    test_span = Span("test")
+    items, _ = _parse_entries(_Response(body), source, options, None, test_span)
+    assert test_span.attrs["stopped_early"]
+    assert len(items) < 400
+    [(_, _, path)] = FeedArchive(str(tmp_path)).payloads()
+    assert read_payload(path) == body
+
+
+def test_one_failing_source_does_not_abort_the_others(tmp_path, monkeypatch):
+    body = _feed(5, "Stocks rally")
+    sources = [
+        Source(source_id, source_id, f"https://example.com/{source_id}", "en", 1)
+        for source_id in ("good", "broken", "down", "also-good")
+    ]
+
+    def download(source, stream=False):
+        if source.source_id == "down":
+            raise OSError("network unreachable")
+        return _Response(body)
+
+    real_parse = fetcher._parse_entries
+
+    def parse_entries(resp, source, *args):
+        if source.source_id == "broken":
+            raise RuntimeError("parser bug")
+        return real_parse(resp, source, *args)
+
+    monkeypatch.setattr(fetcher, "_FEED_CACHE", {})
+    monkeypatch.setattr(fetcher, "_download", download)
+    monkeypatch.setattr(fetcher, "_parse_entries", parse_entries)
+    health = SourceHealthLedger(str(tmp_path / "health.json"))
+    items = fetch_sources(sources, health, FetchOptions(workers=4))
+
+    assert sorted({item.source for item in items}) == ["also-good", "good"]
+    assert len(items) == 10
+    assert health.get("broken").consecutive_failures == 1
+    assert health.get("down").consecutive_failures == 1
+    assert health.get("good").consecutive_failures == 0
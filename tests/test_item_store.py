@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from fin_news_digest.item_store import ItemStore
+from fin_news_digest.models import NewsItem
+from fin_news_digest.utils import utc_now
+
+
+def _item(link: str, title: str, hours_ago: float, priority: int = 1) -> NewsItem:
+    return NewsItem(
+        title=title,
+        link=link,
+        published=utc_now() - timedelta(hours=hours_ago),
+        summary="summary",
+        source="Wire",
+        language="en",
+        priority=priority,
+    )
+
+
+def test_repeated_link_is_ignored(tmp_path):
+    with ItemStore(str(tmp_path / "items.db")) as store:
+        assert store.add_items([_item("https://a/1", "Fed holds rates", 1)]) == 1
+        assert store.add_items([_item("https://a/1", "Fed holds rates steady", 0)]) == 0
+        assert store.count() == 1
+        assert store.items_since(utc_now() - timedelta(hours=2))[0].title == "Fed holds rates"
+
+
+def test_same_title_rewrite_keeps_higher_priority(tmp_path):
+    with ItemStore(str(tmp_path / "items.db")) as store:
+        store.add_items([_item("https://low/1", "Oil jumps on supply cut", 2, priority=1)])
+        higher = _item("https://high/1", "Oil jumps on supply cut", 3, priority=5)
+        lower = _item("https://low/2", "Oil jumps on supply cut", 1, priority=1)
+        assert store.add_items([higher]) == 1
+        assert store.add_items([lower]) == 0
+        links = [item.link for item in store.items_since(utc_now() - timedelta(hours=6))]
+    assert links == ["https://high/1"]
+
+
+def test_same_title_outside_window_is_a_separate_story(tmp_path):
+    with ItemStore(str(tmp_path / "items.db")) as store:
+        store.add_items([_item("https://a/1", "Markets open higher", 30)])
+        store.add_items([_item("https://a/2", "Markets open higher", 1)])
+        assert store.count() == 2
+
+
+def test_items_since_returns_window_newest_first(tmp_path):
+    with ItemStore(str(tmp_path / "items.db")) as store:
+        store.add_items(
+            [
+                _item("https://a/old", "Old story", 48),
+                _item("https://a/mid", "Middle story", 5),
+                _item("https://a/new", "New story", 1),
+            ]
+        )
+        links = [item.link for item in store.items_since(utc_now() - timedelta(hours=12))]
+        assert links == ["https://a/new", "https://a/mid"]
+        assert store.prune(24) == 1
+        assert store.count() == 2
+
+
+def test_store_persists_across_reopen(tmp_path):
+    path = str(tmp_path / "items.db")
+    with ItemStore(path) as store:
+        store.add_items([_item("https://a/1", "Yen slides", 1)])
+        store.record_edition("2026-10-19-ny", "NY 08:00", 1)
+    with ItemStore(path) as store:
+        assert store.count() == 1
+        assert store.last_edition_at("NY 08:00") is not None
+        assert store.last_edition_at("HK 08:00") is None
@@ -0,0 +1,105 @@
+import smtplib
+
+import pytest
+
+from fin_news_digest import resume
+from fin_news_digest.emailer import PreparedMessage
+from fin_news_digest.outbox import Outbox, deliver_entry
+from fin_news_digest.smtp_pool import SMTPPool, SMTPSettings
+
+RECIPIENTS = ["a@example.com", "b@example.com", "c@example.com"]
+
+
+class FakeSMTP:
+    sent: list[str] = []
+    refuse: set[str] = set()
+
+    def __init__(self, host: str = "", port: int = 0, timeout: float = 30.0) -> None:
+        pass
+
+    def starttls(self) -> None:
+        pass
+
+    def login(self, user: str, password: str) -> None:
+        pass
+
+    def sendmail(self, from_addr: str, to_addrs: list[str], msg: bytes) -> dict:
+        recipient = to_addrs[0]
+        if recipient in FakeSMTP.refuse:
+            raise smtplib.SMTPRecipientsRefused({recipient: (550, b"mailbox unavailable")})
+        FakeSMTP.sent.append(recipient)
+        return {}
+
+    def quit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp(monkeypatch):
+    FakeSMTP.sent = []
+    FakeSMTP.refuse = set()
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+
+
+def _create(root) -> None:
+    prepared = PreparedMessage(envelope_from="digest@example.com", payload=b"Subject: t\r\n\r\nbody")
+    Outbox(str(root)).create("2026-10-19-ny-08-00", "NY 08:00", "t", prepared, RECIPIENTS)
+
+
+def _deliver(root) -> list[str]:
+    [entry] = Outbox(str(root)).pending()
+    pool = SMTPPool(SMTPSettings("localhost", 25, False, "", ""))
+    return deliver_entry(entry, pool, max_rounds=1, backoff_base_seconds=0, backoff_max_seconds=0)
+
+
+def _resume(root, monkeypatch) -> None:
+    for key, value in {
+        "OUTBOX_DIR": str(root),
+        "ARCHIVE_DIR": "",
+        "SMTP_HOST": "localhost",
+        "DELIVERY_MAX_ROUNDS": "1",
+    }.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.setattr("sys.argv", ["resume"])
+    resume.main()
+
+
+def test_crash_before_delivery_resumes_once(tmp_path, monkeypatch):
+    # The process died right after the outbox entry was written.
+    _create(tmp_path)
+    _resume(tmp_path, monkeypatch)
+    assert sorted(FakeSMTP.sent) == RECIPIENTS
+    _resume(tmp_path, monkeypatch)
+    assert sorted(FakeSMTP.sent) == RECIPIENTS
+
+
+def test_completed_edition_is_not_resent(tmp_path, monkeypatch):
+    _create(tmp_path)
+    assert _deliver(tmp_path) == []
+    assert Outbox(str(tmp_path)).pending() == []
+    _resume(tmp_path, monkeypatch)
+    assert sorted(FakeSMTP.sent) == RECIPIENTS
+
+
+def test_partial_delivery_only_retries_failed(tmp_path, monkeypatch):
+    _create(tmp_path)
+    FakeSMTP.refuse = {"b@example.com"}
+    assert _deliver(tmp_path) == ["b@example.com"]
+    assert FakeSMTP.sent == ["a@example.com", "c@example.com"]
+
+    FakeSMTP.refuse = set()
+    _resume(tmp_path, monkeypatch)
+    assert FakeSMTP.sent == ["a@example.com", "c@example.com", "b@example.com"]
+    assert Outbox(str(tmp_path)).pending() == []
+
+
+def test_prune_drops_old_entries(tmp_path):
+    _create(tmp_path)
+    outbox = Outbox(str(tmp_path))
+    outbox.prune(max_age_hours=1)
+    assert outbox.load("2026-10-19-ny-08-00") is not None
+    outbox.prune(max_age_hours=-1)
+    assert outbox.load("2026-10-19-ny-08-00") is None
@@ -0,0 +1,110 @@
+import smtplib
+import time
+
+import pytest
+
+from fin_news_digest.emailer import PreparedMessage
+from fin_news_digest.smtp_pool import RateLimiter, SMTPPool, SMTPSettings
+
+PREPARED = PreparedMessage(envelope_from="digest@example.com", payload=b"Subject: t\r\n\r\nbody")
+SETTINGS = SMTPSettings("localhost", 25, False, "", "")
+
+
+class FakeSMTP:
+    connections = 0
+    sent: list[tuple[int, str, float]] = []
+    # Number of upcoming sendmail calls that find the session gone.
+    drops = 0
+
+    def __init__(self, host: str = "", port: int = 0, timeout: float = 30.0) -> None:
+        FakeSMTP.connections += 1
+        self.connection = FakeSMTP.connections
+        self.open = True
+
+    def starttls(self) -> None:
+        pass
+
+    def login(self, user: str, password: str) -> None:
+        pass
+
+    def sendmail(self, from_addr: str, to_addrs: list[str], msg: bytes) -> dict:
+        assert self.open
+        if FakeSMTP.drops:
+            FakeSMTP.drops -= 1
+            self.open = False
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        FakeSMTP.sent.append((self.connection, to_addrs[0], time.monotonic()))
+        return {}
+
+    def quit(self) -> None:
+        if not self.open:
+            raise smtplib.SMTPServerDisconnected("please run connect() first")
+        self.open = False
+
+    def close(self) -> None:
+        self.open = False
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp(monkeypatch):
+    FakeSMTP.connections = 0
+    FakeSMTP.sent = []
+    FakeSMTP.drops = 0
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+
+
+def _recipients(count: int) -> list[str]:
+    return [f"r{idx}@example.com" for idx in range(count)]
+
+
+def test_session_is_reused_across_recipients():
+    results = SMTPPool(SETTINGS).deliver(PREPARED, _recipients(5))
+    assert all(result.ok and result.attempts == 1 for result in results)
+    assert FakeSMTP.connections == 1
+    assert [recipient for _, recipient, _ in FakeSMTP.sent] == _recipients(5)
+
+
+def test_sessions_are_capped_by_connections():
+    SMTPPool(SETTINGS, connections=3).deliver(PREPARED, _recipients(12))
+    # Sessions connect lazily, so a fast first worker may leave others idle.
+    assert 1 <= FakeSMTP.connections <= 3
+    assert sorted(recipient for _, recipient, _ in FakeSMTP.sent) == sorted(_recipients(12))
+
+
+def test_reconnects_after_disconnect():
+    FakeSMTP.drops = 1
+    results = SMTPPool(SETTINGS).deliver(PREPARED, _recipients(3))
+    assert [result.ok for result in results] == [True, True, True]
+    assert results[0].attempts == 2
+    assert FakeSMTP.connections == 2
+    assert [recipient for _, recipient, _ in FakeSMTP.sent] == _recipients(3)
+
+
+def test_gives_up_after_max_reconnects():
+    FakeSMTP.drops = 3
+    results = SMTPPool(SETTINGS, max_reconnects=2).deliver(PREPARED, _recipients(2))
+    assert not results[0].ok
+    assert results[0].attempts == 3
+    assert "closed" in results[0].error
+    assert results[1].ok
+
+
+def test_rate_limit_is_respected():
+    rate = 20.0
+    SMTPPool(SETTINGS, connections=3, rate_per_second=rate).deliver(PREPARED, _recipients(10))
+    times = sorted(at for _, _, at in FakeSMTP.sent)
+    # Ten sends at 20/s take at least nine intervals, whatever the session count.
+    assert times[-1] - times[0] >= 9 / rate * 0.95
+
+
+def test_rate_limiter_spaces_slots():
+    limiter = RateLimiter(50.0)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - started >= 5 / 50.0 * 0.95
+    unlimited = RateLimiter(0)
+    started = time.monotonic()
+    for _ in range(100):
+        unlimited.acquire()
+    assert time.monotonic() - started < 0.05
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fin_news_digest.source_health import FetchResult, SourceHealthLedger
+from fin_news_digest.utils import pin_utc_now
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+FAIL = FetchResult(ok=False, latency_ms=900.0, error="HTTP 503")
+OK = FetchResult(ok=True, latency_ms=120.0)
+
+
+@pytest.fixture
+def clock():
+    moments = {"now": NOW}
+
+    def advance(**delta) -> None:
+        moments["now"] += timedelta(**delta)
+        pin_utc_now(moments["now"])
+
+    pin_utc_now(NOW)
+    yield advance
+    pin_utc_now(None)
+
+
+def _ledger(tmp_path) -> SourceHealthLedger:
+    return SourceHealthLedger(
+        str(tmp_path / "health.json"),
+        failure_threshold=2,
+        base_open_minutes=30,
+        max_open_hours=1,
+    )
+
+
+def test_circuit_opens_after_threshold(tmp_path, clock):
+    ledger = _ledger(tmp_path)
+    ledger.record("wire", FAIL)
+    assert ledger.allow("wire")
+    ledger.record("wire", FAIL)
+    assert not ledger.allow("wire")
+    assert ledger.get("wire").last_error == "HTTP 503"
+
+
+def test_half_open_probe_failure_reopens_for_longer(tmp_path, clock):
+    ledger = _ledger(tmp_path)
+    ledger.record("wire", FAIL)
+    ledger.record("wire", FAIL)
+    clock(minutes=31)
+    # Window passed: the next fetch is let through as a probe.
+    assert ledger.allow("wire")
+    ledger.record("wire", FAIL)
+    clock(minutes=59)
+    assert not ledger.allow("wire")
+    clock(minutes=2)
+    assert ledger.allow("wire")
+    # Doubling is capped at max_open_hours.
+    ledger.record("wire", FAIL)
+    clock(minutes=61)
+    assert ledger.allow("wire")
+
+
+def test_half_open_probe_success_closes(tmp_path, clock):
+    ledger = _ledger(tmp_path)
+    ledger.record("wire", FAIL)
+    ledger.record("wire", FAIL)
+    clock(minutes=31)
+    ledger.record("wire", OK)
+    health = ledger.get("wire")
+    assert (health.consecutive_failures, health.open_until) == (0, None)
+    assert ledger.allow("wire")
+    assert ledger.unhealthy() == []
+
+
+def test_ledger_round_trips_and_tracks_rates(tmp_path, clock):
+    ledger = _ledger(tmp_path)
+    ledger.record("wire", OK)
+    ledger.record("wire", FetchResult(ok=True, latency_ms=300.0, bozo=True))
+    ledger.record("wire", FAIL)
+    ledger.record("wire", FAIL)
+    ledger.save()
+
+    reloaded = _ledger(tmp_path)
+    health = reloaded.get("wire")
+    assert not reloaded.allow("wire")
+    assert health.failure_rate == pytest.approx(0.5)
+    assert health.bozo_rate == pytest.approx(0.25)
+    assert health.latency_percentile(50) == 900.0
+    assert [h.source_id for h in reloaded.unhealthy()] == ["wire"]
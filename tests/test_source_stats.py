@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fin_news_digest.models import NewsItem
+from fin_news_digest.source_loader import Source
+from fin_news_digest.source_stats import SourceStatsLedger, plan_fetch
+from fin_news_digest.utils import pin_utc_now
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def clock():
+    moments = {"now": NOW}
+
+    def advance(**delta) -> None:
+        moments["now"] += timedelta(**delta)
+        pin_utc_now(moments["now"])
+
+    pin_utc_now(NOW)
+    yield advance
+    pin_utc_now(None)
+
+
+def _source(source_id: str, priority: int = 1) -> Source:
+    return Source(
+        source_id=source_id,
+        name=source_id.title(),
+        url=f"https://{source_id}.example.com/rss",
+        language="en",
+        priority=priority,
+    )
+
+
+def _items(source: Source, *minutes_ago: int) -> list[NewsItem]:
+    return [
+        NewsItem(
+            title=f"{source.name} story {m}",
+            link=f"https://{source.source_id}.example.com/{m}",
+            published=NOW - timedelta(minutes=m),
+            summary="",
+            source=source.name,
+            language="en",
+            priority=source.priority,
+        )
+        for m in minutes_ago
+    ]
+
+
+def test_publication_gap_moving_average(tmp_path, clock):
+    ledger = SourceStatsLedger(str(tmp_path / "stats.json"))
+    wire = _source("wire")
+    ledger.observe_fetch(wire, _items(wire, 0, 60, 120))
+    assert ledger.get("wire").avg_gap_seconds == 3600
+    # Later observations are folded in with weight 0.3.
+    ledger.observe_fetch(wire, _items(wire, 0, 10, 20))
+    assert ledger.get("wire").avg_gap_seconds == pytest.approx(0.3 * 600 + 0.7 * 3600)
+
+
+def test_changed_fetches_only_count_newer_items(tmp_path, clock):
+    ledger = SourceStatsLedger(str(tmp_path / "stats.json"))
+    wire = _source("wire")
+    ledger.observe_fetch(wire, _items(wire, 30, 60))
+    ledger.observe_fetch(wire, _items(wire, 30, 60))
+    ledger.observe_fetch(wire, [])
+    stats = ledger.get("wire")
+    assert (stats.fetches, stats.changed_fetches) == (3, 1)
+
+
+def test_recently_fetched_slow_source_is_deferred(tmp_path, clock):
+    ledger = SourceStatsLedger(str(tmp_path / "stats.json"))
+    slow, fresh = _source("slow"), _source("fresh")
+    # Publishes every two hours, so it is deferred for one hour after a fetch.
+    ledger.observe_fetch(slow, _items(slow, 0, 120, 240))
+    clock(minutes=30)
+    due, deferred = plan_fetch([slow, fresh], ledger, max_defer_hours=6)
+    assert [s.source_id for s in due] == ["fresh"]
+    assert [s.source_id for s in deferred] == ["slow"]
+    clock(minutes=31)
+    due, deferred = plan_fetch([slow, fresh], ledger, max_defer_hours=6)
+    assert {s.source_id for s in due} == {"slow", "fresh"} and not deferred
+
+
+def test_deferral_is_capped(tmp_path, clock):
+    ledger = SourceStatsLedger(str(tmp_path / "stats.json"))
+    daily = _source("daily")
+    ledger.observe_fetch(daily, _items(daily, 0, 2880))
+    clock(minutes=20)
+    due, _ = plan_fetch([daily], ledger, max_defer_hours=0.25)
+    assert due == [daily]
+
+
+def test_due_sources_ranked_by_items_sent_per_fetch(tmp_path, clock):
+    path = str(tmp_path / "stats.json")
+    ledger = SourceStatsLedger(path)
+    useful, noisy = _source("useful"), _source("noisy", priority=3)
+    for source in (useful, noisy):
+        ledger.observe_fetch(source, [])
+    ledger.record_sent(_items(useful, 5, 10), [useful, noisy])
+    ledger.save()
+
+    reloaded = SourceStatsLedger(path)
+    due, _ = plan_fetch([noisy, useful], reloaded, max_defer_hours=6)
+    assert [s.source_id for s in due] == ["useful", "noisy"]
+    reloaded.apply([useful])
+    assert useful.items_sent == 2
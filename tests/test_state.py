@@ -0,0 +1,85 @@
+import json
+from datetime import timedelta
+
+from fin_news_digest.item_batch import ItemBatch
+from fin_news_digest.models import NewsItem
+from fin_news_digest.state import load_state, mark_sent, record_sent, unsent_batch
+from fin_news_digest.utils import utc_now
+
+
+def test_record_sent_keeps_marks_made_since(tmp_path):
+    # A resumed run marks its items on top of the current file, not on top of
+    # the state it loaded when it selected them.
+    path = str(tmp_path / "state.json")
+    record_sent(path, ["https://example.com/morning"], ttl_hours=72)
+    stale = load_state(path)
+    record_sent(path, ["https://example.com/later"], ttl_hours=72)
+    record_sent(path, ["https://example.com/resumed"], ttl_hours=72)
+    sent = json.loads((tmp_path / "state.json").read_text())["sent"]
+    assert set(sent) == {
+        "https://example.com/morning",
+        "https://example.com/later",
+        "https://example.com/resumed",
+    }
+    assert "https://example.com/later" not in stale["sent"]
+
+
+def _batch(*links: str) -> ItemBatch:
+    return ItemBatch.from_items(
+        NewsItem(
+            title=f"Story {idx}",
+            link=link,
+            published=utc_now(),
+            summary="",
+            source="Wire",
+            language="en",
+            priority=1,
+        )
+        for idx, link in enumerate(links)
+    )
+
+
+def _links(batch: ItemBatch) -> list[str]:
+    return [item.link for item in batch.to_list()]
+
+
+def test_sent_items_are_filtered(tmp_path):
+    path = str(tmp_path / "state.json")
+    record_sent(path, ["https://a/1"], ttl_hours=72)
+    fresh = unsent_batch(_batch("https://a/1", "https://a/2"), load_state(path), 72)
+    assert _links(fresh) == ["https://a/2"]
+
+
+def test_unqueued_edition_leaves_items_unsent(tmp_path):
+    # Selecting items does not mark them; only record_sent (once the edition
+    # is queued in the outbox) does, so a run that fails before that point
+    # leaves its items for the next run.
+    path = str(tmp_path / "state.json")
+    state = load_state(path)
+    first = unsent_batch(_batch("https://a/1", "https://a/2"), state, 72)
+    assert _links(first) == ["https://a/1", "https://a/2"]
+    again = unsent_batch(_batch("https://a/1", "https://a/2"), load_state(path), 72)
+    assert _links(again) == ["https://a/1", "https://a/2"]
+
+
+def test_expired_marks_are_pruned(tmp_path):
+    old = (utc_now() - timedelta(hours=80)).isoformat()
+    state = {"sent": {"https://a/1": old, "https://a/2": utc_now().isoformat()}}
+    fresh = unsent_batch(_batch("https://a/1", "https://a/2"), state, 72)
+    assert _links(fresh) == ["https://a/1"]
+    assert set(state["sent"]) == {"https://a/2"}
+
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"sent": {"https://a/1": old}}))
+    record_sent(str(path), ["https://a/3"], ttl_hours=72)
+    assert set(json.loads(path.read_text())["sent"]) == {"https://a/3"}
+
+
+def test_repeated_link_in_batch_kept_once():
+    fresh = unsent_batch(_batch("https://a/1", "https://a/1", "https://a/2"), {"sent": {}}, 72)
+    assert _links(fresh) == ["https://a/1", "https://a/2"]
+
+
+def test_mark_sent_stamps_links():
+    state = mark_sent({"sent": {}}, ["https://a/1"])
+    assert list(state["sent"]) == ["https://a/1"]